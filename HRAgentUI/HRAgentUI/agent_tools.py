@@ -0,0 +1,282 @@
+"""
+CrewAI tool wrappers around the app's own search backends.
+"""
+import csv
+import json
+import re
+import time
+from datetime import datetime
+from typing import Any, Optional, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from .context_packer import current_budget, format_passage
+
+
+class PolicySearchInput(BaseModel):
+    """Input for PolicySearchTool."""
+
+    search_query: str = Field(
+        ...,
+        description="Mandatory search query you want to use to search the Employee Code of Conduct",
+    )
+
+
+class PolicySearchTool(BaseTool):
+    name: str = "Search the Employee Code of Conduct"
+    description: str = (
+        "A tool that can be used to semantic search a query from the company's "
+        "Employee Code of Conduct. Returns the most relevant passages with their section titles."
+    )
+    args_schema: Type[BaseModel] = PolicySearchInput
+    index: Any = Field(default=None, exclude=True)
+    limit: int = 4
+
+    def _run(self, search_query: str) -> str:
+        budget = current_budget()
+        # Within a request budget, over-fetch so duplicates and oversized passages can be skipped
+        hits = self.index.search(search_query, limit=self.limit * 2 if budget else self.limit)
+        if not hits:
+            return "No relevant passages found."
+        if budget is None:
+            passages = [chunk for _, chunk in hits]
+        else:
+            passages = budget.pack([dict(chunk, score=score) for score, chunk in hits],
+                                   query=search_query, limit=self.limit)
+            if not passages:
+                return "No new passages fit in this request's context budget; answer from what you already have."
+        return "\n\n".join(format_passage(passage) for passage in passages)
+
+
+class CassetteTool(BaseTool):
+    """Stands in for a network tool (e.g. SerperDevTool) under LLM_MODE=record/replay.
+
+    It keeps the wrapped tool's name, description and arguments so agent
+    prompts are unchanged. In record mode calls go to the wrapped tool and the
+    results are written to the cassette; in replay mode they are read back,
+    with `fallback` answering calls that were never recorded.
+    """
+
+    name: str
+    description: str
+    args_schema: Type[BaseModel]
+    inner: Any = Field(default=None, exclude=True)
+    fallback: Any = Field(default=None, exclude=True)
+    mode: str = 'replay'
+
+    @classmethod
+    def wrap(cls, tool, mode, fallback=None):
+        return cls(name=tool.name, description=tool.description, args_schema=tool.args_schema,
+                   inner=tool, fallback=fallback, mode=mode)
+
+    def _run(self, **kwargs):
+        from . import llm_replay
+
+        if self.mode == llm_replay.RECORD:
+            started = time.perf_counter()
+            result = self.inner._run(**kwargs)
+            llm_replay.record_tool_result(self.name, kwargs, result, time.perf_counter() - started)
+            return result
+        entry = llm_replay.replay_tool_result(self.name, kwargs)
+        if entry is not None:
+            time.sleep(llm_replay.replay_delay(entry))
+            return entry['response']
+        if self.fallback is not None:
+            return self.fallback(**kwargs)
+        return f"No recorded result for {self.name} ({json.dumps(kwargs)})."
+
+
+class CachedSearchTool(BaseTool):
+    """Serves a search tool (e.g. SerperDevTool) from the shared SearchCache (see search_cache.py).
+
+    It keeps the wrapped tool's name, description and arguments so agent
+    prompts are unchanged.
+    """
+
+    name: str
+    description: str
+    args_schema: Type[BaseModel]
+    inner: Any = Field(default=None, exclude=True)
+
+    @classmethod
+    def wrap(cls, tool):
+        return cls(name=tool.name, description=tool.description, args_schema=tool.args_schema, inner=tool)
+
+    def _params(self, kwargs):
+        from .search_cache import SEARCH_PARAMS
+
+        params = {name: getattr(self.inner, name, None) for name in SEARCH_PARAMS}
+        params.update((k, v) for k, v in kwargs.items() if k not in ('search_query', 'query', 'save_file'))
+        return params
+
+    def _fetch(self, key, query, params, kwargs):
+        from .metrics import stage
+        from .search_cache import get_search_cache
+
+        with stage('web_search', 'serper'):
+            response = self.inner._run(**kwargs)
+        get_search_cache().put(key, query, params, response)
+        return response
+
+    def _refresh(self, key, query, params, kwargs):
+        from .search_cache import get_search_cache
+
+        cache = get_search_cache()
+        try:
+            self._fetch(key, query, params, kwargs)
+            cache.count('refreshes')
+        except Exception as e:
+            print(f"Search cache refresh failed for {query!r}: {e}")
+            cache.count('refresh_errors')
+
+    def _run(self, **kwargs):
+        from .aio import submit
+        from .search_cache import STALE, cache_key, get_search_cache
+
+        query = kwargs.get('search_query') or kwargs.get('query') or ''
+        params = self._params(kwargs)
+        key = cache_key(query, params)
+        cache = get_search_cache()
+        response, state = cache.get(key)
+        if state == STALE and cache.claim_refresh(key):
+            submit(self._refresh, key, query, params, kwargs)
+        if state is not None:
+            return response
+        return self._fetch(key, query, params, kwargs)
+
+
+def offline_web_search(search_query, **kwargs):
+    """Deterministic placeholder web results for replay runs without a recording."""
+    slug = '-'.join(re.findall(r'[a-z0-9]+', search_query.lower()))[:60] or 'query'
+    return {
+        'searchParameters': {'q': search_query, 'type': 'search'},
+        'organic': [
+            {'title': f'{search_query} - overview', 'link': f'https://example.com/{slug}',
+             'snippet': f'Offline placeholder result for "{search_query}".', 'position': 1},
+            {'title': f'Best practices: {search_query}', 'link': f'https://example.org/{slug}/best-practices',
+             'snippet': 'Offline placeholder result; record a cassette for real search results.', 'position': 2},
+        ],
+    }
+
+
+class CSVSearchInput(BaseModel):
+    """Input for CSVRowSearchTool."""
+
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the CSV's content")
+
+
+class CSVRowSearchTool(BaseTool):
+    """Keyword search over CSV rows; needs no embeddings, so it works offline."""
+
+    name: str = "Search a CSV's content"
+    description: str = "A tool that can be used to search a query in the interview schedule CSV's content."
+    args_schema: Type[BaseModel] = CSVSearchInput
+    csv_path: str
+    limit: int = 5
+
+    def _run(self, search_query: str) -> str:
+        with open(self.csv_path, newline='', encoding='utf-8-sig') as fh:
+            rows = [row for row in csv.reader(fh) if any(cell.strip() for cell in row)]
+        if not rows:
+            return "The CSV file is empty."
+        terms = set(re.findall(r'\w+', search_query.lower()))
+        scored = sorted(
+            ((len(terms & set(re.findall(r'\w+', ' '.join(row).lower()))), i) for i, row in enumerate(rows)),
+            key=lambda item: (-item[0], item[1]),
+        )
+        matched = [rows[i] for score, i in scored if score][:self.limit]
+        # Nothing matched (e.g. "which slots are free?"): show the start of the file instead
+        return "\n".join(', '.join(row) for row in (matched or rows[:self.limit * 4]))
+
+
+class ScheduleLookupInput(BaseModel):
+    """Input for ScheduleLookupTool."""
+
+    action: str = Field(
+        ...,
+        description="One of: 'on_date' (open slots on a day), 'conflicts' (open slots a meeting at a time "
+                    "would overlap), 'next_available' (first open slots at or after a time), 'all' (every slot)",
+    )
+    when: str = Field(
+        default='',
+        description="Day as MM-DD (e.g. 05-22) for on_date; day and time (e.g. '05-21 3:30 PM') otherwise",
+    )
+    minutes: Optional[int] = Field(default=None, description="Meeting length in minutes (optional)")
+
+
+class ScheduleLookupTool(BaseTool):
+    """Exact date/time queries over the interview schedule (see schedule.py)."""
+
+    name: str = "Look up the interview schedule"
+    description: str = (
+        "A tool that answers date and time questions about the open interview slots in the "
+        "interview schedule: the slots on a day, the slots a meeting would clash with, and the "
+        "next available slots after a given time."
+    )
+    args_schema: Type[BaseModel] = ScheduleLookupInput
+    csv_path: Optional[str] = None
+    limit: int = 5
+
+    def _run(self, action: str, when: str = '', minutes: Optional[int] = None) -> str:
+        from .schedule import get_schedule_index, parse_day, parse_time
+
+        index = get_schedule_index(self.csv_path)
+        action = action.strip().lower()
+        try:
+            if action == 'on_date':
+                day = parse_day(when)
+                slots, empty = index.on_date(day), f"No open interview slots on {day:%m-%d}."
+            elif action == 'conflicts':
+                start = parse_time(when)
+                slots, empty = index.conflicts(start, minutes), f"No open slot overlaps {when}."
+            elif action == 'next_available':
+                start = parse_time(when) if when.strip() else datetime.now()
+                slots = index.next_available(start, minutes, count=self.limit)
+                empty = f"No open interview slots after {when or 'now'}."
+            elif action == 'all':
+                slots, empty = index.all(), "The interview schedule is empty."
+            else:
+                return f"Unknown action {action!r}; use on_date, conflicts, next_available or all."
+        except ValueError as e:
+            return f"Could not read the date/time: {e}. Use MM-DD for days and 'MM-DD H:MM AM' for times."
+        return "\n".join(slot.label() for slot in slots) or empty
+
+
+class InterviewSchedulerInput(BaseModel):
+    """Input for InterviewSchedulerTool."""
+
+    candidates: str = Field(
+        ...,
+        description="One candidate per line, optionally followed by ':' and their availability as "
+                    "';'-separated days or day and time ranges, e.g. 'Jane Doe: 05-21; 05-22 1:00 PM-5:00 PM'",
+    )
+    gap_minutes: int = Field(default=0, description="Minimum minutes between two interviews of one interviewer")
+
+
+class InterviewSchedulerTool(BaseTool):
+    """Bulk assignment of candidates to the open interview slots (see scheduler.py)."""
+
+    name: str = "Schedule interviews"
+    description: str = (
+        "A tool that assigns candidates to the open interview slots in the interview schedule, "
+        "respecting each candidate's and interviewer's availability and a minimum gap between "
+        "interviews. Returns the full schedule and anyone who could not be placed."
+    )
+    args_schema: Type[BaseModel] = InterviewSchedulerInput
+    csv_path: Optional[str] = None
+
+    def _run(self, candidates: str, gap_minutes: int = 0) -> str:
+        from .paths import interviewers_csv_path
+        from .schedule import get_schedule_index
+        from .scheduler import assign_interviews, format_schedule, parse_person, read_people
+
+        try:
+            people = [parse_person(line) for line in candidates.splitlines() if line.strip()]
+        except ValueError as e:
+            return f"Could not read the availability: {e}. Use MM-DD or 'MM-DD H:MM AM-H:MM PM' windows."
+        interviewers_path = interviewers_csv_path()
+        result = assign_interviews(people, get_schedule_index(self.csv_path).all(),
+                                   interviewers=read_people(interviewers_path) if interviewers_path else (),
+                                   gap_minutes=gap_minutes or 0)
+        return format_schedule(result)
@@ -0,0 +1,96 @@
+"""
+Thread pool behind the async views.
+
+Crew runs, SQLite, file and SMTP calls are blocking, so the async views hand
+them to this pool and await the result, leaving the event loop free to
+accept and serve other requests meanwhile. The pool is sized by
+ASYNC_THREADS (default 64) instead of asyncio's default of cpu_count + 4
+threads (5 on a one-CPU VM), because nearly every thread just waits on the
+LLM. crewai's own `Crew.kickoff_async` is `asyncio.to_thread(kickoff)`, i.e.
+the small default pool, which is why crews are awaited through `run_sync`.
+
+Streaming views use `iterate()`: a blocking generator (an LLM token stream,
+a batch of summaries) runs on the pool and its items are handed to an async
+generator, so every event reaches the client as it is produced. A sync
+generator given to StreamingHttpResponse under ASGI is instead collected
+into a list first, i.e. not streamed at all.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+ASYNC_THREADS = int(os.getenv('ASYNC_THREADS', '64'))
+
+_DONE = object()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=ASYNC_THREADS, thread_name_prefix='async-io')
+    return _executor
+
+
+def submit(fn, *args, **kwargs):
+    """Start `fn` on the pool and return its concurrent.futures.Future."""
+    ctx = contextvars.copy_context()
+    return executor().submit(ctx.run, functools.partial(fn, *args, **kwargs))
+
+
+async def run_sync(fn, *args, **kwargs):
+    """Run blocking `fn(*args, **kwargs)` on the pool and await its result."""
+    return await asyncio.wrap_future(submit(fn, *args, **kwargs))
+
+
+async def iterate(iterable):
+    """Iterate blocking `iterable` on the pool, yielding each item as soon as it is produced.
+
+    Exceptions raised by the iterable are re-raised here. When the consumer
+    stops early (the client went away), the producer stops after the item it
+    is working on and the iterable is closed on its own thread.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def put(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # The event loop is closed; nobody is listening any more
+            stop.set()
+
+    def produce():
+        error = None
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    break
+                put((item, None))
+        except Exception as e:
+            error = e
+        finally:
+            close = getattr(iterable, 'close', None)
+            if close is not None:
+                close()
+        put((_DONE, error))
+
+    submit(produce)
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
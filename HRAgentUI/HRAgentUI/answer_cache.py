@@ -0,0 +1,151 @@
+"""
+Semantic cache of FAQ answers.
+
+Each answered question is embedded and stored with its answer. A new question
+is embedded and compared against past questions in the same scope; when the
+best cosine similarity reaches the threshold the stored answer is returned
+instead of running the crew again, so "can I work remotely?" and "remote work
+policy?" share one LLM call.
+
+Scopes include the policy document hash, so editing the document naturally
+starts a fresh set of answers. The cache is bounded by entry count (LRU) and
+age (TTL). Tune it with FAQ_CACHE_THRESHOLD, FAQ_CACHE_MAX_ENTRIES and
+FAQ_CACHE_TTL_SECONDS, using the counters from `stats()`.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from . import embeddings
+
+# Misses whose best similarity lands this close below the threshold are
+# counted separately; a high count suggests the threshold is too strict.
+NEAR_MISS_MARGIN = 0.05
+
+
+def normalize_question(question):
+    """Lowercase, collapse whitespace and strip trailing punctuation."""
+    return re.sub(r'\s+', ' ', question.strip().lower()).rstrip(' ?!.')
+
+
+class SemanticAnswerCache:
+    """Thread-safe nearest-neighbour answer cache with LRU and TTL eviction."""
+
+    def __init__(self, threshold=0.9, max_entries=512, ttl=86400, embed=None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._embed = embed or embeddings.embed_one
+        self._entries = OrderedDict()  # (scope, normalized question) -> entry dict
+        self._lock = threading.Lock()
+        self._counters = dict(hits=0, exact_hits=0, misses=0, near_misses=0,
+                              stores=0, evictions=0, expirations=0, embed_errors=0)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            threshold=float(os.getenv('FAQ_CACHE_THRESHOLD', '0.9')),
+            max_entries=int(os.getenv('FAQ_CACHE_MAX_ENTRIES', '512')),
+            ttl=float(os.getenv('FAQ_CACHE_TTL_SECONDS', '86400')),
+        )
+
+    def _expire(self, now):
+        expired = [key for key, entry in self._entries.items() if now - entry['created'] > self.ttl]
+        for key in expired:
+            del self._entries[key]
+        self._counters['expirations'] += len(expired)
+
+    def _try_embed(self, question):
+        # The cache must never take the request path down with it
+        try:
+            return np.asarray(self._embed(question), dtype=np.float32)
+        except Exception as e:
+            print(f"FAQ cache disabled for this question, embedding failed: {e}")
+            with self._lock:
+                self._counters['embed_errors'] += 1
+            return None
+
+    def lookup(self, question, scope):
+        """Return (answer, vector): the cached answer for `question` in `scope` or None.
+
+        `vector` is the question's embedding when the lookup computed one;
+        pass it to `store` so a miss embeds the question only once.
+        """
+        key = (scope, normalize_question(question))
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry['hits'] += 1
+                self._counters['hits'] += 1
+                self._counters['exact_hits'] += 1
+                return entry['answer'], None
+            candidates = [(k, e) for k, e in self._entries.items() if k[0] == scope]
+
+        if not candidates:
+            with self._lock:
+                self._counters['misses'] += 1
+            return None, None
+
+        query = self._try_embed(question)
+        if query is None:
+            with self._lock:
+                self._counters['misses'] += 1
+            return None, None
+        scores = np.stack([e['vector'] for _, e in candidates]) @ query
+        best = int(np.argmax(scores))
+        similarity = float(scores[best])
+
+        with self._lock:
+            if similarity >= self.threshold:
+                best_key, entry = candidates[best]
+                if best_key in self._entries:
+                    self._entries.move_to_end(best_key)
+                    entry['hits'] += 1
+                    self._counters['hits'] += 1
+                    return entry['answer'], query
+            self._counters['misses'] += 1
+            if similarity >= self.threshold - NEAR_MISS_MARGIN:
+                self._counters['near_misses'] += 1
+        return None, query
+
+    def store(self, question, scope, answer, vector=None):
+        """Remember `answer` for `question` in `scope`, evicting the least recently used entry if full.
+
+        `vector` is the embedding returned by `lookup`, if any.
+        """
+        key = (scope, normalize_question(question))
+        if vector is None:
+            vector = self._try_embed(question)
+        if vector is None:
+            return
+        with self._lock:
+            self._entries[key] = dict(vector=vector, answer=answer, created=time.time(), hits=0)
+            self._entries.move_to_end(key)
+            self._counters['stores'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters and settings for tuning the similarity threshold."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats.update(threshold=self.threshold, max_entries=self.max_entries, ttl_seconds=self.ttl)
+        return stats
+
+
+faq_cache = SemanticAnswerCache.from_env()
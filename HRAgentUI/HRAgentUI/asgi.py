@@ -14,3 +14,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'HRAgentUI.settings')
 
 application = get_asgi_application()
+
+# Warm crewai, the models, indexes and connections in the background; /ready reports progress
+from HRAgentUI.readiness import start_on_server_start  # noqa: E402
+from HRAgentUI.role_packs import start_refresher  # noqa: E402
+
+start_on_server_start()
+# Keep the precomputed role research packs fresh (only with ROLE_PACKS_REFRESH=1)
+start_refresher()
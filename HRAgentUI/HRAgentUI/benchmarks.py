@@ -0,0 +1,403 @@
+"""
+Stage-level microbenchmarks for the FAQ, candidate-notes and onboarding flows.
+
+Each benchmark times one hot stage in isolation (document loading and
+chunking, index builds, retrieval, prompt assembly, crew orchestration,
+email construction and SMTP delivery) or a whole flow end to end through the
+same views and helpers the Django app and the Streamlit app use. The LLM is
+the replay stand-in (see llm_replay), web search is replayed and mail goes
+to an in-process SMTP sink, so the numbers measure our code and crewai's
+overhead, not a provider.
+
+Run with `python manage.py benchmark`; results are JSON and can be compared
+against a stored baseline with `--baseline`.
+"""
+import contextlib
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from .loadtest import percentile
+from .paths import REPO_ROOT, policy_doc_path
+
+FAQ_QUESTIONS = [
+    'Can I accept gifts from a vendor?',
+    'What is the dress code?',
+    'Am I allowed to work from home?',
+    'How do I report harassment?',
+    'Can I use my work laptop for personal projects?',
+]
+
+_BENCHMARKS = []
+
+
+def benchmark(flow, name, repeat=None):
+    """Register `setup(ctx)`, which prepares a stage and returns the zero-argument callable to time."""
+    def register(setup):
+        _BENCHMARKS.append(dict(flow=flow, name=name, repeat=repeat, setup=setup))
+        return setup
+    return register
+
+
+class Context:
+    """Shared inputs and scratch space for one benchmark run."""
+
+    def __init__(self, workdir, sink):
+        self.workdir = workdir
+        self.sink = sink
+        self.docx = str(policy_doc_path())
+        self.notes = str(REPO_ROOT / 'john_notes.txt')
+        self._questions = 0
+
+    def question(self):
+        """A new question each call (so the answer cache never hits) built from the sample set."""
+        self._questions += 1
+        return f'{FAQ_QUESTIONS[self._questions % len(FAQ_QUESTIONS)]} (#{self._questions})'
+
+
+@contextlib.contextmanager
+def _environ(**values):
+    """Set environment variables for the block and restore the previous values afterwards."""
+    saved = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+@contextlib.contextmanager
+def _quiet():
+    # Agents run with verbose=True; keep their console output out of the report
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+# -- FAQ ----------------------------------------------------------------------
+
+@benchmark('faq', 'docx_load_chunk')
+def _docx_load_chunk(ctx):
+    from .policy_index import chunk_paragraphs, read_docx_paragraphs
+    return lambda: chunk_paragraphs(read_docx_paragraphs(ctx.docx))
+
+
+@benchmark('faq', 'embedding_index_build', repeat=5)
+def _embedding_index_build(ctx):
+    from .policy_index import PolicyIndex
+    counter = iter(range(10 ** 6))
+    return lambda: PolicyIndex.build(ctx.docx, os.path.join(ctx.workdir, f'index-{next(counter)}'))
+
+
+@benchmark('faq', 'bm25_index_build')
+def _bm25_index_build(ctx):
+    from .bm25 import BM25Index
+    return lambda: BM25Index.from_docx(ctx.docx)
+
+
+@benchmark('faq', 'retrieval_embedding')
+def _retrieval_embedding(ctx):
+    from .tool_registry import get_policy_index
+    index = get_policy_index()
+    return lambda: [index.search(q) for q in FAQ_QUESTIONS]
+
+
+@benchmark('faq', 'retrieval_bm25')
+def _retrieval_bm25(ctx):
+    from .tool_registry import get_bm25_index
+    index = get_bm25_index()
+    return lambda: [index.search(q) for q in FAQ_QUESTIONS]
+
+
+@benchmark('faq', 'prompt_assembly')
+def _prompt_assembly(ctx):
+    from .streaming import faq_messages
+    from .views import FAQ_STREAM_INSTRUCTIONS, FAQ_STREAM_SYSTEM_PROMPT
+    return lambda: faq_messages(ctx.question(), FAQ_STREAM_SYSTEM_PROMPT, FAQ_STREAM_INSTRUCTIONS)
+
+
+@benchmark('faq', 'context_pack')
+def _context_pack(ctx):
+    from .context_packer import endpoint_budget, pack
+    from .tool_registry import get_bm25_index
+    index = get_bm25_index()
+
+    def run():
+        question = ctx.question()
+        hits = index.search(question, limit=8)
+        return pack([dict(chunk, score=score) for score, chunk in hits], endpoint_budget('process_form'),
+                    query=question, limit=4)
+    return run
+
+
+@benchmark('faq', 'crew_overhead')
+def _crew_overhead(ctx):
+    from crewai import Agent, Crew, Task
+    from .crew_llm import agent_llm
+
+    def run():
+        agent = Agent(role='Benchmark Agent', goal='Answer', backstory='Answers questions.',
+                      llm=agent_llm(), verbose=False)
+        task = Task(description=ctx.question(), expected_output='An answer.', agent=agent)
+        return Crew(agents=[agent], tasks=[task]).kickoff()
+    return run
+
+
+@benchmark('faq', 'process_form_request')
+def _process_form_request(ctx):
+    from django.test import Client
+    client = Client(HTTP_HOST='localhost')
+
+    def run():
+        with _quiet():
+            response = client.post('/process_form/', {'question': ctx.question()})
+        assert response.status_code == 200, response.content
+    return run
+
+
+@benchmark('faq', 'process_form_stream_request')
+def _process_form_stream_request(ctx):
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient, override_settings
+    # AsyncClient always sends Host: testserver
+    client = AsyncClient()
+
+    async def request():
+        # The view streams from an async generator, consumed here as an ASGI server would
+        response = await client.post('/process_form/stream/', {'question': ctx.question()})
+        return b''.join([chunk async for chunk in response.streaming_content])
+
+    def run():
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            body = async_to_sync(request)()
+        assert b'event: done' in body, body
+    return run
+
+
+# -- Candidate notes ----------------------------------------------------------
+
+@benchmark('notes', 'notes_context')
+def _notes_context(ctx):
+    from .context_packer import ContextBudget
+    from .notes_summary import notes_context
+    return lambda: notes_context(ctx.notes, ContextBudget('summarize_notes'))
+
+
+@benchmark('notes', 'summarize_notes_file')
+def _summarize_notes_file(ctx):
+    from .notes_summary import summarize_notes_file
+
+    def run():
+        with _quiet():
+            summarize_notes_file('John', ctx.notes)
+    return run
+
+
+@benchmark('notes', 'summarize_batch_4_files', repeat=5)
+def _summarize_batch(ctx):
+    from .notes_summary import summarize_batch
+    with open(ctx.notes, 'rb') as fh:
+        data = fh.read()
+    files = [(f'candidate{i}_notes.txt', data) for i in range(4)]
+
+    def run():
+        with _quiet():
+            results = list(summarize_batch(files, concurrency=4))
+        assert all('summary' in r for r in results), results
+    return run
+
+
+@benchmark('notes', 'summary_store_search')
+def _summary_store_search(ctx):
+    from .summary_store import SummaryStore
+    store = SummaryStore(os.path.join(ctx.workdir, 'candidates.sqlite3'))
+    with open(ctx.notes, encoding='utf-8') as fh:
+        notes = fh.read()
+    store.add_many(dict(candidate=f'Candidate {i}', summary=notes, notes_sha256=str(i)) for i in range(500))
+    return lambda: store.search('SQL Python')
+
+
+# -- Interview schedule -------------------------------------------------------
+
+@benchmark('schedule', 'schedule_free_slots_on_date')
+def _schedule_on_date(ctx):
+    from .paths import interview_csv_path
+    from .schedule import get_schedule_index, parse_day
+    day = parse_day('05-22')
+    # Includes the stat that checks the CSV for changes
+    return lambda: get_schedule_index(interview_csv_path()).on_date(day)
+
+
+@benchmark('schedule', 'assign_300_candidates_400_slots', repeat=5)
+def _assign_interviews(ctx):
+    from datetime import datetime, timedelta
+    from .schedule import Slot
+    from .scheduler import Person, assign_interviews
+
+    first = datetime(2025, 6, 2, 8)
+    slots = [Slot(first + timedelta(days=day, minutes=30 * k), first + timedelta(days=day, minutes=30 * k + 45))
+             for day in range(20) for k in range(20)]
+    # Each candidate is free for three hours on one day
+    candidates = [Person(f'Candidate {i}', ((first + timedelta(days=i % 20, hours=i % 6),
+                                             first + timedelta(days=i % 20, hours=i % 6 + 3)),))
+                  for i in range(300)]
+    interviewers = [Person(f'Interviewer {i}') for i in range(6)]
+    return lambda: assign_interviews(candidates, slots, interviewers=interviewers, gap_minutes=15)
+
+
+# -- Onboarding ---------------------------------------------------------------
+
+@benchmark('onboarding', 'email_build')
+def _email_build(ctx):
+    from .mail_transport import build_message
+    body = 'Welcome aboard!\n' * 40
+    return lambda: build_message('hr@example.com', 'new.hire@example.com', 'Welcome to Company XYZ!!!', body)
+
+
+@benchmark('onboarding', 'smtp_send_pooled')
+def _smtp_send_pooled(ctx):
+    from .mail_transport import build_message, get_mail_pool
+    pool = get_mail_pool()
+    message = build_message('hr@example.com', 'new.hire@example.com', 'Benchmark', 'Hello\n' * 40)
+    return lambda: pool.send(message)
+
+
+@benchmark('onboarding', 'smtp_send_many_10')
+def _smtp_send_many(ctx):
+    from .mail_transport import build_message, get_mail_pool
+    pool = get_mail_pool()
+    messages = [build_message('hr@example.com', f'hire{i}@example.com', 'Benchmark', 'Hello\n' * 40)
+                for i in range(10)]
+    return lambda: pool.send_many(messages)
+
+
+@benchmark('onboarding', 'run_onboarding')
+def _run_onboarding(ctx):
+    from .views import run_onboarding
+
+    def run():
+        with _quiet():
+            run_onboarding('Jane Doe', 'Data Engineer', 'jane@example.com', 'https://example.com/conduct')
+    return run
+
+
+@benchmark('onboarding', 'bulk_onboarding_10_hires', repeat=5)
+def _bulk_onboarding(ctx):
+    from .bulk_onboarding import run_bulk_onboarding
+    roles = ['Data Engineer', 'Recruiter', 'Product Manager']
+    rows = [dict(name=f'Hire {i}', role=roles[i % len(roles)], email=f'hire{i}@example.com',
+                 code_of_conduct='https://example.com/conduct') for i in range(10)]
+
+    def run():
+        with _quiet():
+            report = run_bulk_onboarding(rows, concurrency=4)
+        assert report['succeeded'] == len(rows), report
+    return run
+
+
+# -- Runner -------------------------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _summarize(samples):
+    # The same nearest-rank p95 as the load test report
+    ordered = sorted(samples)
+    p95 = percentile(ordered, 95)
+    return dict(
+        n=len(samples),
+        mean_ms=round(statistics.fmean(samples), 3),
+        median_ms=round(statistics.median(samples), 3),
+        p95_ms=round(p95, 3),
+        min_ms=round(ordered[0], 3),
+        stdev_ms=round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+    )
+
+
+def available():
+    return [(b['flow'], b['name']) for b in _BENCHMARKS]
+
+
+def run(only=None, repeat=20, warmup=2, log=print):
+    """Run the benchmarks whose flow or name is in `only` (all by default) and return the results dict."""
+    import crewai
+
+    from . import embeddings
+    from .smtp_sink import SMTPSink
+
+    selected = [b for b in _BENCHMARKS if not only or b['flow'] in only or b['name'] in only]
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='hr-bench-') as workdir, SMTPSink() as sink, \
+            _environ(SMTP_HOST=sink.host, SMTP_PORT=str(sink.port), SMTP_USE_SSL='false',
+                     EMAIL_SENDER='hr@example.com', EMAIL_PASSWORD='unused'):
+        # Mail goes to the sink; the pool is keyed on these settings
+        ctx = Context(workdir, sink)
+        for bench in selected:
+            label = f"{bench['flow']}.{bench['name']}"
+            try:
+                fn = bench['setup'](ctx)
+                for _ in range(warmup):
+                    fn()
+                samples = []
+                for _ in range(bench['repeat'] or repeat):
+                    started = time.perf_counter()
+                    fn()
+                    samples.append((time.perf_counter() - started) * 1000)
+            except Exception as e:
+                results[label] = dict(flow=bench['flow'], error=f'{type(e).__name__}: {e}')
+                log(f'{label:45} ERROR {e}')
+                continue
+            results[label] = dict(flow=bench['flow'], **_summarize(samples))
+            log(f"{label:45} median {results[label]['median_ms']:10.3f} ms   p95 {results[label]['p95_ms']:10.3f} ms")
+        mail_received = sink.messages
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'crewai': getattr(crewai, '__version__', None),
+            'llm_mode': os.getenv('LLM_MODE'),
+            'embedding_backend': embeddings.EMBEDDING_BACKEND,
+            'repeat': repeat,
+            'warmup': warmup,
+            'mail_received': mail_received,
+        },
+        'results': results,
+    }
+
+
+def compare(results, baseline, threshold=0.2):
+    """Compare medians with a baseline; returns rows of (name, baseline_ms, current_ms, ratio, status)."""
+    rows = []
+    current = results['results']
+    for name, base in sorted(baseline.get('results', {}).items()):
+        now = current.get(name)
+        if now is None or 'median_ms' not in now or 'median_ms' not in base:
+            rows.append((name, base.get('median_ms'), now and now.get('median_ms'), None, 'missing'))
+            continue
+        ratio = now['median_ms'] / base['median_ms'] if base['median_ms'] else float('inf')
+        if ratio > 1 + threshold:
+            status = 'slower'
+        elif ratio < 1 - threshold:
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append((name, base['median_ms'], now['median_ms'], round(ratio, 3), status))
+    for name in sorted(set(current) - set(baseline.get('results', {}))):
+        rows.append((name, None, current[name].get('median_ms'), None, 'new'))
+    return rows
@@ -0,0 +1,189 @@
+"""
+Offline BM25 retrieval over the Employee Code of Conduct.
+
+Every paragraph becomes a passage tagged with its section title; the title
+words are indexed with the paragraph so "dress code" finds the body text of
+the Dress code section. Queries are expanded through a small table of HR
+synonyms ("wfh" -> remote, "pto" -> leave/vacation) before scoring.
+
+The index is a plain inverted index with per-term NumPy posting arrays, so a
+lookup touches only the postings of the query terms and takes well under a
+millisecond for a document this size. It needs no model and no network.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from .metrics import stage
+from .policy_index import read_docx_paragraphs
+
+K1 = 1.2
+B = 0.75
+# Weight of a term that only entered the query through synonym expansion
+SYNONYM_WEIGHT = 0.5
+
+STOPWORDS = frozenset("""
+a about above after again all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how i if in into is it its itself
+just me more most my myself no nor not now of off on once only or other our ours ourselves
+out over own same she should so some such than that the their theirs them themselves then
+there these they this those through to too under until up very was we were what when where
+which while who whom why will with would you your yours yourself yourselves company policy
+""".split())
+
+# Query term -> related terms used by the Code of Conduct
+HR_SYNONYMS = {
+    'remote': ['home', 'telecommute', 'telework', 'remotely'],
+    'remotely': ['remote', 'home', 'telecommute'],
+    'wfh': ['remote', 'home', 'telecommute'],
+    'telecommute': ['remote', 'home'],
+    'pto': ['leave', 'vacation', 'holiday'],
+    'vacation': ['leave', 'pto', 'holiday'],
+    'holiday': ['leave', 'vacation'],
+    'sick': ['leave', 'illness', 'medical'],
+    'maternity': ['parental', 'leave'],
+    'paternity': ['parental', 'leave'],
+    'leave': ['absence', 'vacation', 'pto'],
+    'dress': ['attire', 'clothing', 'wear', 'grooming'],
+    'attire': ['dress', 'clothing'],
+    'clothes': ['dress', 'clothing', 'attire'],
+    'phone': ['cell', 'mobile', 'device'],
+    'mobile': ['cell', 'phone'],
+    'cell': ['phone', 'mobile'],
+    'laptop': ['computer', 'device', 'equipment'],
+    'internet': ['online', 'web', 'website'],
+    'email': ['mail', 'corporate'],
+    'dating': ['fraternization', 'relationship', 'romantic'],
+    'date': ['dating', 'fraternization', 'relationship'],
+    'relationship': ['fraternization', 'dating'],
+    'romance': ['dating', 'fraternization', 'relationship'],
+    'relatives': ['family', 'relative', 'employment'],
+    'family': ['relatives', 'relative'],
+    'hire': ['employment', 'recruit', 'hiring'],
+    'visitor': ['visitors', 'guest'],
+    'guest': ['visitors', 'visitor'],
+    'salary': ['pay', 'compensation', 'payroll', 'wage'],
+    'pay': ['compensation', 'salary', 'payroll', 'wage'],
+    'bonus': ['compensation', 'pay'],
+    'overtime': ['hours', 'extra'],
+    'gift': ['gifts', 'bribe', 'conflict'],
+    'bribe': ['bribery', 'corruption', 'conflict'],
+    'harassment': ['discrimination', 'violence', 'bullying', 'harass'],
+    'bullying': ['harassment', 'violence'],
+    'discrimination': ['harassment', 'equal', 'opportunity'],
+    'fired': ['termination', 'disciplinary', 'discipline'],
+    'termination': ['disciplinary', 'discipline', 'dismissal'],
+    'discipline': ['disciplinary', 'consequences'],
+    'punishment': ['disciplinary', 'consequences'],
+    'smoking': ['smoke', 'tobacco'],
+    'drugs': ['substance', 'alcohol'],
+    'alcohol': ['substance', 'drugs'],
+    'social': ['media'],
+    'twitter': ['social', 'media'],
+    'facebook': ['social', 'media'],
+    'linkedin': ['social', 'media'],
+    'selling': ['solicitation', 'distribution'],
+    'fundraising': ['solicitation', 'distribution'],
+    'secret': ['confidential', 'confidentiality'],
+    'privacy': ['confidential', 'data', 'protection'],
+    'password': ['security', 'cyber'],
+    'security': ['cyber', 'confidential'],
+    'expense': ['expenses', 'reimbursement', 'travel'],
+    'travel': ['business', 'trip', 'expenses'],
+    'referral': ['referrals', 'refer'],
+    'late': ['attendance', 'punctuality'],
+    'attendance': ['punctuality', 'absenteeism'],
+    'benefits': ['benefit', 'insurance', 'perks'],
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def stem(token):
+    """Very light suffix stripping so 'phones'/'phone' and 'dating'/'dated' meet."""
+    for suffix in ('ing', 'ies', 'ed', 'es', 's'):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == 'ies':
+                return token[:-3] + 'y'
+            if suffix == 'es' and not token.endswith(('ses', 'xes', 'zes', 'ches', 'shes')):
+                # 'phones' -> 'phone', but 'boxes' -> 'box'
+                continue
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text):
+    """Lowercase, split on non-alphanumerics, drop stopwords and stem."""
+    text = text.lower().replace('’', "'")
+    return [stem(t) for t in _TOKEN_RE.findall(text) if len(t) > 1 and t not in STOPWORDS]
+
+
+def expand_query(query):
+    """Return {stemmed term: weight}, synonyms weighted below the original terms."""
+    weights = {}
+    raw = [t for t in _TOKEN_RE.findall(query.lower()) if len(t) > 1 and t not in STOPWORDS]
+    for token in raw:
+        weights[stem(token)] = 1.0
+    for token in raw:
+        for synonym in HR_SYNONYMS.get(token, ()):
+            term = stem(synonym)
+            weights.setdefault(term, SYNONYM_WEIGHT)
+    return weights
+
+
+class BM25Index:
+    """Inverted index with Okapi BM25 scoring over policy passages."""
+
+    def __init__(self, passages):
+        """`passages` is a list of {'section': str, 'text': str}."""
+        self.passages = passages
+        postings = defaultdict(lambda: ([], []))
+        lengths = []
+        for doc_id, passage in enumerate(passages):
+            counts = Counter(tokenize(passage['text']) + tokenize(passage['section']))
+            lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                postings[term][0].append(doc_id)
+                postings[term][1].append(tf)
+
+        n_docs = len(passages)
+        self.doc_len = np.asarray(lengths, dtype=np.float32)
+        avg_len = float(self.doc_len.mean()) if n_docs else 0.0
+        # Precompute the length normalisation part of the BM25 denominator
+        self._norm = K1 * (1 - B + B * self.doc_len / (avg_len or 1.0))
+        self.postings = {}
+        for term, (ids, tfs) in postings.items():
+            df = len(ids)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            self.postings[term] = (np.asarray(ids, dtype=np.int32), np.asarray(tfs, dtype=np.float32), idf)
+
+    @classmethod
+    def from_docx(cls, path):
+        """Build an index with one passage per paragraph of a DOCX file."""
+        passages = [
+            {'section': section, 'text': text}
+            for section, text, is_heading in read_docx_paragraphs(path)
+            if not is_heading
+        ]
+        return cls(passages)
+
+    def search(self, query, limit=5):
+        """Return [(score, passage)] ranked by BM25 score, best first."""
+        with stage('retrieval', 'bm25'):
+            scores = np.zeros(len(self.passages), dtype=np.float32)
+            for term, weight in expand_query(query).items():
+                posting = self.postings.get(term)
+                if posting is None:
+                    continue
+                ids, tfs, idf = posting
+                scores[ids] += weight * idf * tfs * (K1 + 1) / (tfs + self._norm[ids])
+
+            matched = np.flatnonzero(scores)
+            if not len(matched):
+                return []
+            limit = min(limit, len(matched))
+            top = matched[np.argsort(-scores[matched], kind='stable')[:limit]]
+            return [(float(scores[i]), self.passages[i]) for i in top]
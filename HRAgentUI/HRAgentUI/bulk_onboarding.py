@@ -0,0 +1,167 @@
+"""
+Bulk onboarding from a roster CSV.
+
+A roster has one row per new hire with the columns name, role, email and
+code_of_conduct (the link to the Code of Conduct; `codeOfConduct` is also
+accepted). Hires are grouped by role so each role's research is looked up
+once (from its precomputed pack, see role_packs.py, or researched and
+stored), the personalized greetings are generated concurrently (bounded by
+`concurrency`), and all emails go out over a single SMTP session.
+
+Run it with `python manage.py bulk_onboard roster.csv` or upload the roster
+to /onboarding-bulk/, which runs it on the job queue.
+"""
+import csv
+import io
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .crew_specs import GREETER_AGENT, GREETING_TASK, RESEARCH_AGENT, RESEARCH_TASK
+from .mail_transport import build_message, get_mail_pool
+from .role_packs import research_for_role
+from .tool_registry import get_google_search
+
+ONBOARDING_SUBJECT = 'Welcome to Company XYZ!!!'
+
+_COLUMN_ALIASES = {
+    'name': 'name',
+    'role': 'role',
+    'job role': 'role',
+    'email': 'email',
+    'code_of_conduct': 'code_of_conduct',
+    'codeofconduct': 'code_of_conduct',
+    'code of conduct': 'code_of_conduct',
+    'code of conduct link': 'code_of_conduct',
+}
+
+
+def read_roster(source):
+    """Parse a roster from a path, a text/bytes file object or CSV text.
+
+    A string is read as a path when that file exists (commas are fine in file
+    names) and as CSV text when it spans several lines.
+    Returns a list of dicts with name, role, email and code_of_conduct keys.
+    """
+    if hasattr(source, 'read'):
+        text = source.read()
+        if isinstance(text, bytes):
+            text = text.decode('utf-8-sig')
+    elif not os.path.exists(source) and '\n' in source:
+        text = source
+    else:
+        with open(source, encoding='utf-8-sig') as fh:
+            text = fh.read()
+
+    rows = []
+    for raw in csv.DictReader(io.StringIO(text)):
+        row = {}
+        for column, value in raw.items():
+            key = _COLUMN_ALIASES.get((column or '').strip().lower())
+            if key:
+                row[key] = (value or '').strip()
+        if any(row.values()):
+            row.setdefault('code_of_conduct', '')
+            rows.append(row)
+    return rows
+
+
+def research_role(role):
+    """Research best practices (with links) for a job role; run once per role."""
+    from crewai import Crew
+
+    researcher_agent = RESEARCH_AGENT.build(tools=[get_google_search()])
+    research_task = RESEARCH_TASK.build(researcher_agent, role=role)
+    result = Crew(agents=[researcher_agent], tasks=[research_task]).kickoff()
+    return str(result)
+
+
+def personalize(hire, research):
+    """Write the onboarding email for one hire, splicing in the role research."""
+    from crewai import Crew
+
+    greet_agent = GREETER_AGENT.build()
+    onboard_task = GREETING_TASK.build(greet_agent, link=hire['code_of_conduct'], role=hire['role'],
+                                       name=hire['name'], research=research)
+    result = Crew(agents=[greet_agent], tasks=[onboard_task]).kickoff()
+    return str(result)
+
+
+def run_bulk_onboarding(rows, concurrency=4, send=True, sender=None, progress=None):
+    """Onboard every hire in `rows` and return a per-row report with throughput.
+
+    `progress`, if given, is called with each row's report entry as it finishes.
+    """
+    started = time.perf_counter()
+    report = [
+        {'row': i + 1, 'name': row.get('name'), 'email': row.get('email'), 'role': row.get('role'),
+         'status': 'pending', 'error': None}
+        for i, row in enumerate(rows)
+    ]
+
+    def finish(entry, status, error=None):
+        entry['status'] = status
+        entry['error'] = error
+        if progress:
+            progress(entry)
+
+    valid = []
+    for entry, row in zip(report, rows):
+        missing = [key for key in ('name', 'role', 'email') if not row.get(key)]
+        if missing:
+            finish(entry, 'failed', f"Missing {', '.join(missing)}")
+        else:
+            valid.append((entry, row))
+
+    # One research run per distinct role, shared by every hire in that role
+    by_role = OrderedDict()
+    for entry, row in valid:
+        by_role.setdefault(row['role'].strip().lower(), []).append((entry, row))
+
+    bodies = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='onboard') as pool:
+        research_futures = {pool.submit(research_for_role, hires[0][1]['role']): hires
+                            for hires in by_role.values()}
+        personal_futures = {}
+        for future in as_completed(research_futures):
+            hires = research_futures[future]
+            try:
+                research = future.result()
+            except Exception as e:
+                for entry, _ in hires:
+                    finish(entry, 'failed', f"Role research failed: {e}")
+                continue
+            for entry, row in hires:
+                personal_futures[pool.submit(personalize, row, research)] = (entry, row)
+
+        for future in as_completed(personal_futures):
+            entry, row = personal_futures[future]
+            try:
+                bodies[entry['row']] = future.result()
+            except Exception as e:
+                finish(entry, 'failed', f"Generation failed: {e}")
+                continue
+            if not send:
+                finish(entry, 'generated')
+
+    if send and bodies:
+        mail_pool = get_mail_pool()
+        sender = sender or mail_pool.config.username
+        ready = [(entry, row) for entry, row in valid if entry['row'] in bodies]
+        messages = [build_message(sender, row['email'], ONBOARDING_SUBJECT, bodies[entry['row']]) for entry, row in ready]
+        # All emails share one SMTP session
+        for (entry, _), error in zip(ready, mail_pool.send_many(messages)):
+            finish(entry, 'failed' if error else 'sent', f"Send failed: {error}" if error else None)
+
+    elapsed = time.perf_counter() - started
+    succeeded = sum(1 for entry in report if entry['status'] in ('sent', 'generated'))
+    return {
+        'rows': report,
+        'total': len(report),
+        'succeeded': succeeded,
+        'failed': len(report) - succeeded,
+        'roles_researched': len(by_role),
+        'elapsed_seconds': round(elapsed, 2),
+        'throughput_per_minute': round(succeeded / elapsed * 60, 2) if elapsed else 0.0,
+    }
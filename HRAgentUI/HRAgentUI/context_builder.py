@@ -0,0 +1,58 @@
+"""
+Token counting and document text for task prompts.
+
+`count_tokens` measures prompt text (cl100k_base when tiktoken is installed)
+for the context budgets in context_packer.py, and `inline_document` wraps a
+document, or the excerpts of it that fit, for a task description. Candidate
+notes are put into the prompt by notes_summary.notes_context.
+"""
+import importlib.util
+import os
+from functools import lru_cache
+
+
+def _bundled_tokenizers():
+    """litellm's copy of the tiktoken files, found without importing litellm."""
+    try:
+        spec = importlib.util.find_spec('litellm')
+    except (ImportError, ValueError):
+        return None
+    for location in (spec and spec.submodule_search_locations) or ():
+        path = os.path.join(location, 'litellm_core_utils', 'tokenizers')
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    # Without the cache dir tiktoken downloads the encoding, and offline it is
+    # only found once crewai has imported litellm (which sets it); set it here
+    # so counts don't depend on import order
+    if not os.getenv('TIKTOKEN_CACHE_DIR'):
+        path = _bundled_tokenizers()
+        if path:
+            os.environ['TIKTOKEN_CACHE_DIR'] = path
+    try:
+        import tiktoken
+        return tiktoken.get_encoding('cl100k_base')
+    except Exception:
+        return None
+
+
+def count_tokens(text):
+    """Token count of `text` (cl100k_base when tiktoken is available, else ~4 chars per token)."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def read_text(path):
+    with open(path, encoding='utf-8', errors='replace') as fh:
+        return fh.read()
+
+
+def inline_document(text, label='Document', excerpts=False):
+    """Wrap a document (or, with `excerpts`, selected parts of it) for inclusion in a task description."""
+    return f"{label} ({'excerpts' if excerpts else 'full text'}):\n<<<\n{text.strip()}\n>>>"
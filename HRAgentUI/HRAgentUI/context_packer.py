@@ -0,0 +1,254 @@
+"""
+Token-budgeted context for agent prompts.
+
+Each LLM endpoint gets a prompt budget in tokens. The agent's role, goal and
+backstory, the task description and the tool descriptions are charged first
+as fixed cost; retrieved text (policy passages, notes, prefetched meeting
+context) has to fit in what is left. `pack()` fits a list of passages into a
+token allowance:
+
+    1. drops passages that repeat one already kept, and the sentences of a
+       passage that an earlier passage already covers (overlapping chunks);
+    2. ranks them by their retrieval score, or by query-term overlap (the
+       BM25 tokenizer and HR synonyms) when they have none;
+    3. keeps them in rank order while they fit, compresses the first one that
+       does not to its most relevant sentences, and skips the rest unless a
+       shorter one still fits.
+
+`context_budget(endpoint)` opens a budget for one request. Tools called
+inside the `with` block (the crew's PolicySearchTool calls included, as
+they run in the same context) draw on it through `current_budget()`, so
+repeated searches cannot grow the prompt past the budget. When the block
+ends the achieved prompt size is logged and observed in hr_prompt_tokens,
+next to the request's latency in hr_request_duration_seconds.
+
+    CONTEXT_BUDGET_<ENDPOINT>   prompt tokens for one endpoint, e.g.
+                                CONTEXT_BUDGET_PROCESS_FORM=1500
+    CONTEXT_FRAMEWORK_TOKENS    tokens crewai adds around every agent prompt (default 350)
+"""
+import contextvars
+import math
+import os
+import re
+import time
+from contextlib import contextmanager
+
+from .context_builder import _encoding, count_tokens
+from .metrics import CONTEXT_PASSAGES, PROMPT_TOKENS
+
+ENDPOINT_BUDGETS = {
+    'process_form': 1500,
+    'answer_faq': 2000,
+    'summarize_notes': 4000,
+    'create_meeting_notes': 4000,
+}
+DEFAULT_BUDGET = 3000
+FRAMEWORK_TOKENS = int(os.getenv('CONTEXT_FRAMEWORK_TOKENS', '350'))
+# Passages with less room than this are skipped rather than cut to a stub
+MIN_PASSAGE_TOKENS = 40
+# Share of a passage's word 3-grams already kept for it to count as a duplicate
+DUPLICATE_OVERLAP = 0.8
+
+_SENTENCE = re.compile(r'((?<=[.!?])\s+|\n+)')
+_WORD = re.compile(r"[a-z0-9']+")
+
+_current = contextvars.ContextVar('context_budget', default=None)
+
+
+def endpoint_budget(endpoint):
+    """Prompt token budget for `endpoint` (CONTEXT_BUDGET_<ENDPOINT> overrides the default)."""
+    value = os.getenv(f'CONTEXT_BUDGET_{endpoint.upper()}')
+    return int(value) if value else ENDPOINT_BUDGETS.get(endpoint, DEFAULT_BUDGET)
+
+
+def format_passage(passage):
+    """'[Section]\\ntext' for policy chunks, the bare text otherwise."""
+    section = passage.get('section')
+    return f"[{section}]\n{passage['text']}" if section else passage['text']
+
+
+def truncate_tokens(text, tokens):
+    """The first `tokens` tokens of `text`."""
+    encoding = _encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:tokens])
+    return text[:tokens * 4]
+
+
+def _shingles(text):
+    words = _WORD.findall(text.lower())
+    if len(words) < 3:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + 3]) for i in range(len(words) - 2)}
+
+
+def _sentences(text):
+    """(sentence, following whitespace) pairs, so a selection can be joined back with its line breaks."""
+    parts = _SENTENCE.split(text) + ['']
+    return [(parts[i], parts[i + 1]) for i in range(0, len(parts) - 1, 2) if parts[i].strip()]
+
+
+def _join(sentences):
+    return ''.join(sentence + space for sentence, space in sentences).strip()
+
+
+def _relevance(text, weights):
+    from .bm25 import tokenize
+
+    terms = tokenize(text)
+    if not terms or not weights:
+        return 0.0
+    tf = {}
+    for term in terms:
+        tf[term] = tf.get(term, 0) + 1
+    return sum(w * (1 + math.log(tf[t])) for t, w in weights.items() if t in tf) / math.log(2 + len(terms))
+
+
+def _compress(text, room, weights, render):
+    """The sentences of `text` most relevant to the query that fit in `room` tokens, in order."""
+    sentences = _sentences(text)
+    if not sentences:
+        return ''
+    ranked = sorted(range(len(sentences)), key=lambda i: (-_relevance(sentences[i][0], weights), i))
+    sizes = [count_tokens(sentence + space) for sentence, space in sentences]
+    overhead = count_tokens(render(''))
+    chosen, used = [], overhead
+    for i in ranked:
+        if used + sizes[i] <= room:
+            chosen.append(i)
+            used += sizes[i]
+    while chosen:
+        compressed = _join(sentences[j] for j in sorted(chosen))
+        if count_tokens(render(compressed)) <= room:
+            return compressed
+        chosen.pop()
+    # Not even one sentence fits: cut the best one
+    return truncate_tokens(sentences[ranked[0]][0], max(room - overhead, 0))
+
+
+def pack(passages, budget, query=None, render=format_passage, limit=None):
+    """Fit `passages` (dicts with 'text' and optionally 'score') into `budget` tokens.
+
+    Token counts are taken on `render(passage)`, the form the passage takes in
+    the prompt. Returns (kept, stats): the kept passages in rank order, each a
+    copy with its possibly shortened 'text', 'tokens' and 'trimmed', and
+    stats with tokens, kept, trimmed, dropped and duplicates. At most
+    `limit` passages are kept; the rest count as dropped.
+    """
+    from .bm25 import expand_query
+
+    weights = expand_query(query) if query else {}
+    stats = {'tokens': 0, 'kept': 0, 'trimmed': 0, 'dropped': 0, 'duplicates': 0}
+
+    candidates = []
+    for position, passage in enumerate(passages):
+        score = passage.get('score')
+        score = _relevance(passage['text'], weights) if score is None else score
+        candidates.append((-score, position, passage))
+    candidates.sort(key=lambda c: c[:2])
+
+    seen, kept, room = set(), [], budget
+    for _, _, passage in candidates:
+        if limit is not None and len(kept) >= limit:
+            stats['dropped'] += 1
+            continue
+        text = passage['text']
+        shingles = _shingles(text)
+        if not shingles or len(shingles & seen) >= DUPLICATE_OVERLAP * len(shingles):
+            stats['duplicates'] += 1
+            continue
+        if shingles & seen:
+            # Overlapping chunk: keep only the sentences the kept passages do not already cover
+            sentences = _sentences(text)
+            fresh = [(sentence, space) for sentence, space in sentences
+                     if len(_shingles(sentence) & seen) < DUPLICATE_OVERLAP * len(_shingles(sentence))]
+            if not fresh:
+                stats['duplicates'] += 1
+                continue
+            if len(fresh) < len(sentences):
+                text = _join(fresh)
+        passage = dict(passage, text=text, trimmed=text is not passage['text'])
+        tokens = count_tokens(render(passage))
+        if tokens > room:
+            if room < MIN_PASSAGE_TOKENS:
+                stats['dropped'] += 1
+                continue
+            passage['text'] = _compress(text, room, weights, lambda t: render(dict(passage, text=t)))
+            passage['trimmed'] = True
+            tokens = count_tokens(render(passage))
+            if not passage['text'] or tokens > room:
+                stats['dropped'] += 1
+                continue
+        passage['tokens'] = tokens
+        seen |= _shingles(passage['text'])
+        kept.append(passage)
+        room -= tokens
+        stats['tokens'] += tokens
+        stats['kept'] += 1
+        stats['trimmed'] += passage['trimmed']
+    return kept, stats
+
+
+class ContextBudget:
+    """The prompt budget of one request: fixed prompt text plus the context packed into it."""
+
+    def __init__(self, endpoint, budget=None):
+        self.endpoint = endpoint
+        self.budget = endpoint_budget(endpoint) if budget is None else budget
+        self.fixed = 0
+        self.context = 0
+        self.stats = {'kept': 0, 'trimmed': 0, 'dropped': 0, 'duplicates': 0}
+
+    @property
+    def remaining(self):
+        return max(self.budget - self.fixed - self.context, 0)
+
+    @property
+    def tokens(self):
+        return self.fixed + self.context
+
+    def charge(self, *texts):
+        """Count prompt text that is sent as is (instructions, the question, section titles)."""
+        self.fixed += sum(count_tokens(text) for text in texts if text)
+
+    def charge_crew(self, agent, task):
+        """Count a built crewai agent and task: persona, task text, tool descriptions and framing."""
+        self.charge(agent.role, agent.goal, agent.backstory, task.description, task.expected_output,
+                    *(tool.description for tool in (task.tools or agent.tools or ())))
+        self.fixed += FRAMEWORK_TOKENS
+
+    def pack(self, passages, query=None, render=format_passage, limit=None):
+        """pack() the passages into what is left of the budget and charge them."""
+        kept, stats = pack(passages, self.remaining, query=query, render=render, limit=limit)
+        self.context += stats.pop('tokens')
+        for key, value in stats.items():
+            self.stats[key] += value
+        return kept
+
+    def report(self, seconds):
+        for outcome in ('kept', 'trimmed', 'dropped', 'duplicates'):
+            if self.stats[outcome]:
+                CONTEXT_PASSAGES.inc(self.stats[outcome], endpoint=self.endpoint, outcome=outcome)
+        PROMPT_TOKENS.observe(self.tokens, endpoint=self.endpoint)
+        print(f"Prompt {self.endpoint}: {self.tokens}/{self.budget} tokens "
+              f"({self.fixed} fixed, {self.context} context; {self.stats['kept']} passages kept, "
+              f"{self.stats['trimmed']} trimmed, {self.stats['dropped']} dropped, "
+              f"{self.stats['duplicates']} duplicates) in {seconds:.2f}s")
+
+
+def current_budget():
+    """The ContextBudget of the request being handled, or None outside `context_budget`."""
+    return _current.get()
+
+
+@contextmanager
+def context_budget(endpoint, budget=None):
+    """Open a prompt budget for one request; logs the achieved prompt size on exit."""
+    started = time.perf_counter()
+    current = ContextBudget(endpoint, budget)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+        current.report(time.perf_counter() - started)
@@ -0,0 +1,78 @@
+"""
+LLM objects handed to crewai Agents.
+
+In live mode `agent_llm()` returns None, so crewai builds its default LLM
+from OPENAI_MODEL_NAME / MODEL exactly as before. In record and replay mode
+(see llm_replay) it returns a ReplayLLM, which records every completion made
+by the real model or serves them back from the cassette without any network.
+"""
+import os
+import time
+
+from crewai import LLM, BaseLLM
+from crewai.events import crewai_event_bus
+from crewai.events.types.llm_events import (
+    LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent, LLMCallType)
+
+from .llm import model_name
+from .llm_replay import LIVE, RECORD, REPLAY, llm_mode, record_completion, replay_completion, replay_delay
+from .metrics import install_crewai_listeners
+
+
+class ReplayLLM(BaseLLM):
+    """crewai LLM that records completions to, or replays them from, the cassette."""
+
+    def __init__(self, model, mode=REPLAY, temperature=None, stop=None):
+        super().__init__(model=model, temperature=temperature, stop=stop)
+        self.mode = mode
+        self._live = None
+
+    def _live_llm(self):
+        if self._live is None:
+            self._live = LLM(model=self.model, temperature=self.temperature, stop=self.stop)
+        return self._live
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None):
+        if self.mode == RECORD:
+            # The live LLM emits its own call events
+            started = time.perf_counter()
+            text = self._live_llm().call(messages, tools=tools, callbacks=callbacks,
+                                         available_functions=available_functions,
+                                         from_task=from_task, from_agent=from_agent)
+            if isinstance(text, str):
+                record_completion(messages, text, time.perf_counter() - started, model=self.model)
+            return text
+
+        crewai_event_bus.emit(self, LLMCallStartedEvent(
+            messages=messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+            model=self.model, from_task=from_task, from_agent=from_agent))
+        try:
+            text, entry = replay_completion(messages)
+        except Exception as e:
+            crewai_event_bus.emit(self, LLMCallFailedEvent(error=str(e), from_task=from_task,
+                                                           from_agent=from_agent))
+            raise
+        time.sleep(replay_delay(entry))
+        crewai_event_bus.emit(self, LLMCallCompletedEvent(
+            messages=messages, response=text, call_type=LLMCallType.LLM_CALL, model=self.model,
+            from_task=from_task, from_agent=from_agent))
+        return text
+
+    def supports_function_calling(self):
+        return False
+
+    def get_context_window_size(self):
+        return 128000
+
+
+def agent_llm():
+    """LLM for a new Agent: None (crewai's default) in live mode, else a ReplayLLM."""
+    install_crewai_listeners()
+    mode = llm_mode()
+    if mode == LIVE:
+        return None
+    if mode == REPLAY:
+        # Replay runs must not touch the network, crewai's telemetry included
+        os.environ.setdefault('CREWAI_DISABLE_TELEMETRY', 'true')
+    return ReplayLLM(model_name(), mode=mode)
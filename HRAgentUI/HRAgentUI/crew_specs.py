@@ -0,0 +1,264 @@
+"""
+Agent and task definitions shared by the Django views, the bulk onboarding
+and notes helpers and the Streamlit app.
+
+Each `AgentSpec` builds its crewai Agent once per process (validating the
+definition and resolving the LLM) and `build()` hands out a cheap copy of it
+for every crew run: crewai keeps per-run state (executor, crew, token counts) on
+the Agent, so one instance can't serve two requests at once. Task templates
+are dedented once and `build()` only substitutes the request's values, e.g.
+
+    agent = FAQ_AGENT.build(tools=[get_doc_search()])
+    task = FAQ_TASK.build(agent, question=question)
+    Crew(agents=[agent], tasks=[task]).kickoff()
+"""
+import threading
+import uuid
+from textwrap import dedent
+
+
+class AgentSpec:
+    """An Agent definition whose instance is built once and cloned per run."""
+
+    def __init__(self, role, goal, backstory, **options):
+        self.role = role
+        self.goal = goal
+        self.backstory = backstory
+        self.options = dict(verbose=True, **options)
+        self._prototype = None
+        self._lock = threading.Lock()
+
+    def prototype(self):
+        """The process-wide Agent the clones are copied from; never run it directly."""
+        if self._prototype is None:
+            with self._lock:
+                if self._prototype is None:
+                    from crewai import Agent
+                    from .crew_llm import agent_llm
+                    self._prototype = Agent(role=self.role, goal=self.goal, backstory=self.backstory,
+                                            llm=agent_llm(), **self.options)
+        return self._prototype
+
+    def build(self, tools=()):
+        """Return a fresh Agent for one crew run, sharing the prototype's LLM.
+
+        This is a shallow copy with crewai's per-run state reset (the Crew
+        installs its own executor and tool cache on the copy), which is much
+        cheaper than `Agent(...)` or `Agent.copy()` because it skips
+        re-validating the whole model. The fields are those of crewai 0.186.
+        """
+        from crewai.agents.agent_builder.utilities.base_token_process import TokenProcess
+        agent = self.prototype().model_copy(update=dict(
+            id=uuid.uuid4(), tools=list(tools), tools_results=[], agent_executor=None, crew=None))
+        agent._token_process = TokenProcess()
+        agent._times_executed = 0
+        return agent
+
+
+class TaskTemplate:
+    """A Task definition whose description has {placeholders} filled in per run."""
+
+    def __init__(self, description, expected_output):
+        self.description = description
+        self.expected_output = expected_output
+
+    def build(self, agent, tools=None, context=None, **values):
+        from crewai import Task
+        options = {}
+        if tools is not None:
+            options['tools'] = list(tools)
+        if context:
+            options['context'] = context
+        return Task(description=self.description.format(**values), expected_output=self.expected_output,
+                    agent=agent, **options)
+
+
+# -- Policy FAQ (views.process_form) -----------------------------------------
+
+FAQ_AGENT = AgentSpec(
+    role='Human Resource Employee',
+    goal='Find the section of the document which contains relevant information and summarize them.',
+    backstory=dedent("""\
+        As a HR Employee, your mission is to find which sections of the document contains the
+        relevant information and summarize those in a few sentences. If you can't find any keywords then just say
+        I couldn't find anything in our company's policy regarding this topic. Kindly
+        contact HR for information on this topic."""),
+)
+
+FAQ_TASK = TaskTemplate(
+    description=dedent("""\
+        Find all the relevant areas of the document where the words from the question appear and
+        summarize them in a few words.
+        Question: {question}"""),
+    expected_output=dedent("""\
+        Give a single conclusive answer using the relevant information in the document which
+        contains the keyword asked in the question. Answer the question with a yes or no.
+     Start each answer with yes or no and then say' our company policy states that'. Answer should not be longer than 2-3 sentences."""),
+)
+
+# -- Candidate notes (notes_summary) -----------------------------------------
+
+NOTES_AGENT = AgentSpec(
+    role="Candidate Notes Summarizer",
+    goal='Summarizes the notes on a candidate',
+    backstory=dedent("""\
+        As a Notes Summarizer, your mission is to read through the entire file
+        and summarize the information in a concise yet informative manner into bullet points."""),
+)
+
+NOTES_TASK = TaskTemplate(
+    description=dedent("""\
+        Summarize the document into a few detailed bullet points
+        Candidate Name: {candidate_name}
+
+        {source}"""),
+    expected_output=dedent("""\
+        Ensure each bullet point isn't longer than 80 characters
+        Have a list of 5-6 bullet points on notes given about the candidate
+        Use this format for your output:
+        Candidate Name : [Candidate Name]
+        - Candidate notes"""),
+)
+
+# -- Onboarding (views.run_onboarding, bulk_onboarding) ----------------------
+
+ONBOARDING_AGENT = AgentSpec(
+    role="Personalized Message Sender and Research Specialist",
+    goal='Write a personalized message to person and welcome them into the company. Also, Research the role to find the best practices for the job role and provide links on how to be successful.',
+    backstory=dedent("""\
+        Your job is to write a personalized message to the new employee joining the company and talk about company culture and wish
+        the employee success in the company.Also, your job is to search the web and come up with the best practices and methods
+        to be successful at a specific job role and also provide useful links which talk about how to be successful
+        in the particular job role. """),
+)
+
+ONBOARDING_EMAIL_FORMAT = dedent("""\
+    Output should be formatted like this:
+    - Greeting and well wishes
+    - Ask to review Employee Code of Conduct with link
+    - Best Practices to be successful along with links
+    - end it with
+    Best Regards,
+    John McEnroe,
+    HR of Company XYZ""")
+
+ONBOARDING_TASK = TaskTemplate(
+    description=dedent("""\
+        onboard the people by wishing good luck and ask them to review the code of conduct.generate the best practices and ways a person can successful at the given job role
+        Employee Code of Conduct Link: {link},
+        Job Role: {role},
+        Name: {name}"""),
+    expected_output=ONBOARDING_EMAIL_FORMAT,
+)
+
+RESEARCH_AGENT = AgentSpec(
+    role="Research Specialist",
+    goal='Research the role to find the best practices for the job role and provide links on how to be successful ',
+    backstory=dedent("""\
+        As a Research Specialist, your job is to search the web and come up with the best practices and methods
+        to be successful at a specific job role and also provide useful links which talk about how to be successful
+        in the particular job role."""),
+)
+
+RESEARCH_TASK = TaskTemplate(
+    description=dedent("""\
+        generate the best practices and ways a person can successful at the given job role
+        Job Role: {role}"""),
+    expected_output=dedent("""\
+        The best practices and things to do to be successful at the job role along with useful links for reference"""),
+)
+
+GREETER_AGENT = AgentSpec(
+    role="Personalized Message Sender",
+    goal='Write a personalized message to person and welcome them into the company ',
+    backstory=dedent("""\
+        Your job is to write a personalized message to the new employee joining the company and talk about company culture and wish
+        the employee success in the company"""),
+)
+
+GREETING_TASK = TaskTemplate(
+    description=dedent("""\
+        onboard the people by wishing good luck and ask them to review the code of conduct
+        Employee Code of Conduct Link: {link},
+        Job Role: {role},
+        Name: {name}
+
+        Best practices for the role (already researched, include them with their links):
+        {research}"""),
+    expected_output=ONBOARDING_EMAIL_FORMAT,
+)
+
+# -- Streamlit assistant -----------------------------------------------------
+
+MEETING_PREP_AGENT = AgentSpec(
+    role="Meeting Preparation Specialist",
+    goal="Prepare comprehensive meeting notes and analysis for HR discussions",
+    backstory=dedent("""\
+        You are an experienced HR specialist who excels at preparing for meetings.
+        You analyze candidate information, company policies, and create structured meeting notes
+        that help HR professionals conduct effective interviews and discussions."""),
+    allow_delegation=False,
+)
+
+MEETING_NOTES_TASK = TaskTemplate(
+    description=dedent("""\
+        Prepare comprehensive meeting notes based on this request: {request}
+
+        Use the available tools to:
+        1. Search relevant company policies and documents
+        2. Look up any relevant candidate or employee information
+        3. Research any additional context needed
+        4. Schedule interviews when the request asks to place several candidates
+
+        Provide structured meeting notes with:
+        - Key discussion points
+        - Relevant policies or procedures
+        - Questions to ask
+        - Action items
+        """),
+    expected_output="Structured meeting notes: Key discussion points; Relevant policies; Questions to ask; Action items",
+)
+
+MEETING_NOTES_PREFETCHED_TASK = TaskTemplate(
+    description=dedent("""\
+        Prepare comprehensive meeting notes based on this request: {request}
+
+        The relevant company policies, interview schedule, candidate summaries and web
+        results have already been looked up for you:
+
+        {context}
+
+        Provide structured meeting notes with:
+        - Key discussion points
+        - Relevant policies or procedures
+        - Questions to ask
+        - Action items
+        """),
+    expected_output=MEETING_NOTES_TASK.expected_output,
+)
+
+EMAIL_AGENT = AgentSpec(
+    role="Professional Communication Specialist",
+    goal="Draft professional HR emails and communications",
+    backstory=dedent("""\
+        You are a skilled professional communicator who specializes in HR
+        communications. You draft clear, professional, and appropriate emails for various
+        HR scenarios including offers, rejections, policy updates, and general communications."""),
+    allow_delegation=False,
+)
+
+EMAIL_DRAFT_TASK = TaskTemplate(
+    description=dedent("""\
+        Draft a professional HR email based on this request: {request}
+
+        Create a well-structured email that includes:
+        - Appropriate subject line
+        - Professional greeting
+        - Clear, concise body content
+        - Professional closing
+        - Proper tone for the situation
+
+        Make sure the email follows professional HR communication standards.
+        """),
+    expected_output="Email content: subject, greeting, body, and closing",
+)
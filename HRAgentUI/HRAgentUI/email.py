@@ -10,6 +10,14 @@ from tasks import MeetingPrepTasks
 from agents import MeetingPrepAgents
 from datetime import datetime, timedelta
 from crewai_tools import DOCXSearchTool, CSVSearchTool, TXTSearchTool, tool, SerperDevTool
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from HRAgentUI.mail_transport import build_message, get_mail_pool
+from HRAgentUI.crew_llm import agent_llm
+from HRAgentUI.bulk_onboarding import personalize
+from HRAgentUI.role_packs import get_role_pack_store, role_pack
+from HRAgentUI.tool_registry import get_google_search
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -22,7 +30,7 @@ load_dotenv()
 
 doc_search = DOCXSearchTool("docs/Employee-Code-of-Conduct.docx")
 csv_search = CSVSearchTool('interview_data.csv')
-google_search = SerperDevTool()
+google_search = get_google_search()
 
 ##########################This is for the onboarding section ######################################################
 print("")
@@ -39,6 +47,7 @@ researcher_agent = Agent(
           As a Research Specialist, your job is to search the web and come up with the best practices and methods
           to be successful at a specific job role and also provide useful links which talk about how to be successful
           in the partciular job role."""),
+        llm=agent_llm(),
         verbose=True
       )
 
@@ -59,6 +68,7 @@ greet_agent = Agent(
         backstory=dedent("""\
           Your job is to write a personalized message to the new employee joining the company and talk about company culture and wish
           the employee success in the company"""),
+        llm=agent_llm(),
         verbose=True
       )
 def onboard_task(name,link):
@@ -81,9 +91,15 @@ def onboard_task(name,link):
         )
 set_onboard_task = onboard_task(name,link="")
 
-crew = Crew(agents=[researcher_agent,greet_agent], tasks=[set_research_task,set_onboard_task])
-# Get your crew to work!
-result = crew.kickoff()
+role_research = role_pack(role)
+if role_research is not None:
+    # The role's research is precomputed; only the greeting is generated
+    result = personalize({'name': name, 'role': role, 'code_of_conduct': ""}, role_research)
+else:
+    crew = Crew(agents=[researcher_agent,greet_agent], tasks=[set_research_task,set_onboard_task])
+    # Get your crew to work!
+    result = crew.kickoff()
+    get_role_pack_store().put(role, str(set_research_task.output))
 print("######################")
 print(result)
 
@@ -98,19 +114,10 @@ email_receiver = receiver_email
 subject = 'Welcome to Company XYZ!!!'
 body = result
 
-em = EmailMessage()
-em['From'] = email_sender
-em['To'] = email_receiver
-em['Subject'] = subject
-em.set_content(body)
+em = build_message(email_sender, email_receiver, subject, str(body))
 
-# Add SSL (layer of security)
-context = ssl.create_default_context()
-
-# Log in and send the email
-with smtplib.SMTP_SSL('smtp.gmail.com', 465, context=context) as smtp:
-    smtp.login(email_sender, email_password)
-    smtp.sendmail(email_sender, email_receiver, em.as_string())
+# Log in (once per pooled session) and send the email
+get_mail_pool(username=email_sender, password=email_password).send(em)
 
 print("Email has been sent to",name,"Email:",receiver_email)
 
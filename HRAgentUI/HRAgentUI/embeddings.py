@@ -0,0 +1,67 @@
+"""
+Local sentence embeddings used by the policy index.
+
+Uses the ONNX build of all-MiniLM-L6-v2 that ships with chromadb, so
+embedding the policy document needs no API key and no network once the
+model file is cached.
+
+EMBEDDING_BACKEND=hash switches to a feature-hashing embedder that needs no
+model file at all (the default under LLM_MODE=replay, for offline runs). It
+only matches on shared words, so use it for benchmarks and CI, not answers.
+"""
+import hashlib
+import os
+import re
+import threading
+
+import numpy as np
+
+from .llm_replay import REPLAY, llm_mode
+from .metrics import stage
+
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND') or ('hash' if llm_mode() == REPLAY else 'onnx')
+HASH_DIM = 384
+EMBEDDING_MODEL = 'hash-384' if EMBEDDING_BACKEND == 'hash' else os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def _get_model():
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+                _model = ONNXMiniLM_L6_V2()
+    return _model
+
+
+def _hash_embed(texts):
+    vectors = np.zeros((len(texts), HASH_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = re.findall(r'[a-z0-9]+', text.lower())
+        for feature in words + [a + ' ' + b for a, b in zip(words, words[1:])]:
+            digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], 'little') % HASH_DIM
+            vectors[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+    return vectors
+
+
+def embed(texts):
+    """Embed a list of strings into an (n, dim) float32 array of unit vectors."""
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    with stage('embedding', EMBEDDING_MODEL):
+        if EMBEDDING_BACKEND == 'hash':
+            vectors = _hash_embed(list(texts))
+        else:
+            vectors = np.asarray(_get_model()(list(texts)), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def embed_one(text):
+    """Embed a single string into a 1-d unit vector."""
+    return embed([text])[0]
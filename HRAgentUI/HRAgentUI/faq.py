@@ -7,6 +7,11 @@ from tasks import MeetingPrepTasks
 from agents import MeetingPrepAgents
 from datetime import datetime, timedelta
 from crewai_tools import DOCXSearchTool, CSVSearchTool, TXTSearchTool, tool, SerperDevTool
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from HRAgentUI.crew_llm import agent_llm
+from HRAgentUI.tool_registry import get_google_search
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -18,7 +23,7 @@ load_dotenv()
 # OPENAI_MODEL_NAME=gemini/gemini-1.5-flash
 
 csv_search = CSVSearchTool('interview_data.csv')
-google_search = SerperDevTool()
+google_search = get_google_search()
 # ##########################This is for the FAQ Section ######################################################
 
 asked_question =  input("What is the question you would like to ask: ")
@@ -34,6 +39,7 @@ faq_agent = Agent(
                     relevant information and summarize those in a few sentences. If you can't find any keywords then just say 
                     I couldn't find anything in our company's policy regarding this topic . Kindly 
                     contact HR for information on this topic."""),
+			llm=agent_llm(),
 			verbose=True
 		)
 def summary_task(question):
@@ -0,0 +1,84 @@
+"""
+No-LLM answers for the FAQ endpoints.
+
+FAQ_ANSWER_MODE selects how questions are answered:
+
+    llm         always run the crew (errors surface to the caller)
+    extractive  never call a model; answer with the best BM25 passages
+    auto        run the crew, but fall back to an extractive answer when the
+                model fails or takes longer than FAQ_LLM_TIMEOUT_SECONDS
+
+In auto mode a crew that outlives the timeout keeps running in the
+background and its answer is handed to `on_answer` (e.g. to fill the answer
+cache) so the next person asking gets the full answer.
+"""
+import asyncio
+import os
+
+from .aio import run_sync, submit
+from .tool_registry import get_bm25_index
+
+NOT_FOUND_ANSWER = (
+    "I couldn't find anything in our company's policy regarding this topic. "
+    "Kindly contact HR for information on this topic."
+)
+
+# Best BM25 score below which a question is treated as not covered by the policy
+MIN_SCORE = float(os.getenv('FAQ_EXTRACTIVE_MIN_SCORE', '3.0'))
+
+
+def answer_mode():
+    mode = os.getenv('FAQ_ANSWER_MODE', 'auto').lower()
+    return mode if mode in ('llm', 'extractive', 'auto') else 'auto'
+
+
+def llm_timeout():
+    value = os.getenv('FAQ_LLM_TIMEOUT_SECONDS')
+    return float(value) if value else None
+
+
+def extractive_answer(question, limit=2):
+    """Answer with the best matching policy passages, quoting their sections."""
+    hits = get_bm25_index().search(question, limit=limit)
+    if not hits or hits[0][0] < MIN_SCORE:
+        return NOT_FOUND_ANSWER
+    lines = ["Our company policy states that:"]
+    for _, passage in hits:
+        section = f" ({passage['section']})" if passage['section'] else ''
+        lines.append(f"- {passage['text']}{section}")
+    return "\n".join(lines)
+
+
+async def answer_with_fallback_async(question, run_llm, on_answer=None):
+    """Answer `question` according to FAQ_ANSWER_MODE.
+
+    `run_llm` is a zero-argument blocking callable returning the crew's answer
+    text; it runs on the async pool so the event loop is free while the crew
+    waits on the model. Returns (answer, mode) where mode is 'llm' or 'extractive'.
+    """
+    mode = answer_mode()
+    if mode == 'extractive':
+        return await run_sync(extractive_answer, question), 'extractive'
+    if mode == 'llm':
+        answer = await run_sync(run_llm)
+        if on_answer:
+            await run_sync(on_answer, answer)
+        return answer, 'llm'
+
+    # A concurrent future keeps running (and can still call on_answer) after
+    # the request's event loop has moved on
+    future = submit(run_llm)
+    try:
+        answer = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=llm_timeout())
+    except asyncio.TimeoutError:
+        if on_answer:
+            future.add_done_callback(
+                lambda f: f.exception() is None and on_answer(f.result())
+            )
+        return await run_sync(extractive_answer, question), 'extractive'
+    except Exception as e:
+        print(f"FAQ crew failed, answering extractively: {e}")
+        return await run_sync(extractive_answer, question), 'extractive'
+    if on_answer:
+        await run_sync(on_answer, answer)
+    return answer, 'llm'
@@ -0,0 +1,223 @@
+"""
+Background job queue for slow request handlers.
+
+Work runs on a local thread pool inside the process that accepted the
+request, while job state lives in a small SQLite file so that any gunicorn
+worker can answer `/jobs/<id>/` for it. A request handler enqueues the work,
+returns 202 with the job id and is free again immediately.
+
+States: queued -> running -> succeeded | failed.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import JOB_WORKERS, JOB_WORKERS_BUSY, stage
+from .paths import data_dir
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = 'queued', 'running', 'succeeded', 'failed'
+
+# Finished jobs older than this are purged
+JOB_RETENTION_SECONDS = 7 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    state TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    owner TEXT,
+    payload TEXT,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL
+)
+"""
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _boot_id():
+    try:
+        with open('/proc/sys/kernel/random/boot_id') as fh:
+            return fh.read().strip()
+    except OSError:
+        return ''
+
+
+def process_identity(pid):
+    """'<boot id>:<pid>:<start time>' of a running process, or None if it is not running.
+
+    PIDs are reused, so a job records this rather than the bare pid. Without
+    /proc (e.g. macOS) it falls back to the pid, which only tells liveness.
+    """
+    if not os.path.isdir('/proc/self'):
+        return str(pid) if _pid_alive(pid) else None
+    try:
+        with open(f'/proc/{pid}/stat') as fh:
+            stat = fh.read()
+    except OSError:
+        return None
+    # The command name may contain spaces and parentheses; field 22 (start time) follows it
+    start_time = stat.rsplit(')', 1)[1].split()[19]
+    return f'{_boot_id()}:{pid}:{start_time}'
+
+
+_identity = {}
+
+
+def own_identity():
+    pid = os.getpid()
+    # Keyed by pid so a forked worker does not inherit its parent's identity
+    if pid not in _identity:
+        _identity[pid] = process_identity(pid)
+    return _identity[pid]
+
+
+class JobStore:
+    """SQLite-backed job table shared by every process on the machine."""
+
+    def __init__(self, path=None):
+        self.path = str(path or data_dir() / 'jobs.sqlite3')
+        self._local = threading.local()
+        conn = self._conn()
+        with conn:
+            conn.execute(_SCHEMA)
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+            if 'owner' not in columns:
+                conn.execute('ALTER TABLE jobs ADD COLUMN owner TEXT')
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def create(self, kind, payload):
+        job_id = uuid.uuid4().hex
+        with self._conn() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, kind, state, pid, owner, payload, created) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, kind, QUEUED, os.getpid(), own_identity(), json.dumps(payload), time.time()),
+            )
+        return job_id
+
+    def update(self, job_id, **fields):
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'])
+        columns = ', '.join(f'{name} = ?' for name in fields)
+        with self._conn() as conn:
+            conn.execute(f'UPDATE jobs SET {columns} WHERE id = ?', (*fields.values(), job_id))
+
+    def get(self, job_id):
+        row = self._conn().execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        for private in ('payload', 'pid', 'owner'):
+            job.pop(private)
+        return job
+
+    def counts(self):
+        rows = self._conn().execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall()
+        return {state: count for state, count in rows}
+
+    def recover_orphans(self):
+        """Fail jobs whose owning process has died (e.g. a recycled gunicorn worker).
+
+        A job is alive only while a process with its recorded identity (pid and
+        start time) exists, so a pid reused by another process does not keep it
+        "running" forever.
+        """
+        rows = self._conn().execute(
+            'SELECT id, pid, owner FROM jobs WHERE state IN (?, ?)', (QUEUED, RUNNING)
+        ).fetchall()
+        for job_id, pid, owner in rows:
+            # Rows written before owners were recorded only have the pid
+            alive = process_identity(pid) == owner if owner else _pid_alive(pid)
+            if owner != own_identity() and not alive:
+                self.update(job_id, state=FAILED, error='Worker process exited before the job finished',
+                            finished=time.time())
+
+    def purge(self, older_than=JOB_RETENTION_SECONDS):
+        with self._conn() as conn:
+            conn.execute('DELETE FROM jobs WHERE finished IS NOT NULL AND finished < ?',
+                         (time.time() - older_than,))
+
+
+class JobQueue:
+    """Runs submitted callables on a bounded local thread pool, tracking them in a JobStore."""
+
+    def __init__(self, workers=None, store=None):
+        self.workers = workers or int(os.getenv('JOB_WORKERS', '4'))
+        self._store = store
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        # Opened lazily so importing the module never touches the filesystem
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = JobStore()
+                    self._store.recover_orphans()
+                    self._store.purge()
+        return self._store
+
+    def _pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+                    JOB_WORKERS.set(self.workers, pid=os.getpid())
+        return self._executor
+
+    def submit(self, kind, fn, *args, **kwargs):
+        """Queue `fn(*args, **kwargs)` and return the new job id.
+
+        The job's result is whatever `fn` returns (it must be JSON serializable).
+        """
+        job_id = self.store.create(kind, {'fn': getattr(fn, '__name__', repr(fn))})
+        self._pool().submit(self._run, job_id, kind, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job_id, kind, fn, args, kwargs):
+        self.store.update(job_id, state=RUNNING, started=time.time())
+        JOB_WORKERS_BUSY.inc(pid=os.getpid())
+        try:
+            with stage('job', kind):
+                result = fn(*args, **kwargs)
+            # Storing serializes the result; one that is not JSON fails the job instead of leaving it running
+            self.store.update(job_id, state=SUCCEEDED, result=result, finished=time.time())
+        except Exception as e:
+            traceback.print_exc()
+            self.store.update(job_id, state=FAILED, error=str(e), finished=time.time())
+        finally:
+            JOB_WORKERS_BUSY.dec(pid=os.getpid())
+
+    def status(self, job_id):
+        return self.store.get(job_id)
+
+
+job_queue = JobQueue()
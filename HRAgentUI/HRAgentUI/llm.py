@@ -0,0 +1,80 @@
+"""
+Direct LLM calls for paths that do not need a full crew.
+
+The FAQ streaming endpoints retrieve the relevant policy passages up front
+and make a single completion call, so tokens can be forwarded to the browser
+as soon as the model produces them instead of after the agent loop finishes.
+"""
+import os
+import re
+import time
+
+from .llm_replay import RECORD, REPLAY, llm_mode, record_completion, replay_completion, replay_delay
+from .metrics import STAGE_SECONDS, record_tokens, stage
+
+
+def model_name():
+    """Model used by crewai (OPENAI_MODEL_NAME / MODEL), in litellm naming"""
+    return os.getenv('OPENAI_MODEL_NAME') or os.getenv('MODEL') or 'gemini/gemini-1.5-flash'
+
+
+def stream_completion(messages, model=None, **kwargs):
+    """Yield the text of a chat completion chunk by chunk.
+
+    Honours LLM_MODE: in replay mode the text comes from the cassette, in
+    record mode the live stream is also written to it.
+    """
+    mode = llm_mode()
+    if mode == REPLAY:
+        yield from _replay_stream(messages, model or model_name())
+        return
+
+    import litellm
+
+    model = model or model_name()
+    started = time.perf_counter()
+    parts = []
+    usage = None
+    with stage('llm_call', model):
+        response = litellm.completion(model=model, messages=messages, stream=True, **kwargs)
+        for chunk in response:
+            usage = getattr(chunk, 'usage', None) or usage
+            choices = getattr(chunk, 'choices', None)
+            if not choices:
+                continue
+            text = getattr(choices[0].delta, 'content', None)
+            if text:
+                if not parts:
+                    STAGE_SECONDS.observe(time.perf_counter() - started, stage='llm_first_token', name=model)
+                parts.append(text)
+                yield text
+    _record_usage(messages, parts, usage)
+    if mode == RECORD:
+        record_completion(messages, ''.join(parts), time.perf_counter() - started, model=model)
+
+
+def _replay_stream(messages, model):
+    """Serve a cassette (or synthetic) answer as a stream of word-sized chunks."""
+    with stage('llm_call', model):
+        text, entry = replay_completion(messages)
+        chunks = re.findall(r'\S+\s*|\s+', text) or ['']
+        delay = replay_delay(entry) / len(chunks)
+        for chunk in chunks:
+            time.sleep(delay)
+            yield chunk
+    _record_usage(messages, [text], None)
+
+
+def _record_usage(messages, parts, usage):
+    """Count tokens from the provider's usage report, estimating them when there is none."""
+    if usage is not None and getattr(usage, 'prompt_tokens', None):
+        record_tokens('llm', usage.prompt_tokens, usage.completion_tokens or 0)
+        return
+    from .context_builder import count_tokens
+    prompt = sum(count_tokens(str(m.get('content') or '')) for m in messages)
+    record_tokens('llm', prompt, count_tokens(''.join(parts)))
+
+
+def complete(messages, model=None, **kwargs):
+    """Return the full text of a chat completion."""
+    return ''.join(stream_completion(messages, model=model, **kwargs))
@@ -0,0 +1,184 @@
+"""
+Record/replay stand-in for the LLM, web search and embeddings.
+
+LLM_MODE selects how model calls are made:
+
+    live     (default) real provider calls, nothing recorded
+    record   real calls, every prompt/completion and web search result is
+             appended to the cassette
+    replay   no network: answers come from the cassette, or from a
+             deterministic synthetic responder when a prompt was never recorded
+
+Other settings:
+
+    LLM_CASSETTE            cassette file (default <data dir>/cassettes/llm.jsonl)
+    LLM_REPLAY_LATENCY      seconds added to each replayed call, or "recorded"
+                            to reproduce the latency captured in record mode
+    LLM_REPLAY_STRICT       raise on a cassette miss instead of synthesizing
+
+Agents pick this up through `crew_llm.agent_llm()`, the streaming FAQ
+through `llm.stream_completion`, web search through
+`tool_registry.get_google_search` and embeddings through EMBEDDING_BACKEND
+(which defaults to the offline hash embedder in replay mode).
+"""
+import hashlib
+import json
+import os
+import threading
+
+from .paths import data_dir
+
+LIVE, RECORD, REPLAY = 'live', 'record', 'replay'
+
+
+def llm_mode():
+    mode = os.getenv('LLM_MODE', LIVE).strip().lower()
+    if mode not in (LIVE, RECORD, REPLAY):
+        raise ValueError(f"LLM_MODE must be live, record or replay, not {mode!r}")
+    return mode
+
+
+def cassette_path():
+    return os.getenv('LLM_CASSETTE') or str(data_dir() / 'cassettes' / 'llm.jsonl')
+
+
+def _normalize(messages):
+    if isinstance(messages, str):
+        messages = [{'role': 'user', 'content': messages}]
+    return [{'role': m.get('role', 'user'), 'content': str(m.get('content') or '')} for m in messages]
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def message_keys(messages):
+    """(exact, loose) cassette keys for a prompt.
+
+    The loose key ignores system messages, so a recording still matches when
+    only an agent's tool descriptions or backstory changed.
+    """
+    messages = _normalize(messages)
+    return _digest(messages), _digest([m for m in messages if m['role'] != 'system'])
+
+
+class CassetteMiss(LookupError):
+    pass
+
+
+class Cassette:
+    """Append-only JSONL file of recorded LLM completions and tool results."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._exact = {}
+        self._loose = {}
+        self.stats = dict(hits=0, loose_hits=0, misses=0, recorded=0)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as fh:
+                for line in fh:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def _index(self, entry):
+        self._exact[entry['key']] = entry
+        if entry.get('loose_key'):
+            self._loose.setdefault(entry['loose_key'], entry)
+
+    def lookup(self, key, loose_key=None):
+        entry = self._exact.get(key)
+        if entry is not None:
+            self.stats['hits'] += 1
+            return entry
+        entry = self._loose.get(loose_key) if loose_key else None
+        if entry is not None:
+            self.stats['loose_hits'] += 1
+            return entry
+        self.stats['misses'] += 1
+        return None
+
+    def record(self, kind, key, response, loose_key=None, latency=0.0, **extra):
+        entry = dict(kind=kind, key=key, loose_key=loose_key, response=response,
+                     latency=round(latency, 4), **extra)
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as fh:
+                fh.write(json.dumps(entry) + '\n')
+            self._index(entry)
+            self.stats['recorded'] += 1
+        return entry
+
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path=None):
+    path = path or cassette_path()
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+def replay_delay(entry=None):
+    """Seconds to wait before serving a replayed response."""
+    setting = os.getenv('LLM_REPLAY_LATENCY', '0').strip().lower()
+    if setting == 'recorded':
+        return entry.get('latency', 0.0) if entry else 0.0
+    return float(setting or 0)
+
+
+def _strict():
+    return os.getenv('LLM_REPLAY_STRICT', '').lower() in ('1', 'true', 'yes')
+
+
+def synthetic_response(messages):
+    """Deterministic stand-in answer for a prompt that was never recorded.
+
+    Agent prompts get a ReAct "Final Answer:" so crewai finishes the task in
+    one step; plain prompts get plain text.
+    """
+    messages = _normalize(messages)
+    digest = _digest(messages)[:8]
+    request = next((m['content'] for m in reversed(messages) if m['role'] == 'user'), '')
+    lines = [line.strip() for line in request.splitlines() if line.strip()][:4]
+    body = f"Offline response {digest}.\n" + '\n'.join(f"- {line[:80]}" for line in lines)
+    if any('Final Answer:' in m['content'] for m in messages):
+        return f"Thought: I now can give a great answer\nFinal Answer: {body}"
+    return body
+
+
+def replay_completion(messages):
+    """Return (text, entry) for `messages` from the cassette, synthesizing on a miss."""
+    key, loose_key = message_keys(messages)
+    entry = get_cassette().lookup(key, loose_key)
+    if entry is None:
+        if _strict():
+            raise CassetteMiss(f"No recorded completion for prompt {key[:12]} in {cassette_path()}")
+        return synthetic_response(messages), None
+    return entry['response'], entry
+
+
+def record_completion(messages, text, latency, model=None):
+    key, loose_key = message_keys(messages)
+    get_cassette().record('llm', key, text, loose_key=loose_key, latency=latency, model=model,
+                          messages=_normalize(messages))
+
+
+def tool_key(tool_name, arguments):
+    return _digest({'tool': tool_name, 'arguments': arguments})
+
+
+def replay_tool_result(tool_name, arguments):
+    """Recorded result of a tool call, or None when it was never recorded."""
+    entry = get_cassette().lookup(tool_key(tool_name, arguments))
+    if entry is None and _strict():
+        raise CassetteMiss(f"No recorded result for {tool_name} {arguments} in {cassette_path()}")
+    return entry
+
+
+def record_tool_result(tool_name, arguments, result, latency):
+    get_cassette().record('tool', tool_key(tool_name, arguments), result, latency=latency,
+                          tool=tool_name, arguments=arguments)
@@ -0,0 +1,437 @@
+"""
+HTTP load generator for the HRAgentUI endpoints.
+
+Drives /process_form/, /summarize-notes/ and /onboarding-submit/ from a pool
+of closed-loop clients (each sends its next request as soon as the previous
+one returns) with a weighted request mix, for a fixed duration. It reports
+throughput, latency percentiles and error rates per endpoint, samples
+/metrics once a second for in-flight requests and busy job threads per
+worker process, and waits for the queued onboarding jobs to finish so their
+end-to-end latency is reported too.
+
+`serve_offline` starts the app itself (over ASGI as deployed, or WSGI for
+comparison) against the offline stand-ins: the replayed LLM and web search,
+the hashing embedder and an in-process SMTP sink. Set LLM_REPLAY_LATENCY to
+model the provider's response time. Run it with `python manage.py loadtest`.
+"""
+import http.client
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlencode, urlsplit
+
+from .paths import PROJECT_DIR, REPO_ROOT
+
+DEFAULT_MIX = {'faq': 6, 'notes': 2, 'onboarding': 2}
+
+FAQ_QUESTIONS = [
+    'Can I accept gifts from a vendor?',
+    'What is the dress code?',
+    'Am I allowed to work from home?',
+    'How do I report harassment?',
+    'Is there a policy on using social media?',
+]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of `values` (q in 0-100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered) / 100))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _latency_summary(samples):
+    if not samples:
+        return None
+    return {
+        'p50': round(percentile(samples, 50), 1),
+        'p95': round(percentile(samples, 95), 1),
+        'p99': round(percentile(samples, 99), 1),
+        'max': round(max(samples), 1),
+        'mean': round(sum(samples) / len(samples), 1),
+    }
+
+
+def _multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, data) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: text/plain\r\n\r\n'.encode() + data + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+class Client:
+    """One keep-alive connection to the server, with the CSRF cookie Django expects."""
+
+    def __init__(self, base_url, timeout):
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.timeout = timeout
+        self.conn = None
+        self.csrf_token = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.csrf_token:
+            headers['Cookie'] = f'csrftoken={self.csrf_token}'
+            headers['X-CSRFToken'] = self.csrf_token
+        for attempt in (1, 2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                data = response.read()
+                return response, data
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # The server closed an idle keep-alive connection; reconnect once
+                self.close()
+                if attempt == 2:
+                    raise
+            except Exception:
+                self.close()
+                raise
+
+    def ensure_csrf(self):
+        if self.csrf_token is None:
+            response, _ = self.request('GET', '/email-onboarding/')
+            match = re.search(r'csrftoken=([^;]+)', response.getheader('Set-Cookie') or '')
+            self.csrf_token = match.group(1) if match else ''
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class Scenario:
+    """Builds the requests for each endpoint in the mix."""
+
+    def __init__(self, notes_path=None):
+        with open(notes_path or REPO_ROOT / 'john_notes.txt', 'rb') as fh:
+            self.notes_data = fh.read()
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _next(self):
+        with self._lock:
+            self._counter += 1
+            return self._counter
+
+    def faq(self, client):
+        # Numbered so the semantic answer cache does not answer every request
+        n = self._next()
+        question = f'{FAQ_QUESTIONS[n % len(FAQ_QUESTIONS)]} (request {n})'
+        body = urlencode({'question': question})
+        return client.request('POST', '/process_form/', body,
+                              {'Content-Type': 'application/x-www-form-urlencoded'})
+
+    def notes(self, client):
+        n = self._next()
+        body, content_type = _multipart({'candidateName': f'Candidate {n}'},
+                                        {'notesFile': (f'candidate{n}_notes.txt', self.notes_data)})
+        return client.request('POST', '/summarize-notes/', body, {'Content-Type': content_type})
+
+    def onboarding(self, client):
+        client.ensure_csrf()
+        n = self._next()
+        body = urlencode({'name': f'New Hire {n}', 'role': 'Data Engineer', 'email': f'hire{n}@example.com',
+                          'codeOfConduct': 'https://example.com/code-of-conduct'})
+        return client.request('POST', '/onboarding-submit/', body,
+                              {'Content-Type': 'application/x-www-form-urlencoded'})
+
+
+_METRIC_LINE = re.compile(r'^(hr_requests_in_flight|hr_job_workers_busy|hr_job_workers)\{pid="(\d+)"\} (\S+)$')
+
+
+def _scrape(base_url, timeout=5):
+    client = Client(base_url, timeout)
+    try:
+        _, data = client.request('GET', '/metrics')
+    finally:
+        client.close()
+    values = {}
+    for line in data.decode('utf-8', 'replace').splitlines():
+        match = _METRIC_LINE.match(line)
+        if match:
+            value = float(match.group(3))
+            # The scrape itself is one of the requests in flight
+            if match.group(1) == 'hr_requests_in_flight':
+                value -= 1
+            values[(match.group(1), match.group(2))] = value
+    return values
+
+
+def _proc_usage(pid):
+    """(rss_bytes, cpu_seconds) of `pid` and its children, from /proc (Linux only)."""
+    rss = cpu = 0.0
+    tick = os.sysconf('SC_CLK_TCK')
+    page = os.sysconf('SC_PAGE_SIZE')
+    pids = [pid]
+    try:
+        children = open(f'/proc/{pid}/task/{pid}/children').read().split()
+        pids += [int(child) for child in children]
+    except OSError:
+        pass
+    for p in pids:
+        try:
+            fields = open(f'/proc/{p}/stat').read().rsplit(')', 1)[1].split()
+            cpu += (int(fields[11]) + int(fields[12])) / tick
+            rss += int(fields[21]) * page
+        except (OSError, IndexError, ValueError):
+            continue
+    return rss, cpu
+
+
+def run_load(base_url, mix=None, concurrency=8, duration=30.0, timeout=120.0, warmup=1,
+             wait_for_jobs=60.0, server_pid=None, seed=1, log=print):
+    """Run the load test and return the report dict."""
+    mix = {name: weight for name, weight in (mix or DEFAULT_MIX).items() if weight > 0}
+    scenario = Scenario()
+    names, weights = list(mix), list(mix.values())
+
+    # Warm each endpoint (policy index, tool registry, crewai imports) before timing
+    warm = Client(base_url, timeout)
+    for name in names:
+        for _ in range(warmup):
+            getattr(scenario, name)(warm)
+    warm.close()
+
+    latencies = defaultdict(list)
+    outcomes = defaultdict(Counter)
+    job_urls = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+    started = time.monotonic()
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        client = Client(base_url, timeout)
+        while time.monotonic() < stop_at:
+            name = rng.choices(names, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                response, data = getattr(scenario, name)(client)
+                outcome = 'ok' if response.status < 400 else f'HTTP {response.status}'
+            except Exception as e:
+                response, data, outcome = None, b'', type(e).__name__
+            elapsed = (time.perf_counter() - t0) * 1000
+            with lock:
+                latencies[name].append(elapsed)
+                outcomes[name][outcome] += 1
+                if name == 'onboarding' and outcome == 'ok':
+                    try:
+                        job_urls.append(json.loads(data)['status_url'])
+                    except (ValueError, KeyError):
+                        pass
+        client.close()
+
+    samples = defaultdict(list)
+    usage = []
+    sampling = threading.Event()
+
+    def sampler():
+        while not sampling.wait(1.0):
+            try:
+                for key, value in _scrape(base_url).items():
+                    samples[key].append(value)
+            except Exception:
+                pass
+            if server_pid:
+                usage.append((time.monotonic(), *_proc_usage(server_pid)))
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    sampler_thread = threading.Thread(target=sampler, daemon=True)
+    log(f"Running {concurrency} clients for {duration:g}s against {base_url} (mix {mix})")
+    sampler_thread.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    sampling.set()
+    sampler_thread.join()
+
+    jobs = _wait_for_jobs(base_url, job_urls, wait_for_jobs, timeout) if job_urls else None
+    return _report(base_url, mix, concurrency, elapsed, latencies, outcomes, samples, usage, jobs)
+
+
+def _wait_for_jobs(base_url, urls, wait, timeout):
+    client = Client(base_url, timeout)
+    deadline = time.monotonic() + wait
+    pending = list(urls)
+    finished = {}
+    while pending and time.monotonic() < deadline:
+        still = []
+        for url in pending:
+            try:
+                _, data = client.request('GET', url)
+                job = json.loads(data)
+            except Exception:
+                still.append(url)
+                continue
+            if job.get('state') in ('succeeded', 'failed'):
+                finished[url] = job
+            else:
+                still.append(url)
+        pending = still
+        if pending:
+            time.sleep(0.5)
+    client.close()
+    durations = [(job['finished'] - job['created']) * 1000 for job in finished.values() if job.get('finished')]
+    queued = [(job['started'] - job['created']) * 1000 for job in finished.values() if job.get('started')]
+    return {
+        'submitted': len(urls),
+        'states': dict(Counter(job['state'] for job in finished.values()), unfinished=len(pending)),
+        'end_to_end_ms': _latency_summary(durations),
+        'queue_wait_ms': _latency_summary(queued),
+    }
+
+
+def _report(base_url, mix, concurrency, elapsed, latencies, outcomes, samples, usage, jobs):
+    endpoints = {}
+    all_latencies = []
+    total = errors = 0
+    for name in mix:
+        count = sum(outcomes[name].values())
+        failed = count - outcomes[name]['ok']
+        total += count
+        errors += failed
+        all_latencies += latencies[name]
+        endpoints[name] = {
+            'requests': count,
+            'errors': failed,
+            'error_rate': round(failed / count, 4) if count else 0.0,
+            'throughput_rps': round(count / elapsed, 2),
+            'latency_ms': _latency_summary(latencies[name]),
+            'outcomes': dict(outcomes[name]),
+        }
+
+    saturation = {}
+    for (metric, pid), values in sorted(samples.items()):
+        saturation.setdefault(pid, {})[metric] = {'max': max(values), 'mean': round(sum(values) / len(values), 2)}
+    for pid, metrics in saturation.items():
+        busy, capacity = metrics.get('hr_job_workers_busy'), metrics.get('hr_job_workers')
+        if busy and capacity and capacity['max']:
+            metrics['job_worker_utilization'] = round(busy['mean'] / capacity['max'], 3)
+
+    server = None
+    if len(usage) >= 2:
+        (t0, _, cpu0), (t1, _, cpu1) = usage[0], usage[-1]
+        server = {
+            'peak_rss_mb': round(max(rss for _, rss, _ in usage) / 2 ** 20, 1),
+            'cpu_utilization': round((cpu1 - cpu0) / (t1 - t0), 3) if t1 > t0 else None,
+        }
+
+    return {
+        'target': base_url,
+        'concurrency': concurrency,
+        'mix': mix,
+        'duration_seconds': round(elapsed, 2),
+        'requests': total,
+        'errors': errors,
+        'error_rate': round(errors / total, 4) if total else 0.0,
+        'throughput_rps': round(total / elapsed, 2),
+        'latency_ms': _latency_summary(all_latencies),
+        'endpoints': endpoints,
+        'saturation_by_pid': saturation,
+        'onboarding_jobs': jobs,
+        'server': server,
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _server_command(server, workers, threads, port):
+    bind = f'127.0.0.1:{port}'
+    try:
+        import gunicorn  # noqa: F401
+        has_gunicorn = True
+    except ImportError:
+        has_gunicorn = False
+    if server == 'asgi':
+        try:
+            import uvicorn_worker  # noqa: F401
+            if has_gunicorn:
+                return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', bind,
+                        '--workers', str(workers), 'HRAgentUI.asgi:application']
+        except ImportError:
+            pass
+        return [sys.executable, '-m', 'uvicorn', '--host', '127.0.0.1', '--port', str(port),
+                '--workers', str(workers), '--no-access-log', 'HRAgentUI.asgi:application']
+    if has_gunicorn:
+        return [sys.executable, '-m', 'gunicorn', '--bind', bind, '--workers', str(workers),
+                '--threads', str(threads), '--timeout', '300', 'HRAgentUI.wsgi']
+    return [sys.executable, 'manage.py', 'runserver', '--noreload', bind]
+
+
+@contextmanager
+def serve_offline(workers=2, threads=1, port=None, env=None, server='asgi'):
+    """Run the app on localhost with the offline stand-ins; yields (base_url, server_pid).
+
+    `server` is 'asgi' (gunicorn with uvicorn workers, as deployed, or plain
+    uvicorn) or 'wsgi' (gunicorn threads, or runserver) for comparison.
+    """
+    from .smtp_sink import SMTPSink
+
+    port = port or _free_port()
+    with SMTPSink() as sink, tempfile.TemporaryDirectory(prefix='hr-load-') as data:
+        server_env = dict(os.environ)
+        server_env.update(
+            LLM_MODE='replay', HR_DATA_DIR=data, SMTP_HOST=sink.host, SMTP_PORT=str(sink.port),
+            SMTP_USE_SSL='false', EMAIL_SENDER='hr@example.com', EMAIL_PASSWORD='unused',
+            CREWAI_DISABLE_TELEMETRY='true', PYTHONUNBUFFERED='1', ROLE_PACKS_REFRESH_SECONDS='0',
+        )
+        server_env.update(env or {})
+        command = _server_command(server, workers, threads, port)
+        log_file = open(os.path.join(data, 'server.log'), 'w')
+        process = subprocess.Popen(command, cwd=PROJECT_DIR, env=server_env, stdout=log_file,
+                                   stderr=subprocess.STDOUT)
+        base_url = f'http://127.0.0.1:{port}'
+        try:
+            deadline = time.monotonic() + 60
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"Server exited with {process.returncode}; see {log_file.name}")
+                # Measure a warm server: wait until /ready reports the warm-up finished
+                try:
+                    client = Client(base_url, 5)
+                    response, _ = client.request('GET', '/ready')
+                    client.close()
+                    if response.status == 200:
+                        break
+                except OSError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("Server was not ready within 60s")
+                time.sleep(0.3)
+            yield base_url, process.pid
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            log_file.close()
@@ -0,0 +1,281 @@
+"""
+Pooled SMTP transport shared by every mail-sending path.
+
+Opening a TLS connection and logging in costs several round trips, which
+used to be paid for every single message. A MailPool keeps a bounded set of
+authenticated sessions open, sends many messages over each, checks idle
+sessions with NOOP (a background thread keeps them warm) and transparently
+reconnects when the server has dropped one.
+
+Configuration comes from the environment:
+
+    SMTP_HOST / SMTP_PORT      default smtp.gmail.com:465
+    SMTP_USE_SSL               implicit TLS (default true); otherwise STARTTLS is tried
+    EMAIL_SENDER / EMAIL_PASSWORD
+    SMTP_POOL_SIZE             max concurrent sessions per server (default 2)
+
+For the local debugging server (`python tools/run_debug_smtp.py`) use
+host='localhost', port=1025, use_ssl=False; login is skipped when the server
+does not advertise AUTH.
+"""
+import os
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.message import EmailMessage
+
+from .metrics import stage
+
+# Idle sessions are NOOP-checked after this many seconds and closed after MAX_IDLE
+KEEPALIVE_SECONDS = 30
+MAX_IDLE_SECONDS = 240
+# Recycle a session after this many messages (servers often cap messages per session)
+MAX_MESSAGES_PER_SESSION = 100
+
+
+# Server rejections of one message; smtplib resets the transaction, so the session stays usable
+_SESSION_SURVIVES = (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError)
+
+
+def _is_retryable(error):
+    """Connection-level failures are retried on a fresh session; server rejections are not."""
+    if isinstance(error, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)):
+        return isinstance(error, smtplib.SMTPConnectError)
+    return isinstance(error, OSError)
+
+
+@dataclass(frozen=True)
+class SMTPConfig:
+    host: str = 'smtp.gmail.com'
+    port: int = 465
+    use_ssl: bool = True
+    username: str = None
+    password: str = None
+    timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls, **overrides):
+        config = dict(
+            host=os.getenv('SMTP_HOST', 'smtp.gmail.com'),
+            port=int(os.getenv('SMTP_PORT', '465')),
+            use_ssl=os.getenv('SMTP_USE_SSL', 'true').lower() in ('1', 'true', 'yes'),
+            username=os.getenv('EMAIL_SENDER'),
+            password=os.getenv('EMAIL_PASSWORD'),
+        )
+        config.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**config)
+
+
+class _Session:
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+        self.sent = 0
+
+    def close(self):
+        try:
+            self.smtp.quit()
+        except Exception:
+            try:
+                self.smtp.close()
+            except Exception:
+                pass
+
+
+class MailPool:
+    """Bounded pool of logged-in SMTP sessions for one server/account."""
+
+    def __init__(self, config, size=None):
+        self.config = config
+        self.size = size or int(os.getenv('SMTP_POOL_SIZE', '2'))
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._closed = False
+        self.stats = dict(connects=0, reconnects=0, sent=0, noops=0)
+        self._keepalive = threading.Thread(target=self._keepalive_loop, name='smtp-keepalive', daemon=True)
+        self._keepalive.start()
+
+    def _connect(self):
+        cfg = self.config
+        context = ssl.create_default_context()
+        with stage('smtp', 'connect'):
+            if cfg.use_ssl:
+                smtp = smtplib.SMTP_SSL(cfg.host, cfg.port, context=context, timeout=cfg.timeout)
+            else:
+                smtp = smtplib.SMTP(cfg.host, cfg.port, timeout=cfg.timeout)
+                smtp.ehlo()
+                if smtp.has_extn('starttls'):
+                    smtp.starttls(context=context)
+                    smtp.ehlo()
+            smtp.ehlo_or_helo_if_needed()
+        # Debug servers do not advertise AUTH; only log in when it is offered
+        if cfg.username and cfg.password and smtp.has_extn('auth'):
+            with stage('smtp', 'login'):
+                smtp.login(cfg.username, cfg.password)
+        self.stats['connects'] += 1
+        return _Session(smtp)
+
+    def _healthy(self, session):
+        if session.sent >= MAX_MESSAGES_PER_SESSION:
+            return False
+        idle = time.monotonic() - session.last_used
+        if idle > MAX_IDLE_SECONDS:
+            return False
+        if idle > KEEPALIVE_SECONDS:
+            try:
+                self.stats['noops'] += 1
+                return session.smtp.noop()[0] == 250
+            except Exception:
+                return False
+        return True
+
+    @contextmanager
+    def session(self):
+        """Borrow a healthy session; it is returned to the pool unless it broke.
+
+        Every session outside the idle queue is held under one of `size`
+        slots (the keepalive check takes one too), so idle plus in-flight
+        sessions never exceed `size`.
+        """
+        self._slots.acquire()
+        session = None
+        try:
+            while session is None:
+                try:
+                    candidate = self._idle.get_nowait()
+                except queue.Empty:
+                    session = self._connect()
+                    break
+                if self._healthy(candidate):
+                    session = candidate
+                else:
+                    candidate.close()
+            yield session
+            session.last_used = time.monotonic()
+            self._idle.put(session)
+        except _SESSION_SURVIVES:
+            session.last_used = time.monotonic()
+            self._idle.put(session)
+            raise
+        except BaseException:
+            if session is not None:
+                session.close()
+            raise
+        finally:
+            self._slots.release()
+
+    def warm(self):
+        """Open (and log in) a session ahead of the first send; the keepalive thread keeps it open."""
+        with self.session():
+            pass
+
+    def send(self, msg, from_addr=None, to_addrs=None):
+        """Send an EmailMessage, reconnecting once if the session was dropped."""
+        for attempt in (1, 2):
+            try:
+                with self.session() as session, stage('smtp', 'send'):
+                    session.smtp.send_message(msg, from_addr=from_addr, to_addrs=to_addrs)
+                    session.sent += 1
+                self.stats['sent'] += 1
+                return
+            except Exception as e:
+                if attempt == 2 or not _is_retryable(e):
+                    raise
+                self.stats['reconnects'] += 1
+
+    def send_many(self, messages):
+        """Send several messages over a single session, reconnecting only if it drops.
+
+        Returns a list of None (sent) or the exception raised for each message.
+        """
+        outcomes = []
+        pending = list(messages)
+        while pending:
+            try:
+                with self.session() as session:
+                    while pending and session.sent < MAX_MESSAGES_PER_SESSION:
+                        try:
+                            with stage('smtp', 'send'):
+                                session.smtp.send_message(pending[0])
+                        except Exception as e:
+                            if _is_retryable(e):
+                                raise
+                            outcomes.append(e)
+                        else:
+                            session.sent += 1
+                            self.stats['sent'] += 1
+                            outcomes.append(None)
+                        pending.pop(0)
+            except Exception as e:
+                if not _is_retryable(e):
+                    raise
+                # The session dropped mid-batch: retry the current message once on a new one
+                self.stats['reconnects'] += 1
+                try:
+                    self.send(pending.pop(0))
+                    outcomes.append(None)
+                except Exception as retry_error:
+                    outcomes.append(retry_error)
+        return outcomes
+
+    def _keepalive_loop(self):
+        while not self._closed:
+            time.sleep(KEEPALIVE_SECONDS)
+            self.check_idle()
+
+    def check_idle(self):
+        """NOOP-check each idle session once, closing the ones that no longer answer."""
+        for _ in range(self._idle.qsize()):
+            # A session under check holds a slot like a borrowed one; stop when all are busy
+            if not self._slots.acquire(blocking=False):
+                break
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            else:
+                if self._healthy(session):
+                    self._idle.put(session)
+                else:
+                    session.close()
+            finally:
+                self._slots.release()
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_mail_pool(**overrides):
+    """Return the shared pool for the configured server (keyword args override the environment)."""
+    config = SMTPConfig.from_env(**overrides)
+    key = (config.host, config.port, config.use_ssl, config.username)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.config != config:
+            if pool is not None:
+                pool.close()
+            pool = _pools[key] = MailPool(config)
+        return pool
+
+
+def build_message(sender, recipient, subject, body):
+    """Plain-text EmailMessage with the usual headers."""
+    em = EmailMessage()
+    em['From'] = sender
+    em['To'] = recipient
+    em['Subject'] = subject
+    em.set_content(body)
+    return em
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Run the stage microbenchmarks (replayed LLM, local SMTP sink) and optionally compare with a baseline"
+
+    # The benchmarks must choose LLM_MODE/EMBEDDING_BACKEND before the app modules are imported
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', nargs='*', help="Flows (faq, notes, onboarding) or benchmark names to run")
+        parser.add_argument('--repeat', type=int, default=20, help="Timed iterations per benchmark")
+        parser.add_argument('--warmup', type=int, default=2, help="Untimed iterations per benchmark")
+        parser.add_argument('--output', help="Write the JSON results to this file")
+        parser.add_argument('--baseline', help="Compare medians with a previous results file")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Relative change in median that counts as slower/faster (default 0.2)")
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help="Exit non-zero if any benchmark is slower than the baseline")
+        parser.add_argument('--list', action='store_true', help="List the benchmarks and exit")
+
+    def handle(self, *args, **options):
+        os.environ.setdefault('LLM_MODE', 'replay')
+        os.environ.setdefault('LLM_REPLAY_LATENCY', '0')
+        os.environ.setdefault('HR_DATA_DIR', tempfile.mkdtemp(prefix='hr-bench-data-'))
+        if os.environ['LLM_MODE'] != 'replay':
+            raise CommandError("Benchmarks need LLM_MODE=replay so no provider is called")
+
+        from HRAgentUI import benchmarks
+
+        if options['list']:
+            for flow, name in benchmarks.available():
+                self.stdout.write(f"{flow}.{name}")
+            return
+
+        results = benchmarks.run(only=options['only'], repeat=options['repeat'], warmup=options['warmup'],
+                                 log=self.stdout.write)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if not options['baseline']:
+            return
+        with open(options['baseline'], encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        rows = benchmarks.compare(results, baseline, options['threshold'])
+        self.stdout.write(f"\n{'benchmark':45} {'baseline':>10} {'current':>10} {'ratio':>7}")
+        for name, base, now, ratio, status in rows:
+            line = f"{name:45} {base if base is not None else '-':>10} {now if now is not None else '-':>10} " \
+                   f"{ratio if ratio is not None else '-':>7}  {status}"
+            style = self.style.ERROR if status == 'slower' else self.style.SUCCESS if status == 'faster' else str
+            self.stdout.write(style(line))
+        slower = [row for row in rows if row[4] == 'slower']
+        if slower and options['fail_on_regression']:
+            raise CommandError(f"{len(slower)} benchmark(s) slower than the baseline")
@@ -0,0 +1,31 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from HRAgentUI.paths import policy_doc_path
+from HRAgentUI.policy_index import index_dir, load_or_build
+
+
+class Command(BaseCommand):
+    help = "Chunk and embed the Employee Code of Conduct and save the index to disk"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--docx', help="Document to index (defaults to DOCX_FILE_PATH or docs/)")
+        parser.add_argument('--rebuild', action='store_true', help="Rebuild even if a matching index exists")
+        parser.add_argument('--skip-missing', action='store_true',
+                            help="Exit quietly when the document is not present (e.g. in a slim Docker context)")
+
+    def handle(self, *args, **options):
+        doc_path = options['docx'] or policy_doc_path()
+        if not os.path.exists(doc_path):
+            if options['skip_missing']:
+                self.stdout.write(self.style.WARNING(f"Policy document not found at {doc_path}; skipping"))
+                return
+            raise CommandError(f"Policy document not found at {doc_path}")
+
+        index = load_or_build(doc_path, rebuild=options['rebuild'])
+        manifest = index.manifest
+        self.stdout.write(self.style.SUCCESS(
+            f"Policy index ready at {index_dir(doc_path)} "
+            f"({manifest['chunks']} chunks, model {manifest['model']}, built in {manifest['build_seconds']}s)"
+        ))
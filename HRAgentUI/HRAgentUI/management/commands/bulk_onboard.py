@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from HRAgentUI.bulk_onboarding import read_roster, run_bulk_onboarding
+
+
+class Command(BaseCommand):
+    help = "Send onboarding emails to every new hire in a roster CSV (name, role, email, code_of_conduct)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('roster', help="Path to the roster CSV")
+        parser.add_argument('--concurrency', type=int, default=4, help="Max concurrent LLM generations")
+        parser.add_argument('--dry-run', action='store_true', help="Generate the emails without sending them")
+        parser.add_argument('--json', action='store_true', help="Print the full report as JSON")
+
+    def handle(self, *args, **options):
+        try:
+            rows = read_roster(options['roster'])
+        except OSError as e:
+            raise CommandError(f"Could not read roster: {e}")
+        if not rows:
+            raise CommandError("The roster has no rows")
+
+        def progress(entry):
+            style = self.style.SUCCESS if entry['status'] in ('sent', 'generated') else self.style.ERROR
+            detail = f" ({entry['error']})" if entry['error'] else ''
+            self.stdout.write(style(f"row {entry['row']}: {entry['name']} <{entry['email']}> {entry['status']}{detail}"))
+
+        report = run_bulk_onboarding(rows, concurrency=options['concurrency'],
+                                     send=not options['dry_run'], progress=progress)
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        self.stdout.write(
+            f"{report['succeeded']}/{report['total']} onboarded, {report['roles_researched']} roles researched, "
+            f"{report['elapsed_seconds']}s ({report['throughput_per_minute']} per minute)"
+        )
@@ -0,0 +1,60 @@
+import json
+import os
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from HRAgentUI.summary_store import get_summary_store
+
+
+class Command(BaseCommand):
+    help = "Query the candidate summary store, or import candidate_bullet.txt into it"
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        action = parser.add_mutually_exclusive_group(required=True)
+        action.add_argument('--import', dest='import_path', nargs='?', const='', metavar='FILE',
+                            help="Import a candidate_bullet.txt-style file (default: the repo's)")
+        action.add_argument('--latest', metavar='NAME', help="Latest summary for a candidate")
+        action.add_argument('--history', metavar='NAME', help="Every stored summary for a candidate")
+        action.add_argument('--search', metavar='QUERY', help="Candidates whose latest summary mentions QUERY")
+        action.add_argument('--list', action='store_true', help="List candidates with their summary counts")
+        parser.add_argument('--limit', type=int, default=20, help="Max results for --search and --history")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+
+    def handle(self, *args, **options):
+        store = get_summary_store()
+        if options['import_path'] is not None:
+            path = options['import_path'] or None
+            if path and not os.path.exists(path):
+                raise CommandError(f"No such file: {path}")
+            imported = store.import_text(path)
+            self.stdout.write(self.style.SUCCESS(f"Imported {imported} summaries ({store.count()} stored)"))
+            return
+
+        if options['latest']:
+            row = store.latest(options['latest'])
+            if row is None:
+                raise CommandError(f"No summary for {options['latest']}")
+            rows = [row]
+        elif options['history']:
+            rows = store.history(options['history'], limit=options['limit'])
+        elif options['search']:
+            rows = store.search(options['search'], limit=options['limit'])
+        else:
+            rows = store.candidates()
+
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        for row in rows:
+            when = datetime.fromtimestamp(row.get('created') or row['updated']).strftime('%Y-%m-%d %H:%M')
+            if options['list']:
+                self.stdout.write(f"{row['candidate']:32} {row['summaries']:4} summaries, updated {when}")
+            elif options['search']:
+                self.stdout.write(self.style.SUCCESS(f"{row['candidate']} ({when})"))
+                self.stdout.write(row.get('snippet') or row['summary'])
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{row['candidate']} ({when}, {row['source'] or 'unknown source'})"))
+                self.stdout.write(row['summary'] + "\n")
@@ -0,0 +1,49 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from HRAgentUI.schedule import get_schedule_index, parse_day, parse_time
+
+
+class Command(BaseCommand):
+    help = "Query the open interview slots in the interview schedule CSV"
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        action = parser.add_mutually_exclusive_group()
+        action.add_argument('--on', metavar='MM-DD', help="Open slots on a day")
+        action.add_argument('--conflicts', metavar="'MM-DD H:MM AM'", help="Slots a meeting at this time overlaps")
+        action.add_argument('--next', metavar="'MM-DD H:MM AM'", help="Next open slots at or after this time")
+        action.add_argument('--overlaps', action='store_true', help="Slots in the file that overlap each other")
+        parser.add_argument('--minutes', type=int, help="Meeting length for --conflicts and --next")
+        parser.add_argument('--count', type=int, default=5, help="Slots to list for --next")
+        parser.add_argument('--csv', help="Schedule CSV (default: INTERVIEW_CSV_PATH or interview_data.csv)")
+        parser.add_argument('--json', action='store_true', help="Print the slots as JSON")
+
+    def handle(self, *args, **options):
+        index = get_schedule_index(options['csv'])
+        try:
+            if options['on']:
+                slots = index.on_date(parse_day(options['on']))
+            elif options['conflicts']:
+                slots = index.conflicts(parse_time(options['conflicts']), options['minutes'])
+            elif options['next']:
+                slots = index.next_available(parse_time(options['next']), options['minutes'], options['count'])
+            elif options['overlaps']:
+                slots = [slot for pair in index.overlaps() for slot in pair]
+            else:
+                slots = index.all()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if index.skipped:
+            self.stderr.write(f"{index.skipped} unreadable rows skipped in {index.path}")
+        if options['json']:
+            self.stdout.write(json.dumps([{'start': s.start.isoformat(), 'end': s.end.isoformat()} for s in slots],
+                                         indent=2))
+            return
+        for slot in slots:
+            self.stdout.write(slot.label())
+        if not slots:
+            self.stdout.write("No matching slots.")
@@ -0,0 +1,77 @@
+import json
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from HRAgentUI.loadtest import DEFAULT_MIX, run_load, serve_offline
+
+
+def _parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in DEFAULT_MIX:
+            raise CommandError(f"Unknown endpoint {name!r} in --mix (use {', '.join(DEFAULT_MIX)})")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+class Command(BaseCommand):
+    help = "Load test /process_form/, /summarize-notes/ and /onboarding-submit/ and report latency percentiles"
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help="Server to test, e.g. http://127.0.0.1:8000 (default: start one with --serve)")
+        parser.add_argument('--serve', action='store_true',
+                            help="Start the app locally with the offline LLM/search/SMTP stand-ins")
+        parser.add_argument('--server', choices=['asgi', 'wsgi'], default='asgi',
+                            help="Serve over ASGI (uvicorn workers, as deployed) or WSGI (gunicorn threads) for --serve")
+        parser.add_argument('--workers', type=int, default=2, help="Server worker processes for --serve")
+        parser.add_argument('--threads', type=int, default=1, help="gunicorn threads per worker with --server wsgi")
+        parser.add_argument('--llm-latency', type=float, default=0.0,
+                            help="Seconds each replayed LLM call takes, to model the provider (--serve)")
+        parser.add_argument('--concurrency', type=int, default=8, help="Concurrent clients")
+        parser.add_argument('--duration', type=float, default=30.0, help="Seconds to run")
+        parser.add_argument('--mix', default='faq=6,notes=2,onboarding=2', help="Weighted request mix")
+        parser.add_argument('--timeout', type=float, default=120.0, help="Per-request timeout in seconds")
+        parser.add_argument('--wait-for-jobs', type=float, default=60.0,
+                            help="Seconds to wait for queued onboarding jobs to finish afterwards")
+        parser.add_argument('--output', help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        if not options['url'] and not options['serve']:
+            raise CommandError("Pass --url of a running server or --serve to start one")
+        mix = _parse_mix(options['mix'])
+
+        server = serve_offline(workers=options['workers'], threads=options['threads'], server=options['server'],
+                               env={'LLM_REPLAY_LATENCY': str(options['llm_latency'])}) \
+            if options['serve'] else nullcontext((options['url'].rstrip('/'), None))
+        with server as (base_url, server_pid):
+            report = run_load(base_url, mix=mix, concurrency=options['concurrency'], duration=options['duration'],
+                              timeout=options['timeout'], wait_for_jobs=options['wait_for_jobs'],
+                              server_pid=server_pid, log=self.stdout.write)
+        report['server_config'] = {'server': options['server'], 'workers': options['workers'], 'threads': options['threads'],
+                                   'llm_latency': options['llm_latency']} if options['serve'] else None
+
+        self.stdout.write(f"\n{'endpoint':12} {'requests':>9} {'rps':>7} {'errors':>7} "
+                          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name, stats in list(report['endpoints'].items()) + [('total', report)]:
+            lat = stats['latency_ms'] or {}
+            self.stdout.write(f"{name:12} {stats['requests']:>9} {stats['throughput_rps']:>7} "
+                              f"{stats['error_rate']:>7.1%} {lat.get('p50', '-'):>9} {lat.get('p95', '-'):>9} "
+                              f"{lat.get('p99', '-'):>9}")
+        for pid, metrics in report['saturation_by_pid'].items():
+            in_flight = metrics.get('hr_requests_in_flight', {})
+            self.stdout.write(f"worker {pid}: in-flight max {in_flight.get('max', '-')} mean {in_flight.get('mean', '-')}, "
+                              f"job thread utilization {metrics.get('job_worker_utilization', '-')}")
+        if report['onboarding_jobs']:
+            jobs = report['onboarding_jobs']
+            self.stdout.write(f"onboarding jobs: {jobs['states']}, end-to-end {jobs['end_to_end_ms']}")
+        if report['server']:
+            self.stdout.write(f"server: {report['server']}")
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
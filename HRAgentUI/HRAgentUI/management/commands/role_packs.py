@@ -0,0 +1,54 @@
+import json
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from HRAgentUI.role_packs import configured_roles, get_role_pack_store, is_stale, refresh_packs
+
+
+class Command(BaseCommand):
+    help = "Refresh or inspect the precomputed role research packs used by onboarding"
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('roles', nargs='*', help="Roles to refresh (default: every role in research_roles.txt; "
+                                                     "stale packs of other roles are expired)")
+        parser.add_argument('--refresh', action='store_true', help="Research roles whose pack is missing or stale")
+        parser.add_argument('--force', action='store_true', help="With --refresh, research every role again")
+        parser.add_argument('--show', metavar='ROLE', help="Print one role's pack")
+        parser.add_argument('--concurrency', type=int, default=4, help="Roles researched at once")
+        parser.add_argument('--json', action='store_true', help="Print JSON")
+
+    def handle(self, *args, **options):
+        store = get_role_pack_store()
+        if options['show']:
+            pack = store.get(options['show'])
+            if not pack or not pack['research']:
+                raise CommandError(f"No pack for {options['show']}")
+            self.stdout.write(json.dumps(pack, indent=2) if options['json'] else pack['research'])
+            return
+
+        if options['refresh'] or options['force']:
+            report = refresh_packs(options['roles'] or None, force=options['force'],
+                                   concurrency=options['concurrency'], log=self.stdout.write)
+            if options['json']:
+                self.stdout.write(json.dumps(report, indent=2))
+            failed = [role for role, state in report.items() if state.startswith('failed')]
+            self.stdout.write(self.style.SUCCESS(f"{len(report) - len(failed)} roles up to date, {len(failed)} failed"))
+            return
+
+        packs = {pack['role_key']: pack for pack in store.all()}
+        roles = options['roles'] or list(dict.fromkeys(configured_roles() + [p['role'] for p in packs.values()]))
+        rows = []
+        for role in roles:
+            pack = store.get(role)
+            state = 'missing' if not pack or not pack['research'] else 'stale' if is_stale(pack) else 'fresh'
+            updated = datetime.fromtimestamp(pack['created']).strftime('%Y-%m-%d %H:%M') if pack and pack['created'] else ''
+            rows.append({'role': role, 'state': state, 'updated': updated, 'error': pack and pack['error']})
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        for row in rows:
+            self.stdout.write(f"{row['role']:32} {row['state']:8} {row['updated']}" +
+                              (f"  last error: {row['error']}" if row['error'] else ''))
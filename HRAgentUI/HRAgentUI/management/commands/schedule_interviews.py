@@ -0,0 +1,45 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from HRAgentUI.paths import interviewers_csv_path
+from HRAgentUI.schedule import get_schedule_index
+from HRAgentUI.scheduler import assign_interviews, format_schedule, read_people
+
+
+class Command(BaseCommand):
+    help = "Assign candidates to the open interview slots"
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('candidates', help="CSV of name,available (availability optional)")
+        parser.add_argument('--interviewers', help="CSV of name,available (default: INTERVIEWERS_CSV_PATH "
+                                                   "or interviewers.csv if present)")
+        parser.add_argument('--gap', type=int, default=0, help="Minimum minutes between one interviewer's interviews")
+        parser.add_argument('--csv', help="Schedule CSV (default: INTERVIEW_CSV_PATH or interview_data.csv)")
+        parser.add_argument('--greedy-only', action='store_true', help="Keep the greedy schedule (no repair, earliest-end-first pass "
+                                                                           "or SCHEDULE_SEARCH_MS search)")
+        parser.add_argument('--json', action='store_true', help="Print the schedule as JSON")
+
+    def handle(self, *args, **options):
+        interviewers_path = options['interviewers'] or interviewers_csv_path()
+        for path in (options['candidates'], interviewers_path):
+            if path and not os.path.exists(path):
+                raise CommandError(f"No such file: {path}")
+        try:
+            candidates = read_people(options['candidates'])
+            interviewers = read_people(interviewers_path) if interviewers_path else ()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        result = assign_interviews(candidates, get_schedule_index(options['csv']).all(), interviewers=interviewers,
+                                   gap_minutes=options['gap'], exact=not options['greedy_only'])
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2, default=str))
+            return
+        self.stdout.write(format_schedule(result))
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(result['assignments'])} scheduled, {len(result['unassigned'])} not scheduled "
+            f"({result['method']}, {result['seconds'] * 1000:.1f} ms)"))
@@ -0,0 +1,22 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from HRAgentUI.search_cache import get_search_cache
+
+
+class Command(BaseCommand):
+    help = "Show the web search cache's hit rate and size, or clear it"
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clear', action='store_true', help="Drop every cached result and reset the counters")
+
+    def handle(self, *args, **options):
+        cache = get_search_cache()
+        if options['clear']:
+            cache.clear()
+            self.stdout.write(self.style.SUCCESS(f"Cleared {cache.path}"))
+            return
+        self.stdout.write(json.dumps(cache.stats(), indent=2))
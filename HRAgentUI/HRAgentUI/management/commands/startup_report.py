@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from HRAgentUI.startup import import_report
+
+
+class Command(BaseCommand):
+    help = "Time a cold start (django.setup, URLconf, ASGI/WSGI handlers, optionally warm-up) and break import time down by package"
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--warm', action='store_true', help="Include the warm-up of the lazy dependencies")
+        parser.add_argument('--top', type=int, default=10, help="Packages and imports to list per phase")
+        parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        report = import_report(warm=options['warm'], top=options['top'])
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            self._check(report)
+            return
+
+        self.stdout.write(f"cold start: {report['process_seconds']:.3f}s (interpreter included)")
+        for name, phase in report['phases'].items():
+            self.stdout.write(f"\n{name}: {phase['seconds']:.3f}s, {phase['modules']} modules imported "
+                              f"({phase['import_seconds']:.3f}s in imports)")
+            for entry in phase['packages']:
+                self.stdout.write(f"  {entry['package']:32} {entry['seconds']:8.3f}s")
+            if phase['direct_imports']:
+                self.stdout.write("  slowest direct imports:")
+                for entry in phase['direct_imports']:
+                    self.stdout.write(f"    {entry['module']:40} {entry['cumulative_seconds']:8.3f}s")
+        self._check(report)
+
+    def _check(self, report):
+        if not report['ok']:
+            raise CommandError(f"Imported at startup (should load on first use): {', '.join(report['eager_imports'])}")
@@ -0,0 +1,32 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from HRAgentUI.notes_summary import summarize_batch
+
+
+class Command(BaseCommand):
+    help = "Summarize many candidate notes files (or .zip archives of them) in parallel"
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help="Notes files (.txt) or .zip archives")
+        parser.add_argument('--concurrency', type=int, default=4, help="Max files summarized at once")
+        parser.add_argument('--json', action='store_true', help="Print one JSON object per result")
+
+    def handle(self, *args, **options):
+        files = []
+        for path in options['files']:
+            if not os.path.exists(path):
+                raise CommandError(f"No such file: {path}")
+            with open(path, 'rb') as fh:
+                files.append((os.path.basename(path), fh.read()))
+
+        for result in summarize_batch(files, concurrency=options['concurrency']):
+            if options['json']:
+                self.stdout.write(json.dumps(result))
+            elif 'error' in result:
+                self.stdout.write(self.style.ERROR(f"{result['file']} ({result['candidate']}): {result['error']}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{result['file']} ({result['seconds']}s)"))
+                self.stdout.write(result['summary'] + "\n")
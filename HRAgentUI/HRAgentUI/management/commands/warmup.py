@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from HRAgentUI.startup import WARM_UP_STEPS, warm_up
+
+
+class Command(BaseCommand):
+    help = "Load crewai, litellm, the embedding model, the search indexes and the agents now instead of on first use"
+
+    def add_arguments(self, parser):
+        parser.add_argument('steps', nargs='*', help=f"Steps to run (default all): {', '.join(n for n, _ in WARM_UP_STEPS)}")
+
+    def handle(self, *args, **options):
+        unknown = set(options['steps']) - {name for name, _ in WARM_UP_STEPS}
+        if unknown:
+            raise CommandError(f"Unknown warm-up steps: {', '.join(sorted(unknown))}")
+        timings = warm_up(only=options['steps'], log=self.stdout.write)
+        failed = [name for name, value in timings.items() if isinstance(value, dict)]
+        if failed:
+            raise CommandError(f"Warm-up failed for: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f"Warm in {sum(timings.values()):.2f}s"))
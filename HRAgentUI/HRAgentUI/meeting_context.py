@@ -0,0 +1,164 @@
+"""
+Context prefetch for meeting preparation.
+
+Given search tools, the meeting-prep agent looks things up one tool call at a
+time: policy search, then the schedule, then the web, each costing an LLM
+round trip to decide on the next call. `prefetch()` derives the lookups from
+the request itself and runs them concurrently on the shared pool (aio.py):
+
+    policy      policy passages for the request text
+    schedule    open slots on the days the request mentions (MM-DD), the
+                slots a mentioned time clashes with, or the next open slots
+    candidates  latest stored summaries of candidates named in the request
+    web         top web results for the request
+
+The merged text goes into the task up front, so a typical meeting pack is a
+single LLM pass. The lookups run outside the request's token budget and
+`format_context` packs their results into it (context_packer.py), so every
+passage is charged once. Lookups that fail or miss MEETING_PREFETCH_SECONDS
+(default 15) are left out and listed in the result.
+"""
+import contextvars
+import os
+import re
+import time
+from concurrent.futures import wait
+from datetime import datetime
+
+from .aio import executor
+from .context_packer import current_budget, format_passage
+from .metrics import stage
+
+PREFETCH_SECONDS = float(os.getenv('MEETING_PREFETCH_SECONDS', '15'))
+
+_DAY = re.compile(r'\b(\d{1,2})[-/](\d{1,2})\b')
+_DAY_TIME = re.compile(r'\b(\d{1,2}[-/]\d{1,2})\s*(?:at\s+)?(\d{1,2}(?::\d{2})?\s*[AaPp][Mm])')
+
+
+def _policy(request):
+    from .tool_registry import get_doc_search
+
+    # The index rather than the tool, which would pack the passages into the budget a first time
+    tool = get_doc_search()
+    hits = tool.index.search(request, limit=tool.limit * 2)
+    return '\n\n'.join(format_passage(chunk) for _, chunk in hits) or None
+
+
+def _schedule(request):
+    from .schedule import get_schedule_index, parse_day, parse_time
+
+    index = get_schedule_index()
+    lines = []
+    for day, clock in _DAY_TIME.findall(request):
+        start = parse_time(f"{day.replace('/', '-')} {clock}")
+        clashes = index.conflicts(start)
+        lines.append(f"A meeting at {day} {clock} overlaps: " +
+                     (', '.join(s.label() for s in clashes) if clashes else 'no open slot'))
+    for month, day in dict.fromkeys(_DAY.findall(request)):
+        try:
+            date = parse_day(f'{int(month):02d}-{int(day):02d}')
+        except ValueError:
+            continue
+        slots = index.on_date(date)
+        lines.append(f"Open slots on {date:%m-%d}: " + (', '.join(s.label() for s in slots) if slots else 'none'))
+    if not lines:
+        upcoming = index.next_available(datetime.now(), count=5)
+        lines.append("Next open interview slots: " +
+                     (', '.join(s.label() for s in upcoming) if upcoming else 'none'))
+    return '\n'.join(lines)
+
+
+def _candidates(request):
+    from .summary_store import get_summary_store
+
+    store = get_summary_store()
+    text = ' '.join(request.split()).casefold()
+    named = [c['candidate'] for c in store.candidates()
+             if re.search(rf"\b{re.escape(c['candidate'].casefold())}\b", text)]
+    summaries = [store.latest(name)['summary'] for name in named]
+    return '\n\n'.join(summaries) or None
+
+
+def _web(request):
+    from .tool_registry import get_google_search
+
+    results = get_google_search().run(search_query=request)
+    if isinstance(results, dict):
+        return '\n'.join(f"- {r.get('title')}: {r.get('link')}\n  {r.get('snippet', '')}"
+                         for r in results.get('organic', [])[:5]) or None
+    return str(results)
+
+
+SOURCES = [
+    ('policy', 'Company policy', _policy),
+    ('schedule', 'Interview schedule', _schedule),
+    ('candidates', 'Candidate summaries', _candidates),
+    ('web', 'Web search', _web),
+]
+
+
+def _timed(name, fn, request):
+    with stage('prefetch', name):
+        return fn(request)
+
+
+def prefetch(request, sources=None, timeout=None):
+    """Run the lookups for `request` concurrently; returns {'sections', 'missing', 'seconds'}."""
+    started = time.perf_counter()
+    selected = [s for s in SOURCES if sources is None or s[0] in sources]
+    # Each lookup gets an empty context, so none of them can draw on the request's budget
+    futures = {executor().submit(contextvars.Context().run, _timed, name, fn, request): (name, title)
+               for name, title, fn in selected}
+    done, _ = wait(futures, timeout=PREFETCH_SECONDS if timeout is None else timeout)
+
+    sections, missing = {}, {}
+    for future, (name, title) in futures.items():
+        if future not in done:
+            missing[name] = 'timed out'
+        elif future.exception() is not None:
+            print(f"Meeting prefetch {name} failed: {future.exception()}")
+            missing[name] = str(future.exception())
+        elif future.result():
+            sections[name] = (title, future.result().strip())
+    return {'sections': sections, 'missing': missing, 'seconds': round(time.perf_counter() - started, 3)}
+
+
+# Exact lookups go in first; policy and web passages are ranked against the request
+PINNED = ('schedule', 'candidates')
+
+
+def _passages(name, text):
+    if name == 'schedule':
+        return text.splitlines()
+    if name == 'web':
+        return re.split(r'\n(?=- )', text)
+    return re.split(r'\n\s*\n', text)
+
+
+def format_context(prefetched, request=None, budget=None):
+    """The prefetched sections as one block for the task description.
+
+    Inside a ContextBudget (`budget`, default the current one) the sections'
+    passages are packed into what is left of it, schedule and candidate
+    lookups first, policy and web passages ranked against `request`.
+    """
+    sections = prefetched['sections']
+    budget = budget or current_budget()
+    if budget is None:
+        return '\n\n'.join(f"{title}:\n<<<\n{text}\n>>>" for title, text in sections.values())
+
+    passages = []
+    for name, (title, text) in sections.items():
+        budget.charge(f"{title}:\n<<<\n>>>")
+        passages.extend({'text': part.strip(), 'source': name, 'position': len(passages),
+                         'score': float('inf') if name in PINNED else None}
+                        for part in _passages(name, text) if part.strip())
+    kept = sorted(budget.pack(passages, query=request, render=lambda passage: passage['text'] + '\n'),
+                  key=lambda passage: passage['position'])
+    blocks = []
+    for name, (title, _) in sections.items():
+        parts = [passage['text'] for passage in kept if passage['source'] == name]
+        if parts:
+            separator = '\n' if name in ('schedule', 'web') else '\n\n'
+            blocks.append(f"{title}:\n<<<\n{separator.join(parts)}\n>>>")
+    return '\n\n'.join(blocks)
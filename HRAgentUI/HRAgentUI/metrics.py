@@ -0,0 +1,372 @@
+"""
+Latency and token metrics in the Prometheus text format.
+
+Every request is timed by `MetricsMiddleware`, and the slow stages inside a
+request are timed with `stage()`: tool construction, embedding, retrieval,
+LLM calls, agent tool calls, crew runs and the SMTP connect/login/send steps.
+LLM token usage is counted per source. crewai's own LLM and tool calls are
+picked up from its event bus (`install_crewai_listeners`, installed by
+`crew_llm.agent_llm()` when the first agent is built, so crewai stays out of
+server startup), so agents need no changes to be measured.
+
+GET /metrics returns everything below. Values are per process: scrape each
+gunicorn worker, or aggregate on the Prometheus side.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+# Seconds; covers a cached answer (ms) up to a multi-agent crew run (minutes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+TOKEN_BUCKETS = (250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000, 12000, 16000, 32000)
+
+
+_INF = 'le="+Inf"'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def _render_sample(self, key, value):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}']
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def _render_sample(self, key, value):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}']
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            state[1] += 1
+            state[2] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels):
+        state = self._values.get(self._key(labels))
+        return state[1] if state else 0
+
+    def _render_sample(self, key, state):
+        counts, total, sum_ = state
+        lines = []
+        for bound, count in zip(self.buckets, counts):
+            le = _format_labels(self.labelnames, key, [f'le="{_format_value(bound)}"'])
+            lines.append(f'{self.name}_bucket{le} {count}')
+        lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, [_INF])} {total}')
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f'{self.name}_sum{labels} {sum_!r}')
+        lines.append(f'{self.name}_count{labels} {total}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name, documentation, labelnames=()):
+        metric = Gauge(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    'hr_request_duration_seconds', 'Time to complete an HTTP request (including streamed bodies).',
+    ('view', 'method', 'status'))
+REQUESTS = REGISTRY.counter('hr_requests_total', 'HTTP requests handled.', ('view', 'method', 'status'))
+STAGE_SECONDS = REGISTRY.histogram(
+    'hr_stage_duration_seconds', 'Time spent in one stage of a request.', ('stage', 'name'))
+STAGE_ERRORS = REGISTRY.counter('hr_stage_errors_total', 'Stages that raised an exception.', ('stage', 'name'))
+LLM_TOKENS = REGISTRY.counter('hr_llm_tokens_total', 'LLM tokens used.', ('source', 'kind'))
+PROMPT_TOKENS = REGISTRY.histogram(
+    'hr_prompt_tokens', 'Estimated prompt tokens of one request after context packing.', ('endpoint',),
+    buckets=TOKEN_BUCKETS)
+CONTEXT_PASSAGES = REGISTRY.counter(
+    'hr_context_passages_total', 'Retrieved passages offered to the context packer.', ('endpoint', 'outcome'))
+AGENT_TOOL_CALLS = REGISTRY.counter(
+    'hr_agent_tool_calls_total', 'Tool calls made by agents.', ('tool', 'outcome'))
+# Labelled by pid so scrapes of different gunicorn workers can be told apart
+REQUESTS_IN_FLIGHT = REGISTRY.gauge('hr_requests_in_flight', 'Requests being handled right now.', ('pid',))
+JOB_WORKERS = REGISTRY.gauge('hr_job_workers', 'Background job threads in this process.', ('pid',))
+JOB_WORKERS_BUSY = REGISTRY.gauge('hr_job_workers_busy', 'Background job threads running a job.', ('pid',))
+COMPONENT_READY = REGISTRY.gauge('hr_component_ready', 'Warm-up components that are ready (1) or not (0).',
+                                 ('pid', 'component'))
+
+
+@contextmanager
+def stage(stage, name=''):
+    """Time a block as `stage` (e.g. 'retrieval', 'smtp'), counting it as an error if it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage, name=name)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage=stage, name=name)
+
+
+def record_tokens(source, prompt=0, completion=0):
+    if prompt:
+        LLM_TOKENS.inc(prompt, source=source, kind='prompt')
+    if completion:
+        LLM_TOKENS.inc(completion, source=source, kind='completion')
+
+
+def render():
+    return REGISTRY.render()
+
+
+_installed = False
+_install_lock = threading.Lock()
+_starts = threading.local()
+
+
+def _push(kind):
+    stack = _starts.__dict__.setdefault(kind, [])
+    stack.append(time.perf_counter())
+
+
+def _pop(kind):
+    stack = _starts.__dict__.get(kind)
+    return time.perf_counter() - stack.pop() if stack else None
+
+
+def install_crewai_listeners():
+    """Time crewai LLM calls, agent tool calls and crew runs via its event bus (once per process)."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        try:
+            from crewai.events import crewai_event_bus
+            from crewai.events.types.crew_events import (
+                CrewKickoffCompletedEvent, CrewKickoffFailedEvent, CrewKickoffStartedEvent)
+            from crewai.events.types.llm_events import (
+                LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent)
+            from crewai.events.types.tool_usage_events import ToolUsageErrorEvent, ToolUsageFinishedEvent
+        except ImportError as e:
+            print(f"crewai events unavailable, agent metrics disabled: {e}")
+            _installed = True
+            return
+
+        # Events are emitted synchronously on the thread making the call, so a
+        # per-thread stack pairs each start with its completion.
+        def llm_started(source, event):
+            _push('llm')
+
+        def llm_finished(source, event):
+            elapsed = _pop('llm')
+            model = event.model or getattr(source, 'model', '') or ''
+            if elapsed is not None:
+                STAGE_SECONDS.observe(elapsed, stage='llm_call', name=model)
+            if isinstance(event, LLMCallFailedEvent):
+                STAGE_ERRORS.inc(stage='llm_call', name=model)
+
+        def tool_finished(source, event):
+            AGENT_TOOL_CALLS.inc(tool=event.tool_name, outcome='cached' if event.from_cache else 'ok')
+            STAGE_SECONDS.observe((event.finished_at - event.started_at).total_seconds(),
+                                  stage='agent_tool', name=event.tool_name)
+
+        def tool_failed(source, event):
+            AGENT_TOOL_CALLS.inc(tool=event.tool_name, outcome='error')
+
+        def crew_started(source, event):
+            _push('crew')
+
+        def crew_finished(source, event):
+            elapsed = _pop('crew')
+            name = event.crew_name or 'crew'
+            if elapsed is not None:
+                STAGE_SECONDS.observe(elapsed, stage='crew', name=name)
+            if isinstance(event, CrewKickoffFailedEvent):
+                STAGE_ERRORS.inc(stage='crew', name=name)
+                return
+            usage = getattr(event.output, 'token_usage', None)
+            if usage is not None:
+                record_tokens('crew', usage.prompt_tokens, usage.completion_tokens)
+
+        crewai_event_bus.register_handler(LLMCallStartedEvent, llm_started)
+        crewai_event_bus.register_handler(LLMCallCompletedEvent, llm_finished)
+        crewai_event_bus.register_handler(LLMCallFailedEvent, llm_finished)
+        crewai_event_bus.register_handler(ToolUsageFinishedEvent, tool_finished)
+        crewai_event_bus.register_handler(ToolUsageErrorEvent, tool_failed)
+        crewai_event_bus.register_handler(CrewKickoffStartedEvent, crew_started)
+        crewai_event_bus.register_handler(CrewKickoffCompletedEvent, crew_finished)
+        crewai_event_bus.register_handler(CrewKickoffFailedEvent, crew_finished)
+        _installed = True
+
+
+class MetricsMiddleware:
+    """Count and time every request, labelled by URL name."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            # Stay on the event loop for async views instead of hopping to a thread
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        pid = os.getpid()
+        REQUESTS_IN_FLIGHT.inc(pid=pid)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            REQUESTS_IN_FLIGHT.dec(pid=pid)
+            raise
+        return self._observe(request, response, started, pid)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        pid = os.getpid()
+        REQUESTS_IN_FLIGHT.inc(pid=pid)
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            REQUESTS_IN_FLIGHT.dec(pid=pid)
+            raise
+        return self._observe(request, response, started, pid)
+
+    def _observe(self, request, response, started, pid):
+        match = getattr(request, 'resolver_match', None)
+        labels = dict(view=(match.url_name or match.view_name) if match else 'unmatched',
+                      method=request.method, status=str(response.status_code))
+
+        def finish():
+            REQUESTS_IN_FLIGHT.dec(pid=pid)
+            REQUEST_SECONDS.observe(time.perf_counter() - started, **labels)
+            REQUESTS.inc(**labels)
+
+        if getattr(response, 'streaming', False):
+            observe = self._observe_async_stream if response.is_async else self._observe_stream
+            response.streaming_content = observe(response.streaming_content, finish)
+        else:
+            finish()
+        return response
+
+    @staticmethod
+    def _observe_stream(content, finish):
+        try:
+            yield from content
+        finally:
+            finish()
+
+    @staticmethod
+    async def _observe_async_stream(content, finish):
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            finish()
@@ -10,6 +10,11 @@ from tasks import MeetingPrepTasks
 from agents import MeetingPrepAgents
 from datetime import datetime, timedelta
 from crewai_tools import DOCXSearchTool, CSVSearchTool, TXTSearchTool, tool, SerperDevTool
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from HRAgentUI.notes_summary import summarize_notes_file
+from HRAgentUI.tool_registry import get_google_search
 
 # Load environment variables
 load_dotenv()
@@ -21,7 +26,7 @@ load_dotenv()
 
 doc_search = DOCXSearchTool("docs/Employee-Code-of-Conduct.docx")
 csv_search = CSVSearchTool('interview_data.csv')
-google_search = SerperDevTool()
+google_search = get_google_search()
 
 ###############################################################################################################################################################
 # Candidate notes
@@ -29,41 +34,10 @@ print("")
 print("This is the candidate notes use case")
 candidate_name = input("Name: ")
 candidate_notes_doc = input("Please enter the link to this candidate's notes:  ")
-txt_search = TXTSearchTool(candidate_notes_doc)
-
-notes_agent = Agent(
-        role="Candidate Notes Summarizer",
-        goal='Summarizes the notes on a candidate ',
-        backstory=dedent("""\
-          As a Notes Summarizer, your mission is to read through the enitre file
-         and summarize them the information in a concise yet informative manner into bullet points. """),
-        tools=[txt_search],
-        verbose=True
-      )
-# Define the task
-def candidate_notes_task(name):
-        return Task(
-            description=dedent(f"""\
-				Summarize the document into a few detailed bullet points
-				Candidate Name: {name}"""),
-            expected_output=dedent("""\
-                Ensure each bullet point isn't longer than 80 charcters
-                Have a list of 5-6 bullet points on notes given about the candidate 
-                Use this format for your output:
-                Candidate Name : [Candidate Name] 
-                - Candidate notes
-				"""),
-            agent=notes_agent,
-        )
-candidate_task = candidate_notes_task(candidate_name)
-
-crew = Crew(agents=[notes_agent], tasks=[candidate_task])
-# Get your crew to work!
-result = crew.kickoff()
+# Same path as the web app: the notes are packed into the summarize_notes prompt
+# budget (ranked excerpts of a file too large for it) and the summary is stored
+result = summarize_notes_file(candidate_name, candidate_notes_doc)
 print(result)
-with open("candidate_bullet.txt", mode='a', newline='') as file:
-    file.write(result)
-    file.write("\n")
 print(candidate_name+"'s notes have been summarized and stored!")
 print("####################################")
 ###############################################################################################################################################################
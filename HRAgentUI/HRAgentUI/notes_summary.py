@@ -0,0 +1,174 @@
+"""
+Candidate notes summarization, one file or a whole interview day at a time.
+
+`summarize_notes_file` runs the notes crew for a single file; the web views,
+the batch helpers, src/main.py and notes.py all go through it. The notes are
+put into the task by `notes_context`: whole when they fit the summarize_notes
+prompt budget, otherwise the chunks that best match NOTES_SUMMARY_QUERY, in
+file order. The batch helpers accept many notes files (or zip archives of
+them), summarize them in parallel on a bounded thread pool and yield each
+result as soon as it is ready, so a recruiter sees the first summaries while
+the rest are running.
+"""
+import hashlib
+import io
+import os
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .context_builder import count_tokens, inline_document, read_text
+from .context_packer import context_budget
+from .crew_specs import NOTES_AGENT, NOTES_TASK
+from .summary_store import get_summary_store
+from .tool_registry import file_digest
+
+# What a summary covers; chunks of an over-budget notes file are ranked against it
+SUMMARY_QUERY = os.getenv('NOTES_SUMMARY_QUERY', 'candidate experience skills strengths weaknesses concerns '
+                          'communication teamwork technical projects education interview recommendation')
+# Paragraphs longer than this are split into runs of lines before ranking
+CHUNK_TOKENS = 200
+NOTES_LABEL = 'Candidate notes'
+
+
+def notes_chunks(text, max_tokens=CHUNK_TOKENS):
+    """The paragraphs of `text`, with paragraphs over `max_tokens` split into runs of lines."""
+    chunks = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if count_tokens(paragraph) <= max_tokens:
+            chunks.append(paragraph)
+            continue
+        run, size = [], 0
+        for line in paragraph.splitlines():
+            tokens = count_tokens(line)
+            if run and size + tokens > max_tokens:
+                chunks.append('\n'.join(run))
+                run, size = [], 0
+            run.append(line)
+            size += tokens
+        chunks.append('\n'.join(run))
+    return chunks
+
+
+def notes_context(file_path, prompt, label=NOTES_LABEL):
+    """The notes in `file_path` as task text, packed into `prompt` (a ContextBudget).
+
+    Notes that fit go in whole, less repeated paragraphs. From a larger file
+    the chunks that best match SUMMARY_QUERY go in, in file order, labelled
+    as excerpts.
+    """
+    before = dict(prompt.stats)
+    passages = [{'text': chunk, 'position': i} for i, chunk in enumerate(notes_chunks(read_text(file_path)))]
+    kept = prompt.pack(passages, query=SUMMARY_QUERY, render=lambda passage: passage['text'] + '\n\n')
+    kept.sort(key=lambda passage: passage['position'])
+    excerpts = prompt.stats['trimmed'] > before['trimmed'] or prompt.stats['dropped'] > before['dropped']
+    if excerpts:
+        print(f"Notes file over the prompt budget, sending {len(kept)} of {len(passages)} chunks "
+              f"ranked for the summary ({prompt.context} tokens): {file_path}")
+    return inline_document('\n\n'.join(passage['text'] for passage in kept), label=label, excerpts=excerpts)
+
+
+def summarize_notes_file(candidate_name, file_path, budget=None, store=True, source=None):
+    """Summarize the notes in `file_path` into 5-6 bullet points about the candidate.
+
+    The notes go into the task through `notes_context`, packed into the
+    summarize_notes prompt budget (`budget` overrides it). With `store` the
+    summary is saved to the candidate summary store, keyed by the notes'
+    sha256 (`source` names the notes file there, default its basename).
+    """
+    from crewai import Crew
+
+    notes_agent = NOTES_AGENT.build()
+    with context_budget('summarize_notes', budget) as prompt:
+        prompt.charge_crew(notes_agent, NOTES_TASK.build(notes_agent, candidate_name=candidate_name,
+                                                         source=inline_document('', label=NOTES_LABEL)))
+        notes_source = notes_context(file_path, prompt)
+        candidate_task = NOTES_TASK.build(notes_agent, candidate_name=candidate_name, source=notes_source)
+
+        crew = Crew(agents=[notes_agent], tasks=[candidate_task])
+        result = crew.kickoff()
+
+    # Extract text content from CrewOutput object
+    summary = str(result) if hasattr(result, '__str__') else result.raw
+    if store:
+        get_summary_store().add(candidate_name, summary, notes_sha256=file_digest(file_path),
+                                source=source or os.path.basename(file_path))
+    return summary
+
+
+def candidate_name_from_filename(filename):
+    """'john_notes.txt' -> 'John', 'sarah-johnson.txt' -> 'Sarah Johnson'."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    stem = re.sub(r'(?i)[_\-\s]*(interview[_\-\s]*)?notes?$', '', stem)
+    words = re.split(r'[_\-\s]+', stem)
+    return ' '.join(w.capitalize() for w in words if w) or stem
+
+
+def expand_notes_files(files):
+    """Yield (filename, bytes) for every notes file, unpacking .zip archives.
+
+    `files` is an iterable of (filename, bytes).
+    """
+    for filename, data in files:
+        if filename.lower().endswith('.zip'):
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                for info in archive.infolist():
+                    inner = info.filename
+                    if info.is_dir() or os.path.basename(inner).startswith('.') or '__MACOSX' in inner:
+                        continue
+                    yield os.path.basename(inner), archive.read(info)
+        else:
+            yield os.path.basename(filename), data
+
+
+def summarize_batch(files, names=None, concurrency=4, summarize=None):
+    """Summarize many notes files in parallel, yielding results as they complete.
+
+    `files` is an iterable of (filename, bytes); `names` optionally maps a
+    filename to the candidate name (otherwise it is derived from the filename).
+    Each result is a dict with file, candidate, summary or error, and seconds.
+    With the default summarizer the summaries are saved to the candidate
+    summary store in one transaction at the end of the batch.
+    """
+    store = summarize is None
+    summarize = summarize or (lambda candidate, path: summarize_notes_file(candidate, path, store=False))
+    names = names or {}
+    records = []
+    workdir = tempfile.mkdtemp(prefix='notes-batch-')
+    try:
+        jobs = []
+        for i, (filename, data) in enumerate(expand_notes_files(files)):
+            # Prefix with the index so two uploads with the same name do not collide
+            path = os.path.join(workdir, f'{i}-{filename}')
+            with open(path, 'wb') as fh:
+                fh.write(data)
+            jobs.append((filename, names.get(filename) or candidate_name_from_filename(filename), path,
+                         hashlib.sha256(data).hexdigest()))
+
+        def run(filename, candidate, path, notes_sha256):
+            started = time.perf_counter()
+            result = {'file': filename, 'candidate': candidate}
+            try:
+                result['summary'] = summarize(candidate, path)
+                records.append(dict(candidate=candidate, summary=result['summary'],
+                                    notes_sha256=notes_sha256, source=filename))
+            except Exception as e:
+                result['error'] = str(e)
+            result['seconds'] = round(time.perf_counter() - started, 2)
+            return result
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='notes') as pool:
+            futures = [pool.submit(run, *job) for job in jobs]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        # Also keeps what finished when the caller stops iterating early
+        if store and records:
+            get_summary_store().add_many(records)
@@ -0,0 +1,40 @@
+"""
+Filesystem locations shared by the Django app, the Streamlit app and the CLIs.
+"""
+import os
+from pathlib import Path
+
+# Repository root (the directory holding docs/ and interview_data.csv)
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Django project directory (HRAgentUI/)
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def data_dir():
+    """Writable directory for indexes and caches (HR_DATA_DIR overrides)"""
+    path = Path(os.getenv('HR_DATA_DIR') or PROJECT_DIR / 'var')
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def policy_doc_path():
+    """Path of the Employee Code of Conduct document (DOCX_FILE_PATH overrides)"""
+    path = os.getenv('DOCX_FILE_PATH')
+    if path and os.path.exists(path):
+        return path
+    return str(REPO_ROOT / 'docs' / 'Employee-Code-of-Conduct.docx')
+
+
+def interview_csv_path():
+    """Path of the interview schedule CSV (INTERVIEW_CSV_PATH overrides)"""
+    path = os.getenv('INTERVIEW_CSV_PATH')
+    if path and os.path.exists(path):
+        return path
+    return str(REPO_ROOT / 'interview_data.csv')
+
+
+def interviewers_csv_path():
+    """Path of the interviewer availability CSV (INTERVIEWERS_CSV_PATH overrides), or None if there is none"""
+    path = os.getenv('INTERVIEWERS_CSV_PATH') or str(REPO_ROOT / 'interviewers.csv')
+    return path if os.path.exists(path) else None
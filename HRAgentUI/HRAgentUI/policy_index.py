@@ -0,0 +1,181 @@
+"""
+Persistent embedding index over the Employee Code of Conduct.
+
+The document is split into section-aware chunks, embedded once and saved to
+a versioned directory keyed by the document hash and the embedding model:
+
+    <data dir>/policy_index/v1-all-MiniLM-L6-v2-<sha256 prefix>/
+        manifest.json   build metadata
+        chunks.json     chunk text and section titles
+        vectors.npy     (n, dim) float32 unit vectors
+
+Later processes memory-map vectors.npy instead of re-embedding, so a cold
+start only pays for reading a few hundred kilobytes. Build it ahead of time
+with `python manage.py build_policy_index`.
+"""
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from . import embeddings
+from .metrics import stage
+from .paths import data_dir, policy_doc_path
+from .tool_registry import file_digest
+
+INDEX_VERSION = 1
+CHUNK_CHARS = 800
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def read_docx_paragraphs(path):
+    """Return [(section_title, paragraph_text, is_heading)] for a DOCX file.
+
+    Reads word/document.xml directly so no python-docx dependency is needed.
+    Paragraphs styled Title/Heading* start a new section.
+    """
+    with zipfile.ZipFile(path) as archive:
+        root = ET.fromstring(archive.read('word/document.xml'))
+
+    paragraphs = []
+    section = ''
+    for p in root.iter(_W + 'p'):
+        text = ''.join(t.text or '' for t in p.iter(_W + 't')).strip()
+        if not text:
+            continue
+        style = p.find(_W + 'pPr/' + _W + 'pStyle')
+        style = style.get(_W + 'val') if style is not None else ''
+        is_heading = style.startswith('Heading') or style == 'Title'
+        if is_heading:
+            section = text
+        paragraphs.append((section, text, is_heading))
+    return paragraphs
+
+
+def chunk_paragraphs(paragraphs, max_chars=CHUNK_CHARS):
+    """Group consecutive paragraphs of the same section into chunks of at most ~max_chars."""
+    chunks = []
+    current, section, size = [], None, 0
+
+    def flush():
+        if current:
+            chunks.append({'section': section or '', 'text': '\n'.join(current)})
+
+    for para_section, text, is_heading in paragraphs:
+        if is_heading:
+            continue
+        if para_section != section or (current and size + len(text) > max_chars):
+            flush()
+            current, section, size = [], para_section, 0
+        current.append(text)
+        size += len(text) + 1
+    flush()
+    return chunks
+
+
+def _slug(value):
+    return re.sub(r'[^A-Za-z0-9.-]+', '-', value).strip('-')
+
+
+def index_dir(doc_path=None, model=None):
+    """Directory holding the index for this document content and embedding model."""
+    doc_path = doc_path or policy_doc_path()
+    model = model or embeddings.EMBEDDING_MODEL
+    digest = file_digest(doc_path)
+    name = f'v{INDEX_VERSION}-{_slug(model)}-{digest[:16]}'
+    return data_dir() / 'policy_index' / name
+
+
+class PolicyIndex:
+    """Embedded policy chunks with cosine-similarity search."""
+
+    def __init__(self, chunks, vectors, manifest):
+        self.chunks = chunks
+        self.vectors = vectors
+        self.manifest = manifest
+
+    @property
+    def doc_sha256(self):
+        return self.manifest['doc_sha256']
+
+    def search(self, query, limit=4):
+        """Return [(score, chunk)] for the `limit` chunks closest to `query`."""
+        if not self.chunks:
+            return []
+        with stage('retrieval', 'policy_index'):
+            scores = np.asarray(self.vectors @ embeddings.embed_one(query))
+            limit = min(limit, len(scores))
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), self.chunks[i]) for i in top]
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved index, memory-mapping the vectors."""
+        with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as fh:
+            manifest = json.load(fh)
+        if manifest.get('version') != INDEX_VERSION:
+            raise ValueError(f'Unsupported policy index version in {path}')
+        with open(os.path.join(path, 'chunks.json'), encoding='utf-8') as fh:
+            chunks = json.load(fh)
+        vectors = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r')
+        return cls(chunks, vectors, manifest)
+
+    @classmethod
+    def build(cls, doc_path, path):
+        """Chunk and embed `doc_path`, then save the index atomically to `path`."""
+        started = time.perf_counter()
+        chunks = chunk_paragraphs(read_docx_paragraphs(doc_path))
+        texts = [f"{c['section']}\n{c['text']}" if c['section'] else c['text'] for c in chunks]
+        vectors = embeddings.embed(texts)
+        manifest = {
+            'version': INDEX_VERSION,
+            'model': embeddings.EMBEDDING_MODEL,
+            'doc_path': str(doc_path),
+            'doc_sha256': file_digest(doc_path),
+            'chunks': len(chunks),
+            'dim': int(vectors.shape[1]) if len(chunks) else 0,
+            'built_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'build_seconds': round(time.perf_counter() - started, 3),
+        }
+
+        # Write into a sibling temp dir and rename so readers never see a partial index
+        path = str(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix='.building-', dir=os.path.dirname(path))
+        try:
+            np.save(os.path.join(tmp, 'vectors.npy'), vectors)
+            with open(os.path.join(tmp, 'chunks.json'), 'w', encoding='utf-8') as fh:
+                json.dump(chunks, fh, ensure_ascii=False)
+            with open(os.path.join(tmp, 'manifest.json'), 'w', encoding='utf-8') as fh:
+                json.dump(manifest, fh, indent=2)
+            try:
+                os.rename(tmp, path)
+            except OSError:
+                # Another process won the race; its index is equivalent
+                shutil.rmtree(tmp, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        return cls.load(path)
+
+
+def load_or_build(doc_path=None, rebuild=False):
+    """Return the policy index for `doc_path`, building and saving it if missing."""
+    doc_path = doc_path or policy_doc_path()
+    path = index_dir(doc_path)
+    if rebuild and path.exists():
+        shutil.rmtree(path)
+    if path.exists():
+        try:
+            return PolicyIndex.load(path)
+        except (OSError, ValueError):
+            shutil.rmtree(path, ignore_errors=True)
+    return PolicyIndex.build(doc_path, path)
@@ -0,0 +1,139 @@
+"""
+Readiness of this server process: background warm-up and GET /ready.
+
+A machine woken by fly (auto_stop_machines) would otherwise make its first
+user pay for every lazy load: the crewai import, the embedding model, the
+policy index, the TLS handshakes to the LLM provider and the SMTP server.
+`start()` runs all of that on a background thread as soon as the server
+process loads the app (see asgi.py / wsgi.py), and /ready answers 503 until
+every required component is up and a probe of the FAQ path answers within
+READY_FAQ_SECONDS, then 200. fly's health check on /ready keeps traffic on
+warm machines.
+
+Components:
+
+    crewai, litellm, embedding_model, policy_search, bm25_index, agents
+                    the lazy loads of startup.WARM_UP_STEPS (required)
+    llm_connection  a one-token completion, which opens the provider
+                    connection (optional and off by default, as it is a
+                    billed call per worker start; WARM_UP_LLM=1 runs it)
+    smtp            a logged-in pooled SMTP session (optional; skipped
+                    when EMAIL_SENDER/EMAIL_PASSWORD are not set)
+    faq_probe       retrieval plus the extractive answer for a sample
+                    question, repeated until it is within READY_FAQ_SECONDS
+                    (required)
+
+Optional components that fail are reported but don't hold readiness back:
+the FAQ still answers extractively without a model, and onboarding mail
+connects on demand.
+"""
+import os
+import threading
+import time
+
+from .metrics import COMPONENT_READY, stage
+from .startup import WARM_UP_STEPS
+
+PENDING, RUNNING, READY, FAILED, SKIPPED = 'pending', 'running', 'ready', 'failed', 'skipped'
+
+PROBE_QUESTION = 'Can I accept gifts from a vendor?'
+
+
+def _llm_connection():
+    if os.getenv('WARM_UP_LLM', '').lower() not in ('1', 'true', 'yes'):
+        return SKIPPED
+    from .llm import complete
+    complete([{'role': 'user', 'content': 'Reply with OK.'}], max_tokens=1)
+
+
+def _smtp():
+    if not (os.getenv('EMAIL_SENDER') and os.getenv('EMAIL_PASSWORD')):
+        return SKIPPED
+    from .mail_transport import get_mail_pool
+    get_mail_pool().warm()
+
+
+def _faq_probe():
+    from .faq_fallback import extractive_answer
+    from .tool_registry import get_doc_search
+
+    limit = float(os.getenv('READY_FAQ_SECONDS', '1.0'))
+    latencies = []
+    for _ in range(5):
+        started = time.perf_counter()
+        get_doc_search()._run(PROBE_QUESTION)
+        extractive_answer(PROBE_QUESTION)
+        latencies.append(time.perf_counter() - started)
+        if latencies[-1] <= limit:
+            return {'latency_seconds': round(latencies[-1], 4), 'attempts': len(latencies)}
+    raise RuntimeError(f"FAQ path still takes {latencies[-1]:.2f}s (limit {limit}s)")
+
+
+STEPS = [(name, fn, True) for name, fn in WARM_UP_STEPS] + [
+    ('llm_connection', _llm_connection, False),
+    ('smtp', _smtp, False),
+    ('faq_probe', _faq_probe, True),
+]
+
+
+class Readiness:
+    """Runs the warm-up steps once on a background thread and tracks their state."""
+
+    def __init__(self, steps=STEPS):
+        self.steps = steps
+        self.started = time.time()
+        self._components = {name: {'state': PENDING, 'required': required} for name, _, required in steps}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Start the warm-up (idempotent)."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='warm-up', daemon=True)
+                self._thread.start()
+        return self
+
+    def _update(self, name, **fields):
+        with self._lock:
+            self._components[name] = dict(self._components[name], **fields)
+        COMPONENT_READY.set(1 if fields.get('state') == READY else 0, pid=os.getpid(), component=name)
+
+    def _run(self):
+        for name, fn, _ in self.steps:
+            self._update(name, state=RUNNING)
+            started = time.perf_counter()
+            try:
+                with stage('warm_up', name):
+                    result = fn()
+            except Exception as e:
+                print(f"Warm-up {name} failed: {e}")
+                self._update(name, state=FAILED, seconds=round(time.perf_counter() - started, 3),
+                             error=f'{type(e).__name__}: {e}')
+                continue
+            details = result if isinstance(result, dict) else {}
+            self._update(name, state=SKIPPED if result == SKIPPED else READY,
+                         seconds=round(time.perf_counter() - started, 3), **details)
+
+    def is_ready(self):
+        with self._lock:
+            return all(c['state'] == READY for c in self._components.values() if c['required'])
+
+    def snapshot(self):
+        with self._lock:
+            components = {name: dict(c) for name, c in self._components.items()}
+        return {
+            'ready': all(c['state'] == READY for c in components.values() if c['required']),
+            'pid': os.getpid(),
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'components': components,
+        }
+
+
+readiness = Readiness()
+
+
+def start_on_server_start():
+    """Called by asgi.py / wsgi.py; WARM_UP_ON_START=0 leaves warm-up to the first /ready request."""
+    if os.getenv('WARM_UP_ON_START', '1').lower() not in ('0', 'false', 'no'):
+        readiness.start()
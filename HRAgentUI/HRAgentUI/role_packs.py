@@ -0,0 +1,266 @@
+"""
+Precomputed role research packs.
+
+Every onboarding email needs best practices (with links) for the hire's
+role, and researching them takes a web search and a long LLM call. We hire
+into the same few dozen roles all year, so the research is done ahead of
+time: one pack per role, kept in role_packs.sqlite3 in the data directory
+(ROLE_PACKS_DB overrides the path; point it at a persistent volume in
+production). An onboarding email for a role with a pack is only the short
+personalized greeting (GREETING_TASK with the pack spliced in).
+
+The roles come from research_roles.txt at the repository root, one per line
+(ROLE_PACKS_FILE overrides the path). `refresh_packs()` regenerates their
+packs once older than ROLE_PACK_MAX_AGE_SECONDS (default 30 days) and
+creates missing ones. Packs of other roles, researched for a one-off hire,
+are deleted by it once stale and not served meanwhile, so the next hire in
+such a role gets fresh research. A stale pack of a listed role is still
+served until it is replaced.
+
+Run the refresh from cron with `python manage.py role_packs --refresh`, or
+set ROLE_PACKS_REFRESH=1 to run it in the server (see asgi.py / wsgi.py)
+every ROLE_PACKS_REFRESH_SECONDS (default one day). Every worker starts the
+thread, but only the one holding a lock file next to the database refreshes,
+so one process per machine does the work. A role is also claimed in the
+database before it is researched, so two machines sharing it never research
+the same role twice.
+"""
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .paths import REPO_ROOT, data_dir
+
+REFRESH_ENABLED = os.getenv('ROLE_PACKS_REFRESH', '').lower() in ('1', 'true', 'yes')
+MAX_AGE_SECONDS = float(os.getenv('ROLE_PACK_MAX_AGE_SECONDS', 30 * 86400))
+REFRESH_SECONDS = float(os.getenv('ROLE_PACKS_REFRESH_SECONDS', 86400))
+# Let the warm-up finish before the first refresh
+REFRESH_DELAY_SECONDS = float(os.getenv('ROLE_PACKS_REFRESH_DELAY_SECONDS', 120))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS packs (
+    role_key TEXT PRIMARY KEY,
+    role TEXT NOT NULL,
+    research TEXT,
+    created REAL,
+    error TEXT,
+    refreshing_until REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+def role_key(role):
+    return ' '.join(role.split()).casefold()
+
+
+def roles_file():
+    """Path of the role list: ROLE_PACKS_FILE, or research_roles.txt at the repository root."""
+    return str(os.getenv('ROLE_PACKS_FILE') or REPO_ROOT / 'research_roles.txt')
+
+
+def configured_roles():
+    """Roles listed in research_roles.txt (or ROLE_PACKS_FILE); '#' starts a comment."""
+    path = roles_file()
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as fh:
+        lines = (line.split('#', 1)[0].strip() for line in fh)
+        return list(dict.fromkeys(line for line in lines if line))
+
+
+class RolePackStore:
+    """SQLite table of role research packs shared by every process on the machine."""
+
+    def __init__(self, path=None):
+        self.path = str(path or os.getenv('ROLE_PACKS_DB') or data_dir() / 'role_packs.sqlite3')
+        self._local = threading.local()
+        conn = self._conn()
+        with conn:
+            conn.execute(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def get(self, role):
+        row = self._conn().execute('SELECT * FROM packs WHERE role_key = ?', (role_key(role),)).fetchone()
+        return dict(row) if row else None
+
+    def put(self, role, research):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                'INSERT INTO packs (role_key, role, research, created) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (role_key) DO UPDATE SET role = excluded.role, research = excluded.research, '
+                'created = excluded.created, error = NULL, refreshing_until = 0',
+                (role_key(role), ' '.join(role.split()), research, time.time()))
+
+    def fail(self, role, error):
+        conn = self._conn()
+        with conn:
+            conn.execute('UPDATE packs SET error = ?, refreshing_until = 0 WHERE role_key = ?', (error, role_key(role)))
+
+    def claim(self, role, seconds=900):
+        """True for exactly one caller (in any process) per role and `seconds`."""
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute('INSERT OR IGNORE INTO packs (role_key, role) VALUES (?, ?)',
+                         (role_key(role), ' '.join(role.split())))
+            claimed = conn.execute('UPDATE packs SET refreshing_until = ? WHERE role_key = ? AND refreshing_until < ?',
+                                   (now + seconds, role_key(role), now)).rowcount
+        return claimed == 1
+
+    def expire(self, role):
+        """Delete the role's pack unless it is being researched right now; True if it was deleted."""
+        conn = self._conn()
+        with conn:
+            return conn.execute('DELETE FROM packs WHERE role_key = ? AND refreshing_until < ?',
+                                (role_key(role), time.time())).rowcount == 1
+
+    def all(self):
+        return [dict(row) for row in self._conn().execute('SELECT * FROM packs ORDER BY role')]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_role_pack_store():
+    """Process-wide RolePackStore (opened on first use)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RolePackStore()
+    return _store
+
+
+def _configured(role):
+    return role_key(role) in {role_key(r) for r in configured_roles()}
+
+
+def role_pack(role):
+    """The precomputed research for `role`, or None.
+
+    Stale packs are served only for the configured roles, which the refresh replaces.
+    """
+    pack = get_role_pack_store().get(role)
+    if not pack or not pack['research'] or (is_stale(pack) and not _configured(role)):
+        return None
+    return pack['research']
+
+
+def is_stale(pack, max_age=None):
+    max_age = MAX_AGE_SECONDS if max_age is None else max_age
+    return not pack or not pack['research'] or time.time() - pack['created'] > max_age
+
+
+def research_for_role(role):
+    """The role's pack, researching and storing it first if there is none."""
+    research = role_pack(role)
+    if research is None:
+        from .bulk_onboarding import research_role
+        research = research_role(role)
+        get_role_pack_store().put(role, research)
+    return research
+
+
+def refresh_packs(roles=None, force=False, concurrency=4, log=print):
+    """Research the roles whose pack is missing or stale.
+
+    By default these are the configured roles, and every other stored pack
+    is expired once stale. Returns {role: 'fresh' | 'refreshed' | 'expired' |
+    'claimed elsewhere' | error message}.
+    """
+    from .bulk_onboarding import research_role
+
+    store = get_role_pack_store()
+    report, due = {}, []
+    if roles is None:
+        roles = configured_roles()
+        if not roles:
+            log(f"Warning: no roles listed in {roles_file()}; no role packs will be precomputed")
+        keep = {role_key(role) for role in roles}
+        for pack in store.all():
+            if pack['role_key'] not in keep and is_stale(pack) and store.expire(pack['role']):
+                log(f"Role pack {pack['role']}: expired")
+                report[pack['role']] = 'expired'
+    for role in roles:
+        if not force and not is_stale(store.get(role)):
+            report[role] = 'fresh'
+        elif store.claim(role):
+            due.append(role)
+        else:
+            report[role] = 'claimed elsewhere'
+
+    def refresh(role):
+        started = time.perf_counter()
+        store.put(role, research_role(role))
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='role-packs') as pool:
+        futures = {pool.submit(refresh, role): role for role in due}
+        for future in as_completed(futures):
+            role = futures[future]
+            try:
+                log(f"Role pack {role}: refreshed in {future.result():.1f}s")
+                report[role] = 'refreshed'
+            except Exception as e:
+                log(f"Role pack {role} failed: {e}")
+                store.fail(role, str(e))
+                report[role] = f'failed: {e}'
+    return report
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def take_refresh_lock():
+    """Open file holding the machine-wide refresher lock, or None while another process holds it."""
+    try:
+        import fcntl
+    except ImportError:
+        # No flock (Windows): every enabled process refreshes, the claims still dedupe the work
+        return True
+    fh = open(get_role_pack_store().path + '.refresh-lock', 'a')
+    try:
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        fh.close()
+        return None
+    return fh
+
+
+def _refresh_forever():
+    time.sleep(REFRESH_DELAY_SECONDS)
+    lock = None
+    while True:
+        # Retried every round, so another worker takes over when the refreshing one exits
+        lock = lock or take_refresh_lock()
+        if lock:
+            try:
+                refresh_packs()
+            except Exception as e:
+                print(f"Role pack refresh failed: {e}")
+        time.sleep(REFRESH_SECONDS)
+
+
+def start_refresher():
+    """Start the background refresh thread (idempotent; only with ROLE_PACKS_REFRESH=1)."""
+    global _refresher
+    if not REFRESH_ENABLED or REFRESH_SECONDS <= 0:
+        return
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = threading.Thread(target=_refresh_forever, name='role-packs', daemon=True)
+            _refresher.start()
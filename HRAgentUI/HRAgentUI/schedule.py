@@ -0,0 +1,213 @@
+"""
+Interview schedule index over interview_data.csv.
+
+Each CSV row is an open interview slot, "MM-DD,H:MM AM", optionally followed
+by the slot length in minutes (default INTERVIEW_SLOT_MINUTES, 60). The CSV
+has no year; SCHEDULE_YEAR sets it (default: the current year). Rows are
+parsed once into datetimes and kept sorted by start time, so questions like
+"free slots on 05-22", "does 3:30 PM on 05-21 clash with anything" or "next
+slot after Friday noon" are answered by bisection instead of by embedding
+the rows and running a vector search over timestamps.
+
+    index = get_schedule_index()      # reloads if the CSV changed
+    index.on_date(date(2025, 5, 22))
+    index.next_available(datetime(2025, 5, 21, 15, 30))
+
+The index stats the file on every `get_schedule_index()` call. Rows appended
+to the end of the file are parsed and merged on their own; any other edit
+re-reads the whole file.
+"""
+import bisect
+import csv
+import hashlib
+import os
+import re
+import threading
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+
+from .paths import interview_csv_path
+
+
+class Slot(NamedTuple):
+    start: datetime
+    end: datetime
+
+    def label(self):
+        return f"{self.start:%a %m-%d} {_clock(self.start)} - {_clock(self.end)}"
+
+
+def _clock(value):
+    return value.strftime('%I:%M %p').lstrip('0')
+
+
+def slot_minutes():
+    return int(os.getenv('INTERVIEW_SLOT_MINUTES', '60'))
+
+
+def schedule_year():
+    return int(os.getenv('SCHEDULE_YEAR') or date.today().year)
+
+
+def parse_day(text, year=None):
+    """'05-22' (or '2025-05-22') -> date."""
+    text = text.strip()
+    if text.count('-') == 2:
+        return date.fromisoformat(text)
+    return datetime.strptime(f'{year or schedule_year()}-{text}', '%Y-%m-%d').date()
+
+
+def parse_time(text, year=None):
+    """'05-21 3:00 PM' (or '05-21,3:00 PM', '2025-05-21 15:00') -> datetime."""
+    day, _, clock = text.strip().replace(',', ' ', 1).partition(' ')
+    clock = re.sub(r'\s*([AP]M)$', r' \1', ' '.join(clock.split()).upper())
+    for fmt in ('%I:%M %p', '%I %p', '%H:%M'):
+        try:
+            moment = datetime.strptime(clock, fmt).time()
+            break
+        except ValueError:
+            continue
+    else:
+        raise ValueError(f"Unrecognized time: {text!r}")
+    return datetime.combine(parse_day(day, year), moment)
+
+
+def parse_rows(lines, year=None, minutes=None):
+    """Parse CSV lines into Slots; returns (slots, number of rows skipped)."""
+    minutes = minutes or slot_minutes()
+    slots, skipped = [], 0
+    for row in csv.reader(lines):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        try:
+            start = parse_time(f'{cells[0]} {cells[1]}', year)
+            length = int(cells[2]) if len(cells) > 2 and cells[2] else minutes
+        except (IndexError, ValueError):
+            skipped += 1
+            continue
+        slots.append(Slot(start, start + timedelta(minutes=length)))
+    return slots, skipped
+
+
+class ScheduleIndex:
+    """Open interview slots sorted by start time, with interval queries."""
+
+    def __init__(self, slots=()):
+        self._set(sorted(slots))
+
+    def _set(self, slots):
+        # One tuple swap, so readers never see the starts and slots out of step
+        longest = max((s.end - s.start for s in slots), default=timedelta(0))
+        self._state = (slots, [s.start for s in slots], longest)
+
+    def __len__(self):
+        return len(self._state[0])
+
+    def all(self):
+        return list(self._state[0])
+
+    def between(self, start, end):
+        """Slots overlapping [start, end)."""
+        slots, starts, longest = self._state
+        lo = bisect.bisect_right(starts, start - longest)
+        hi = bisect.bisect_left(starts, end)
+        return [s for s in slots[lo:hi] if s.end > start]
+
+    def on_date(self, day):
+        """Slots starting on `day`."""
+        slots, starts, _ = self._state
+        midnight = datetime.combine(day, datetime.min.time())
+        lo = bisect.bisect_left(starts, midnight)
+        hi = bisect.bisect_left(starts, midnight + timedelta(days=1))
+        return slots[lo:hi]
+
+    def conflicts(self, start, minutes=None):
+        """Slots that a meeting of `minutes` (default one slot) starting at `start` would overlap."""
+        return self.between(start, start + timedelta(minutes=minutes or slot_minutes()))
+
+    def next_available(self, after, minutes=None, count=1):
+        """The first `count` slots starting at or after `after` that are at least `minutes` long."""
+        slots, starts, _ = self._state
+        found = []
+        for slot in slots[bisect.bisect_left(starts, after):]:
+            if minutes is None or slot.end - slot.start >= timedelta(minutes=minutes):
+                found.append(slot)
+                if len(found) == count:
+                    break
+        return found
+
+    def overlaps(self):
+        """Pairs of slots in the file that overlap each other (likely double entries)."""
+        slots = self._state[0]
+        pairs = []
+        for i, slot in enumerate(slots):
+            for other in slots[i + 1:]:
+                if other.start >= slot.end:
+                    break
+                pairs.append((slot, other))
+        return pairs
+
+
+class ScheduleFile(ScheduleIndex):
+    """A ScheduleIndex kept in step with a CSV file."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.skipped = 0
+        self._stamp = None
+        self._offset = 0
+        self._prefix_sha = hashlib.sha256()
+        self._lock = threading.Lock()
+        super().__init__()
+        self.refresh()
+
+    def refresh(self):
+        """Reload if the file changed since the last call; returns True if it did."""
+        st = os.stat(self.path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return False
+        with self._lock:
+            if stamp == self._stamp:
+                return False
+            with open(self.path, 'rb') as fh:
+                data = fh.read()
+            if self._offset and len(data) >= self._offset and \
+                    hashlib.sha256(data[:self._offset]).digest() == self._prefix_sha.digest():
+                self._merge(data[self._offset:])
+            else:
+                self.skipped = 0
+                self._offset = 0
+                self._prefix_sha = hashlib.sha256()
+                self._set([])
+                self._merge(data)
+            self._stamp = stamp
+        return True
+
+    def _merge(self, data):
+        slots, skipped = parse_rows(data.decode('utf-8' if self._offset else 'utf-8-sig').splitlines())
+        self.skipped += skipped
+        self._prefix_sha.update(data)
+        # A last row without its newline may still be growing: re-read the whole file next time
+        self._offset = self._offset + len(data) if data.endswith(b'\n') else 0
+        if slots:
+            self._set(sorted(self._state[0] + slots))
+
+
+_schedules = {}
+_schedules_lock = threading.Lock()
+
+
+def get_schedule_index(path=None):
+    """Process-wide ScheduleFile for the interview CSV, refreshed if the file changed."""
+    path = os.path.abspath(path or interview_csv_path())
+    index = _schedules.get(path)
+    if index is None:
+        with _schedules_lock:
+            index = _schedules.get(path)
+            if index is None:
+                index = _schedules[path] = ScheduleFile(path)
+                return index
+    index.refresh()
+    return index
@@ -0,0 +1,431 @@
+"""
+Bulk interview scheduling: assign candidates to the open interview slots.
+
+The open slots come from the schedule index (schedule.py). Each candidate
+and each interviewer may list when they are available; a candidate can only
+take a slot that lies inside one of their windows, and an interviewer only
+runs slots inside theirs, with at least `gap_minutes` between two of their
+interviews.
+
+The solver works in three steps:
+
+1. Seats. Every pair of a slot and an interviewer available for all of it is
+   a seat. Slots nobody can run are dropped. Without interviewers every slot
+   is a seat, and with a gap the slots form one panel.
+2. Feasibility. A NumPy candidate x slot boolean matrix marks which slots
+   fall inside which candidate's windows.
+3. Assignment. Two seats clash when they share a slot, or share an
+   interviewer and one starts less than `gap_minutes` after the other ends;
+   clashes are checked as candidates are booked, so the gap applies to the
+   actual interviews. A greedy pass gives the most constrained candidates
+   their earliest free seat first, then each candidate left out is placed
+   by a chain of moves (a booked candidate gives up their seat and takes
+   another one). When all seats belong to one interviewer (or, without
+   interviewers, to the panel), an earliest-end-first pass books the seat
+   that ends first among those clear of the last one, matching it to a
+   candidate by an augmenting path; that is optimal when any candidate can
+   take any slot and is kept when it beats the greedy pass. No schedule
+   places more candidates than a maximum matching of candidates to slots, or
+   than the longest run of clash-free seats of each interviewer; when the
+   result falls short of both, a branch-and-bound search over the seats
+   looks for a better one for at most SCHEDULE_SEARCH_MS milliseconds
+   (default 5). `method` is 'exact' when the schedule is proven optimal,
+   'best found' when the search ran out of time and 'greedy' without the
+   exact passes.
+
+    result = assign_interviews(read_people('candidates.csv'), gap_minutes=15)
+    result['assignments']    # [{'candidate', 'interviewer', 'start', 'end', 'label'}, ...]
+
+Availability is written as ';'-separated windows: a day ("05-21") or a day
+and a time range ("05-22 1:00 PM-5:00 PM"). No windows means any time.
+"""
+import csv
+import os
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+import numpy as np
+
+from .schedule import get_schedule_index, parse_day, parse_time
+
+_EPOCH = datetime(2000, 1, 1)
+# Wall-clock milliseconds of branch and bound before the best schedule found so far is returned
+SEARCH_MS = float(os.getenv('SCHEDULE_SEARCH_MS', '5'))
+# Chains of moves longer than this are not tried when placing a candidate
+MAX_CHAIN = 50
+# The search recurses once per candidate; larger batches keep the heuristic schedule
+MAX_SEARCH_CANDIDATES = 500
+
+
+class Person(NamedTuple):
+    name: str
+    windows: tuple = ()
+
+
+def parse_windows(text, year=None):
+    """'05-21; 05-22 1:00 PM-5:00 PM' -> [(start, end), ...]."""
+    windows = []
+    for part in (text or '').split(';'):
+        day, _, hours = part.strip().partition(' ')
+        if not day:
+            continue
+        if not hours.strip():
+            start = datetime.combine(parse_day(day, year), datetime.min.time())
+            windows.append((start, start + timedelta(days=1)))
+            continue
+        opens, _, closes = hours.partition('-')
+        if not closes.strip():
+            raise ValueError(f"Time range needs a start and an end: {part.strip()!r}")
+        windows.append((parse_time(f'{day} {opens}', year), parse_time(f'{day} {closes}', year)))
+    return tuple(windows)
+
+
+def parse_person(line):
+    """'Jane Doe: 05-21; 05-22 1:00 PM-5:00 PM' (or just 'Jane Doe') -> Person."""
+    name, _, available = line.partition(':')
+    return Person(name.strip(), parse_windows(available))
+
+
+def read_people(path):
+    """Read a name,available CSV (header row optional) into Persons."""
+    with open(path, newline='', encoding='utf-8-sig') as fh:
+        rows = [[cell.strip() for cell in row] for row in csv.reader(fh) if any(c.strip() for c in row)]
+    if rows and rows[0][0].lower() == 'name':
+        rows = rows[1:]
+    return [Person(row[0], parse_windows(row[1] if len(row) > 1 else '')) for row in rows]
+
+
+def _minutes(moment):
+    return (moment - _EPOCH) // timedelta(minutes=1)
+
+
+def _inside(windows, start, end):
+    return not windows or any(opens <= start and end <= closes for opens, closes in windows)
+
+
+def interview_seats(slots, interviewers=()):
+    """Every (slot index, slot, interviewer name or None) an interview can take place in, for `slots` sorted.
+
+    Returns (seats, unstaffed slots).
+    """
+    seats, unstaffed = [], []
+    for i, slot in enumerate(slots):
+        names = [p.name for p in interviewers if _inside(p.windows, slot.start, slot.end)] if interviewers else [None]
+        if not names:
+            unstaffed.append(slot)
+        seats.extend((i, slot, name) for name in names)
+    return seats, unstaffed
+
+
+def feasibility(candidates, slots):
+    """Boolean matrix [candidate, slot]: the slot lies inside one of the candidate's windows."""
+    starts = np.array([_minutes(slot.start) for slot in slots], dtype=np.int64)
+    ends = np.array([_minutes(slot.end) for slot in slots], dtype=np.int64)
+    matrix = np.zeros((len(candidates), len(slots)), dtype=bool)
+    owners, opens, closes = [], [], []
+    for i, person in enumerate(candidates):
+        if not person.windows:
+            matrix[i] = True
+        for window_open, window_close in person.windows:
+            owners.append(i)
+            opens.append(_minutes(window_open))
+            closes.append(_minutes(window_close))
+    if owners and len(slots):
+        fits = (np.array(opens)[:, None] <= starts[None, :]) & (ends[None, :] <= np.array(closes)[:, None])
+        np.logical_or.at(matrix, np.array(owners), fits)
+    return matrix
+
+
+def greedy_match(matrix):
+    """Most constrained candidate first, each taking its earliest free column; returns column per candidate (-1: none)."""
+    match = np.full(matrix.shape[0], -1)
+    free = np.ones(matrix.shape[1], dtype=bool)
+    for c in np.argsort(matrix.sum(axis=1), kind='stable'):
+        options = np.flatnonzero(matrix[c] & free)
+        if options.size:
+            match[c] = options[0]
+            free[options[0]] = False
+    return match
+
+
+def augment_from(c, options, match, owner):
+    """Match row `c` along a breadth-first augmenting path (in place); False if there is none."""
+    via = np.full(len(owner), -1)
+    queue, found = [c], -1
+    for u in queue:
+        for s in options[u]:
+            if via[s] >= 0:
+                continue
+            via[s] = u
+            if owner[s] < 0:
+                found = s
+                break
+            queue.append(owner[s])
+        if found >= 0:
+            break
+    # Shift every row along the path to the column that reached it
+    s = found
+    while s >= 0:
+        u = via[s]
+        previous = -1 if u == c else match[u]
+        match[u], owner[s] = s, u
+        s = previous
+    return found >= 0
+
+
+def augment(matrix, match):
+    """Grow `match` to a maximum matching with breadth-first augmenting paths (in place)."""
+    owner = np.full(matrix.shape[1], -1)
+    placed = np.flatnonzero(match >= 0)
+    owner[match[placed]] = placed
+    options = [np.flatnonzero(row) for row in matrix]
+    for c in np.flatnonzero(match < 0):
+        if options[c].size:
+            augment_from(c, options, match, owner)
+    return match
+
+
+def _ends_first(seats, usable):
+    """Indexes of the `usable` seats in order of end, then start."""
+    return sorted(usable, key=lambda seat: (seats[seat][1].end, seats[seat][1].start))
+
+
+def chain_bound(seats, usable, gap_minutes):
+    """Sum over interviewers of the most seats of theirs that are pairwise clear of each other.
+
+    Earliest end first finds the longest such run for each interviewer.
+    """
+    gap = timedelta(minutes=gap_minutes)
+    last_end, total = {}, 0
+    for seat in _ends_first(seats, usable):
+        _, slot, interviewer = seats[seat]
+        if interviewer not in last_end or last_end[interviewer] + gap <= slot.start:
+            last_end[interviewer] = slot.end
+            total += 1
+    return total
+
+
+def earliest_end_first(matrix, seats, usable, gap_minutes):
+    """{candidate: seat} for seats of a single interviewer (or panel).
+
+    Takes the seat that ends first among those clear of the last one taken,
+    whenever the taken slots can still all be matched to distinct candidates.
+    """
+    gap = timedelta(minutes=gap_minutes)
+    column = {seat: seats[seat][0] for seat in usable}
+    options = {seat: np.flatnonzero(matrix[:, slot_id]) for seat, slot_id in column.items()}
+    match, owner = {}, np.full(matrix.shape[0], -1)
+    last_end = None
+    for seat in _ends_first(seats, usable):
+        slot = seats[seat][1]
+        if last_end is not None and slot.start < last_end + gap:
+            continue
+        if augment_from(seat, options, match, owner):
+            last_end = slot.end
+    return {candidate: seat for seat, candidate in match.items()}
+
+
+class Bookings:
+    """Booked seats, with each interviewer's interviews in start order for the clash check."""
+
+    def __init__(self, seats, gap_minutes=0, panels=True):
+        self.seats = seats
+        self.panels = panels
+        gap = timedelta(minutes=gap_minutes)
+        # Per seat: interviews of the same interviewer must end by the first and start from the second
+        self._clear = [(slot.start - gap, slot.end + gap) for _, slot, _ in seats]
+        self.seat_of = {}
+        self._slot_holder = {}
+        # interviewer -> (starts, ends, candidates); booked interviews never clash, so ends are sorted too
+        self._calendar = defaultdict(lambda: ([], [], []))
+
+    def clashes(self, seat):
+        """Candidates whose booked interview rules out `seat`."""
+        slot_id, _, interviewer = self.seats[seat]
+        found = set()
+        holder = self._slot_holder.get(slot_id)
+        if holder is not None:
+            found.add(holder)
+        if self.panels:
+            starts, ends, holders = self._calendar[interviewer]
+            ends_by, starts_from = self._clear[seat]
+            found.update(holders[bisect_right(ends, ends_by):bisect_left(starts, starts_from)])
+        return found
+
+    def book(self, candidate, seat):
+        slot_id, slot, interviewer = self.seats[seat]
+        self.seat_of[candidate] = seat
+        self._slot_holder[slot_id] = candidate
+        if self.panels:
+            starts, ends, holders = self._calendar[interviewer]
+            i = bisect_left(starts, slot.start)
+            starts.insert(i, slot.start)
+            ends.insert(i, slot.end)
+            holders.insert(i, candidate)
+
+    def release(self, candidate):
+        """Cancel `candidate`'s booking and return its seat."""
+        seat = self.seat_of.pop(candidate)
+        slot_id, _, interviewer = self.seats[seat]
+        del self._slot_holder[slot_id]
+        if self.panels:
+            starts, ends, holders = self._calendar[interviewer]
+            i = holders.index(candidate)
+            del starts[i], ends[i], holders[i]
+        return seat
+
+
+def greedy_assign(options, bookings):
+    """Most constrained candidate first, each booking its earliest seat that clashes with nobody."""
+    for c in sorted(range(len(options)), key=lambda c: len(options[c])):
+        for seat in options[c]:
+            if not bookings.clashes(seat):
+                bookings.book(c, seat)
+                break
+
+
+def place(c, options, bookings, moved, depth=MAX_CHAIN):
+    """Book `c`, moving one booked candidate per step to make room; False (and nothing changed) if no chain works.
+
+    `moved` holds the candidates already tried in this chain search, so each is moved at most once.
+    """
+    for seat in options[c]:
+        if not bookings.clashes(seat):
+            bookings.book(c, seat)
+            return True
+    if depth == 0:
+        return False
+    for seat in options[c]:
+        clash = bookings.clashes(seat)
+        if len(clash) != 1:
+            continue
+        (other,) = clash
+        if other in moved:
+            continue
+        moved.add(other)
+        previous = bookings.release(other)
+        bookings.book(c, seat)
+        if place(other, options, bookings, moved, depth - 1):
+            return True
+        bookings.release(c)
+        bookings.book(other, previous)
+    return False
+
+
+def search(options, bookings, bound, milliseconds=None):
+    """Branch and bound for the largest clash-free booking, starting from (and keeping, if not beaten) `bookings`.
+
+    Returns True when the result is proven optimal, False when it stopped after
+    `milliseconds` (default SEARCH_MS) of wall-clock time.
+    """
+    deadline = time.perf_counter() + (SEARCH_MS if milliseconds is None else milliseconds) / 1000
+    order = sorted((c for c in range(len(options)) if options[c]), key=lambda c: len(options[c]))
+    if len(order) > MAX_SEARCH_CANDIDATES:
+        return False
+    best = dict(bookings.seat_of)
+    for c in list(bookings.seat_of):
+        bookings.release(c)
+
+    class Stop(Exception):
+        pass
+
+    def visit(i, placed):
+        nonlocal best
+        if placed > len(best):
+            best = dict(bookings.seat_of)
+            if placed == bound:
+                raise Stop(True)
+        if placed + len(order) - i <= len(best):
+            return
+        if time.perf_counter() > deadline:
+            raise Stop(False)
+        c = order[i]
+        for seat in options[c]:
+            if not bookings.clashes(seat):
+                bookings.book(c, seat)
+                visit(i + 1, placed + 1)
+                bookings.release(c)
+        visit(i + 1, placed)
+
+    try:
+        visit(0, 0)
+        proven = True
+    except Stop as stop:
+        proven = stop.args[0]
+    for c in list(bookings.seat_of):
+        bookings.release(c)
+    for c, seat in best.items():
+        bookings.book(c, seat)
+    return proven
+
+
+def assign_interviews(candidates, slots=None, interviewers=(), gap_minutes=0, exact=True):
+    """Assign each candidate (a Person or a name) to at most one open slot; returns the schedule as a dict."""
+    started = time.perf_counter()
+    candidates = [c if isinstance(c, Person) else Person(str(c)) for c in candidates]
+    if slots is None:
+        slots = get_schedule_index().all()
+    slots = sorted(slots)
+    seats, unstaffed = interview_seats(slots, interviewers)
+    matrix = feasibility(candidates, slots)
+    seat_slots = np.array([slot_id for slot_id, _, _ in seats], dtype=np.int64)
+    options = [np.flatnonzero(row[seat_slots]).tolist() for row in matrix]
+    # One interviewer's (or the panel's) interviews must not clash; without either, slots are independent
+    bookings = Bookings(seats, gap_minutes, panels=bool(interviewers) or bool(gap_minutes))
+
+    greedy_assign(options, bookings)
+    method = 'greedy'
+    if exact:
+        # No schedule places more candidates than a matching of candidates to distinct staffed slots,
+        # nor more than each interviewer's longest run of clash-free seats
+        staffed = matrix[:, np.unique(seat_slots)]
+        bound = int((augment(staffed, greedy_match(staffed)) >= 0).sum())
+        usable = np.flatnonzero(matrix[:, seat_slots].any(axis=0)).tolist()
+        if bookings.panels:
+            bound = min(bound, chain_bound(seats, usable, gap_minutes))
+        if bookings.panels and len({interviewer for _, _, interviewer in seats}) == 1:
+            run = earliest_end_first(matrix, seats, usable, gap_minutes)
+            if len(run) > len(bookings.seat_of):
+                for c in list(bookings.seat_of):
+                    bookings.release(c)
+                for c, seat in run.items():
+                    bookings.book(c, seat)
+        for c in range(len(candidates)):
+            if len(bookings.seat_of) == bound:
+                break
+            if options[c] and c not in bookings.seat_of:
+                place(c, options, bookings, {c})
+        proven = len(bookings.seat_of) == bound or search(options, bookings, bound)
+        method = 'exact' if proven else 'best found'
+
+    assignments, unassigned = [], []
+    for c, person in enumerate(candidates):
+        seat = bookings.seat_of.get(c)
+        if seat is None:
+            unassigned.append({'candidate': person.name,
+                               'reason': 'all their slots are taken' if options[c] else 'no open slot fits'})
+            continue
+        _, slot, interviewer = seats[seat]
+        assignments.append({'candidate': person.name, 'interviewer': interviewer, 'start': slot.start,
+                            'end': slot.end, 'label': slot.label()})
+    assignments.sort(key=lambda a: (a['start'], a['candidate']))
+    return {
+        'assignments': assignments,
+        'unassigned': unassigned,
+        'unstaffed_slots': [slot.label() for slot in unstaffed],
+        'method': method,
+        'seconds': round(time.perf_counter() - started, 4),
+    }
+
+
+def format_schedule(result):
+    """Plain-text rendering of an assign_interviews result (used by the agent tool and the CLI)."""
+    lines = [f"{a['label']}: {a['candidate']}" + (f" with {a['interviewer']}" if a['interviewer'] else '')
+             for a in result['assignments']]
+    lines += [f"Not scheduled: {u['candidate']} ({u['reason']})" for u in result['unassigned']]
+    if result['unstaffed_slots']:
+        lines.append(f"{len(result['unstaffed_slots'])} open slots left out: no interviewer is available for them.")
+    return "\n".join(lines) or "No candidates to schedule."
@@ -0,0 +1,178 @@
+"""
+Disk-backed cache of web search results (SerperDevTool).
+
+Role research for onboarding and meeting prep repeats the same searches
+("best practices Data Analyst") all year, and each one costs Serper quota and
+a network round trip. Results are kept in a SQLite file in the data
+directory, so every gunicorn worker, the Streamlit process and the src/
+scripts share them.
+
+Entries are keyed by the normalized query plus the search parameters
+(search type, country, locale, result count). An entry is fresh for
+SEARCH_CACHE_TTL_SECONDS (default 7 days). For another
+SEARCH_CACHE_STALE_SECONDS (default 30 days) it is served as is while one
+background refresh fetches a new copy (stale-while-revalidate); after that
+it is a miss. The file holds at most SEARCH_CACHE_MAX_ENTRIES (default
+5000) entries, dropping the least recently used. Hit and miss counters are
+kept in the same file, so `stats()` covers every process. SEARCH_CACHE=0
+turns the cache off.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .paths import data_dir
+
+FRESH, STALE = 'fresh', 'stale'
+
+# Parameters of SerperDevTool that change what a search returns
+SEARCH_PARAMS = ('search_type', 'n_results', 'country', 'location', 'locale')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    params TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    refreshing_until REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_COUNT = 'INSERT INTO counters (name, value) VALUES (?, 1) ON CONFLICT (name) DO UPDATE SET value = value + 1'
+
+
+def search_cache_enabled():
+    return os.getenv('SEARCH_CACHE', '1').lower() not in ('0', 'false', 'no')
+
+
+def normalize_query(query):
+    """Lowercase, collapse whitespace and strip trailing punctuation."""
+    return re.sub(r'\s+', ' ', str(query).strip().casefold()).rstrip(' ?!.')
+
+
+def cache_key(query, params):
+    payload = json.dumps({'q': normalize_query(query), 'params': params}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SearchCache:
+    """SQLite search result cache with TTL, stale-while-revalidate and LRU eviction."""
+
+    def __init__(self, path=None, ttl=None, stale=None, max_entries=None):
+        self.path = str(path or data_dir() / 'search_cache.sqlite3')
+        self.ttl = float(os.getenv('SEARCH_CACHE_TTL_SECONDS', 7 * 86400) if ttl is None else ttl)
+        self.stale = float(os.getenv('SEARCH_CACHE_STALE_SECONDS', 30 * 86400) if stale is None else stale)
+        self.max_entries = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', 5000) if max_entries is None else max_entries)
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _count(self, conn, *names):
+        conn.executemany(_COUNT, [(name,) for name in names])
+
+    def get(self, key):
+        """Return (response, FRESH | STALE), or (None, None) on a miss."""
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute('SELECT response, created FROM results WHERE key = ?', (key,)).fetchone()
+        age = now - row['created'] if row else None
+        state = None if age is None or age > self.ttl + self.stale else FRESH if age <= self.ttl else STALE
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            if state is None:
+                self._count(conn, 'misses')
+            else:
+                conn.execute('UPDATE results SET last_used = ?, hits = hits + 1 WHERE key = ?', (now, key))
+                self._count(conn, 'hits', 'stale_hits' if state == STALE else 'fresh_hits')
+        return (json.loads(row['response']), state) if state else (None, None)
+
+    def put(self, key, query, params, response):
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(
+                'INSERT INTO results (key, query, params, response, created, last_used) VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET response = excluded.response, created = excluded.created, '
+                'last_used = excluded.last_used, refreshing_until = 0',
+                (key, normalize_query(query), json.dumps(params, sort_keys=True), json.dumps(response), now, now))
+            self._count(conn, 'stores')
+            expired = conn.execute('DELETE FROM results WHERE created < ?', (now - self.ttl - self.stale,)).rowcount
+            overflow = conn.execute('SELECT COUNT(*) FROM results').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute('DELETE FROM results WHERE key IN '
+                             '(SELECT key FROM results ORDER BY last_used LIMIT ?)', (overflow,))
+            for name, n in (('expirations', expired), ('evictions', max(overflow, 0))):
+                if n:
+                    conn.execute('INSERT INTO counters (name, value) VALUES (?, ?) '
+                                 'ON CONFLICT (name) DO UPDATE SET value = value + excluded.value', (name, n))
+
+    def claim_refresh(self, key, seconds=60):
+        """True for exactly one caller (in any process) per stale entry and `seconds`."""
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            claimed = conn.execute('UPDATE results SET refreshing_until = ? WHERE key = ? AND refreshing_until < ?',
+                                   (now + seconds, key, now)).rowcount
+        return claimed == 1
+
+    def count(self, name):
+        conn = self._conn()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            self._count(conn, name)
+
+    def clear(self):
+        conn = self._conn()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM results')
+            conn.execute('DELETE FROM counters')
+
+    def stats(self):
+        conn = self._conn()
+        stats = {row['name']: row['value'] for row in conn.execute('SELECT name, value FROM counters')}
+        for name in ('hits', 'fresh_hits', 'stale_hits', 'misses', 'stores', 'refreshes', 'refresh_errors',
+                     'evictions', 'expirations'):
+            stats.setdefault(name, 0)
+        stats['size'] = conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats.update(ttl_seconds=self.ttl, stale_seconds=self.stale, max_entries=self.max_entries, path=self.path)
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    """Process-wide SearchCache (opened on first use)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SearchCache()
+    return _cache
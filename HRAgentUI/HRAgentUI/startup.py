@@ -0,0 +1,187 @@
+"""
+Startup cost: warm-up of the lazily loaded parts and an import-time report.
+
+Nothing heavy is imported when Django or Streamlit start. crewai, litellm,
+crewai_tools, the embedding model and the search indexes load on first use,
+so migrations, system checks and the static pages are up in a fraction of a
+second. `warm_up()` (or `python manage.py warmup`) pays those costs up front
+instead of on the first FAQ, notes or onboarding request.
+
+`import_report()` starts a fresh interpreter with `-X importtime`, times
+django.setup(), the URLconf import, building the ASGI and WSGI handlers
+(middleware included) and (optionally) the warm-up, and attributes the
+import time to top-level packages. The report fails when any of
+`STARTUP_FORBIDDEN` was imported before the warm-up. Run it with
+`python manage.py startup_report`.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from .metrics import stage
+from .paths import PROJECT_DIR
+
+
+def _import_crewai():
+    import crewai  # noqa: F401
+    import crewai_tools  # noqa: F401
+    from .metrics import install_crewai_listeners
+    install_crewai_listeners()
+
+
+def _import_litellm():
+    import litellm  # noqa: F401
+
+
+def _embedding_model():
+    from .embeddings import embed_one
+    embed_one('warm up')
+
+
+def _policy_search():
+    from .tool_registry import get_doc_search
+    get_doc_search()
+
+
+def _bm25_index():
+    from .tool_registry import get_bm25_index
+    get_bm25_index()
+
+
+def _agents():
+    from . import crew_specs
+    for spec in vars(crew_specs).values():
+        if isinstance(spec, crew_specs.AgentSpec):
+            spec.prototype()
+
+
+# In dependency order; later steps reuse what earlier ones loaded
+WARM_UP_STEPS = [
+    ('crewai', _import_crewai),
+    ('litellm', _import_litellm),
+    ('embedding_model', _embedding_model),
+    ('policy_search', _policy_search),
+    ('bm25_index', _bm25_index),
+    ('agents', _agents),
+]
+
+
+def warm_up(only=None, log=print):
+    """Load the lazy dependencies now; returns {step: seconds, or {'error': ...}}.
+
+    Failures are reported and skipped, so a missing document or API key
+    doesn't stop the other steps.
+    """
+    timings = {}
+    for name, fn in WARM_UP_STEPS:
+        if only and name not in only:
+            continue
+        started = time.perf_counter()
+        try:
+            with stage('warm_up', name):
+                fn()
+        except Exception as e:
+            timings[name] = {'error': f'{type(e).__name__}: {e}'}
+            log(f"warm-up {name} failed: {e}")
+            continue
+        timings[name] = round(time.perf_counter() - started, 3)
+        log(f"warm-up {name}: {timings[name]:.3f}s")
+    return timings
+
+
+# -- Import-time report -------------------------------------------------------
+
+_PHASE_MARK = '#phase '
+
+# Packages that must load on first use, never while the server starts
+STARTUP_FORBIDDEN = ('crewai', 'crewai_tools', 'litellm')
+
+_CHILD = """
+import json, os, sys, time
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'HRAgentUI.settings')
+phases = {}
+def mark(name):
+    sys.stderr.write('%s' + name + '\\n')
+    sys.stderr.flush()
+    return time.perf_counter()
+started = mark('django_setup')
+import django
+django.setup()
+started, phases['django_setup'] = mark('urlconf'), time.perf_counter() - started
+import HRAgentUI.urls
+started, phases['urlconf'] = mark('asgi_handler'), time.perf_counter() - started
+from django.core.asgi import get_asgi_application
+get_asgi_application()
+started, phases['asgi_handler'] = mark('wsgi_handler'), time.perf_counter() - started
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+phases['wsgi_handler'] = time.perf_counter() - started
+eager = [name for name in %r if name in sys.modules]
+if %r:
+    started = mark('warm_up')
+    from HRAgentUI.startup import warm_up
+    warm_up(log=lambda *a: None)
+    phases['warm_up'] = time.perf_counter() - started
+print(json.dumps({'phases': phases, 'eager': eager}))
+"""
+
+_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def _parse(stderr):
+    """Split `-X importtime` output by phase into (module, self_us, cumulative_us, depth) rows."""
+    phases = defaultdict(list)
+    phase = None
+    for line in stderr.splitlines():
+        if line.startswith(_PHASE_MARK):
+            phase = line[len(_PHASE_MARK):].strip()
+            continue
+        match = _LINE.match(line)
+        if match and phase:
+            self_us, cumulative_us, indent, module = match.groups()
+            phases[phase].append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return phases
+
+
+def _summarize(rows, top):
+    by_package = defaultdict(int)
+    for module, self_us, _, _ in rows:
+        by_package[module.split('.')[0]] += self_us
+    packages = sorted(by_package.items(), key=lambda item: -item[1])[:top]
+    # Outermost imports of the phase, i.e. what our code imported directly
+    direct = sorted((r for r in rows if r[3] == 0), key=lambda r: -r[2])[:top]
+    return {
+        'import_seconds': round(sum(r[1] for r in rows) / 1e6, 3),
+        'modules': len(rows),
+        'packages': [{'package': name, 'seconds': round(us / 1e6, 3)} for name, us in packages],
+        'direct_imports': [{'module': r[0], 'cumulative_seconds': round(r[2] / 1e6, 3)} for r in direct],
+    }
+
+
+def import_report(warm=False, top=15):
+    """Time a cold start in a fresh interpreter and break the import time down by package.
+
+    `eager_imports` lists the STARTUP_FORBIDDEN packages that were imported
+    before the warm-up; `ok` is False when there are any.
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', _CHILD % (_PHASE_MARK, STARTUP_FORBIDDEN, warm)],
+                          cwd=PROJECT_DIR, env=env, capture_output=True, text=True)
+    total = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"Startup failed:\n{proc.stderr[-4000:]}")
+    child = json.loads(proc.stdout.strip().splitlines()[-1])
+    phase_seconds = child['phases']
+    rows = _parse(proc.stderr)
+    return {
+        'ok': not child['eager'],
+        'eager_imports': child['eager'],
+        'process_seconds': round(total, 3),
+        'phases': {name: dict(seconds=round(seconds, 3), **_summarize(rows.get(name, []), top))
+                   for name, seconds in phase_seconds.items()},
+    }
@@ -0,0 +1,118 @@
+"""
+Streaming FAQ answers.
+
+`stream_faq_answer` looks the question up in the answer cache, retrieves the
+policy passages itself and streams a single LLM completion over them, so the
+first token reaches the user after one retrieval and one model round trip.
+If the model fails before producing anything the extractive BM25 answer is
+streamed instead, mirroring FAQ_ANSWER_MODE=auto for the blocking endpoints.
+With `web=True` a question the policy does not cover (no BM25 passage
+scores FAQ_EXTRACTIVE_MIN_SCORE, as for the extractive answer) also gets the
+top web search results as context, standing in for the FAQ agent's search tool.
+"""
+import json
+import time
+
+from . import llm
+from .answer_cache import faq_cache
+from .context_packer import ContextBudget, format_passage
+from .faq_fallback import MIN_SCORE, answer_mode, extractive_answer
+from .tool_registry import get_bm25_index, get_doc_search, get_google_search, policy_version
+
+
+def policy_context(question, limit=4, budget=None):
+    """Format the best policy passages for `question` as prompt context.
+
+    With a ContextBudget the passages are packed into what is left of it.
+    """
+    hits = get_doc_search().index.search(question, limit=limit * 2 if budget else limit)
+    if budget is None:
+        passages = [chunk for _, chunk in hits]
+    else:
+        passages = budget.pack([dict(chunk, score=score) for score, chunk in hits], query=question, limit=limit)
+    return "\n\n".join(format_passage(passage) for passage in passages)
+
+
+def policy_covers(question):
+    """Whether the best BM25 policy passage for `question` scores at least FAQ_EXTRACTIVE_MIN_SCORE."""
+    hits = get_bm25_index().search(question, limit=1)
+    return bool(hits) and hits[0][0] >= MIN_SCORE
+
+
+def web_context(question, limit=5):
+    """The top web search results for `question`, or None when the search fails."""
+    try:
+        results = get_google_search().run(search_query=question)
+    except Exception as e:
+        print(f"FAQ web search failed: {e}")
+        return None
+    if isinstance(results, dict):
+        return '\n'.join(f"- {r.get('title')}: {r.get('link')}\n  {r.get('snippet', '')}"
+                         for r in results.get('organic', [])[:limit]) or None
+    return str(results) or None
+
+
+def faq_messages(question, system, instructions, budget=None, web=False):
+    """Chat messages answering `question` from retrieved policy passages.
+
+    With `web`, questions the policy does not cover get web search results too.
+    """
+    header = "Relevant sections of the Employee Code of Conduct:"
+    if budget is not None:
+        budget.charge(system, header, f"Question: {question}", instructions)
+    context = policy_context(question, budget=budget)
+    content = f"{header}\n\n{context or '(none found)'}\n\n"
+    results = web_context(question) if web and not policy_covers(question) else None
+    if results:
+        section = f"Web search results (not company policy):\n\n{results}\n\n"
+        if budget is not None:
+            budget.charge(section)
+        content += section
+    return [
+        {'role': 'system', 'content': system},
+        {'role': 'user', 'content': f"{content}Question: {question}\n\n{instructions}"},
+    ]
+
+
+def stream_faq_answer(question, scope, system, instructions, web=False):
+    """Yield (event, text) pairs: ('token', chunk) while answering, then ('done', mode).
+
+    `scope` prefixes the answer-cache scope so endpoints with different answer
+    styles do not share entries; `web` is passed on to faq_messages.
+    """
+    cache_scope = f'{scope}:{policy_version()}'
+    cached, vector = faq_cache.lookup(question, cache_scope)
+    if cached is not None:
+        yield 'token', cached
+        yield 'done', 'cached'
+        return
+
+    if answer_mode() == 'extractive':
+        yield 'token', extractive_answer(question)
+        yield 'done', 'extractive'
+        return
+
+    parts = []
+    # The generator may be resumed from different threads, so the budget is passed explicitly
+    budget, started = ContextBudget(scope), time.perf_counter()
+    try:
+        for text in llm.stream_completion(faq_messages(question, system, instructions, budget, web=web)):
+            parts.append(text)
+            yield 'token', text
+    except Exception as e:
+        if parts or answer_mode() == 'llm':
+            raise
+        print(f"FAQ stream failed, answering extractively: {e}")
+        yield 'token', extractive_answer(question)
+        yield 'done', 'extractive'
+        return
+    finally:
+        budget.report(time.perf_counter() - started)
+
+    faq_cache.store(question, cache_scope, ''.join(parts), vector)
+    yield 'done', 'llm'
+
+
+def sse_event(event, data):
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
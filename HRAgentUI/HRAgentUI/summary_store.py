@@ -0,0 +1,213 @@
+"""
+Candidate summary store: SQLite with an FTS5 index over the summaries.
+
+Replaces the append-only candidate_bullet.txt. Each summary is keyed by the
+candidate (case- and whitespace-insensitive) and the sha256 of the notes it
+was generated from, so summarizing the same notes again replaces the old
+summary instead of adding a duplicate. The database runs in WAL mode and
+writes take the write lock up front (BEGIN IMMEDIATE), so the web workers,
+batch jobs and CLI scripts can all write to it at once.
+
+    store = get_summary_store()
+    store.latest('John')          # most recent summary for John
+    store.search('SQL')           # every candidate whose latest summary mentions SQL
+
+FTS5 ships with the SQLite in current Python builds; where the system
+SQLite is too old, the sitecustomize.py shim swaps in pysqlite3. Without
+FTS5, search falls back to a LIKE scan.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .paths import REPO_ROOT, data_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    id INTEGER PRIMARY KEY,
+    candidate TEXT NOT NULL,
+    candidate_key TEXT NOT NULL,
+    notes_sha256 TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    source TEXT,
+    created REAL NOT NULL,
+    UNIQUE (candidate_key, notes_sha256)
+);
+CREATE INDEX IF NOT EXISTS summaries_latest ON summaries (candidate_key, created);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS summaries_fts USING fts5(
+    candidate, summary, content='summaries', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS summaries_ai AFTER INSERT ON summaries BEGIN
+    INSERT INTO summaries_fts (rowid, candidate, summary) VALUES (new.id, new.candidate, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS summaries_ad AFTER DELETE ON summaries BEGIN
+    INSERT INTO summaries_fts (summaries_fts, rowid, candidate, summary)
+    VALUES ('delete', old.id, old.candidate, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS summaries_au AFTER UPDATE ON summaries BEGIN
+    INSERT INTO summaries_fts (summaries_fts, rowid, candidate, summary)
+    VALUES ('delete', old.id, old.candidate, old.summary);
+    INSERT INTO summaries_fts (rowid, candidate, summary) VALUES (new.id, new.candidate, new.summary);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO summaries (candidate, candidate_key, notes_sha256, summary, source, created)
+VALUES (:candidate, :candidate_key, :notes_sha256, :summary, :source, :created)
+ON CONFLICT (candidate_key, notes_sha256) DO UPDATE SET
+    candidate = excluded.candidate, summary = excluded.summary,
+    source = excluded.source, created = excluded.created
+"""
+
+# Keeps only each candidate's latest summary (served by the summaries_latest index)
+_LATEST_ONLY = 'AND s.created = (SELECT MAX(created) FROM summaries WHERE candidate_key = s.candidate_key)'
+
+_HEADER = re.compile(r'^\s*Candidate Name\s*:\s*(.+?)\s*$', re.IGNORECASE)
+
+
+def candidate_key(name):
+    return ' '.join(name.split()).casefold()
+
+
+def sha256_text(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def fts_query(text):
+    """Quote each word of free text so FTS5 syntax characters (e.g. C++, "-") are matched literally."""
+    return ' '.join('"{}"'.format(word.replace('"', '""')) for word in text.split())
+
+
+class SummaryStore:
+    """SQLite-backed candidate summaries with full-text search."""
+
+    def __init__(self, path=None):
+        self.path = str(path or data_dir() / 'candidates.sqlite3')
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        try:
+            conn.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            print(f"SQLite has no FTS5 ({e}); candidate search falls back to LIKE. Install pysqlite3-binary.")
+            self.fts = False
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; writes open their own BEGIN IMMEDIATE transaction
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _write(self, sql, rows):
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(sql, rows)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    @staticmethod
+    def _record(candidate, summary, notes_sha256=None, source=None, created=None):
+        summary = str(summary).strip()
+        return dict(candidate=' '.join(candidate.split()), candidate_key=candidate_key(candidate),
+                    notes_sha256=notes_sha256 or sha256_text(summary), summary=summary, source=source,
+                    created=created or time.time())
+
+    def add(self, candidate, summary, notes_sha256=None, source=None):
+        """Store one summary; `notes_sha256` identifies the notes it came from (defaults to the summary's hash)."""
+        self._write(_UPSERT, [self._record(candidate, summary, notes_sha256, source)])
+
+    def add_many(self, records):
+        """Store many summaries in one transaction; `records` are dicts with add()'s arguments."""
+        rows = [self._record(**record) for record in records]
+        if rows:
+            self._write(_UPSERT, rows)
+        return len(rows)
+
+    def latest(self, candidate):
+        row = self._conn().execute(
+            'SELECT * FROM summaries WHERE candidate_key = ? ORDER BY created DESC, id DESC LIMIT 1',
+            (candidate_key(candidate),)).fetchone()
+        return dict(row) if row else None
+
+    def history(self, candidate, limit=20):
+        rows = self._conn().execute(
+            'SELECT * FROM summaries WHERE candidate_key = ? ORDER BY created DESC, id DESC LIMIT ?',
+            (candidate_key(candidate), limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def candidates(self):
+        rows = self._conn().execute(
+            'SELECT candidate, COUNT(*) AS summaries, MAX(created) AS updated FROM summaries '
+            'GROUP BY candidate_key ORDER BY candidate').fetchall()
+        return [dict(row) for row in rows]
+
+    def search(self, text, limit=20, latest_only=True):
+        """Summaries matching the words in `text`, best match first.
+
+        With `latest_only` (default) only each candidate's latest summary is
+        considered, which answers "which candidates mention SQL".
+        """
+        latest = _LATEST_ONLY if latest_only else ''
+        if self.fts:
+            sql = ("SELECT s.*, snippet(summaries_fts, 1, '[', ']', '...', 12) AS snippet "
+                   'FROM summaries_fts JOIN summaries s ON s.id = summaries_fts.rowid '
+                   f'WHERE summaries_fts MATCH ? {latest} ORDER BY bm25(summaries_fts) LIMIT ?')
+            rows = self._conn().execute(sql, (fts_query(text), limit)).fetchall()
+        else:
+            words = text.split()
+            where = ' AND '.join('s.summary LIKE ?' for _ in words) or '1'
+            rows = self._conn().execute(f'SELECT s.* FROM summaries s WHERE {where} {latest} '
+                                        'ORDER BY s.created DESC LIMIT ?',
+                                        (*[f'%{w}%' for w in words], limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def import_text(self, path=None):
+        """Import a candidate_bullet.txt-style file (blocks starting "Candidate Name: ..."); safe to repeat."""
+        path = path or REPO_ROOT / 'candidate_bullet.txt'
+        with open(path, encoding='utf-8') as fh:
+            lines = fh.read().splitlines()
+
+        blocks = []
+        for line in lines:
+            match = _HEADER.match(line)
+            if match:
+                blocks.append((match.group(1), [line]))
+            elif blocks:
+                blocks[-1][1].append(line)
+        # Keep the file's order: later blocks are newer
+        created = os.path.getmtime(path) - len(blocks)
+        source = os.path.basename(path)
+        return self.add_many(dict(candidate=name, summary='\n'.join(block), source=source, created=created + i)
+                             for i, (name, block) in enumerate(blocks))
+
+    def count(self):
+        return self._conn().execute('SELECT COUNT(*) FROM summaries').fetchone()[0]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_summary_store():
+    """Process-wide SummaryStore (opened on first use)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SummaryStore()
+    return _store
@@ -0,0 +1,175 @@
+"""
+Process-wide registry of warm search tools.
+
+Building a search tool chunks and embeds the whole file (or loads its index),
+so doing it per request dominates latency. The registry builds each tool once
+per process and hands the same instance to every Django view and every
+Streamlit session. An entry is rebuilt only when the content hash of the file
+behind it changes.
+"""
+import hashlib
+import os
+import threading
+
+from .llm_replay import LIVE, REPLAY, llm_mode
+from .metrics import stage
+from .paths import interview_csv_path, policy_doc_path
+
+_digest_cache = {}
+_digest_lock = threading.Lock()
+
+
+def file_digest(path):
+    """Return the sha256 hex digest of a file's content.
+
+    The digest is cached against (mtime, size) so repeated lookups only stat
+    the file and re-read it when it has actually been touched.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _digest_lock:
+        cached = _digest_cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 16), b''):
+            sha.update(block)
+    digest = sha.hexdigest()
+
+    with _digest_lock:
+        _digest_cache[path] = (stamp, digest)
+    return digest
+
+
+class ToolRegistry:
+    """Thread-safe cache of tool instances keyed by name.
+
+    Each entry remembers the digest of the file it was built from; `get`
+    returns the cached instance while the digest matches and rebuilds it
+    otherwise. Builds for different names run concurrently, builds for the
+    same name are serialized so a cold start only embeds a file once.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._build_locks = {}
+
+    def _build_lock(self, name):
+        with self._lock:
+            return self._build_locks.setdefault(name, threading.Lock())
+
+    def get(self, name, factory, path=None):
+        """Return the tool registered under `name`, building it with `factory` if needed.
+
+        When `path` is given the tool is tied to that file's content hash.
+        """
+        digest = file_digest(path) if path else None
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == digest:
+            return entry[1]
+
+        with self._build_lock(name):
+            # Another thread may have finished the build while we waited
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == digest:
+                return entry[1]
+            with stage('tool_build', name):
+                tool = factory()
+            with self._lock:
+                self._entries[name] = (digest, tool)
+            return tool
+
+    def invalidate(self, name=None):
+        """Drop one entry (or all of them) so the next `get` rebuilds it."""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def snapshot(self):
+        """Return {name: digest} for the tools currently built."""
+        with self._lock:
+            return {name: entry[0] for name, entry in self._entries.items()}
+
+
+registry = ToolRegistry()
+
+
+def policy_version():
+    """Content hash of the policy document, used to scope cached answers"""
+    return file_digest(policy_doc_path())
+
+
+def get_policy_index():
+    """Shared PolicyIndex, loaded from (or saved to) the on-disk index directory"""
+    from .policy_index import load_or_build
+
+    path = policy_doc_path()
+    return registry.get('policy_index', lambda: load_or_build(path), path=path)
+
+
+def get_bm25_index():
+    """Shared BM25 index over the policy paragraphs (no model needed)"""
+    from .bm25 import BM25Index
+
+    path = policy_doc_path()
+    return registry.get('bm25_index', lambda: BM25Index.from_docx(path), path=path)
+
+
+def get_doc_search():
+    """Shared search tool over the Employee Code of Conduct.
+
+    FAQ_RETRIEVAL=bm25 serves it from the lexical index instead of embeddings.
+    """
+    from .agent_tools import PolicySearchTool
+
+    path = policy_doc_path()
+    if os.getenv('FAQ_RETRIEVAL', 'embedding').lower() == 'bm25':
+        return registry.get('doc_search_bm25', lambda: PolicySearchTool(index=get_bm25_index()), path=path)
+    return registry.get('doc_search', lambda: PolicySearchTool(index=get_policy_index()), path=path)
+
+
+def get_csv_search():
+    """Shared CSVSearchTool over the interview schedule (keyword search when replaying offline)"""
+    path = interview_csv_path()
+    if llm_mode() == REPLAY:
+        from .agent_tools import CSVRowSearchTool
+        return registry.get('csv_search', lambda: CSVRowSearchTool(csv_path=str(path)), path=path)
+
+    from crewai_tools import CSVSearchTool
+    return registry.get('csv_search', lambda: CSVSearchTool(path), path=path)
+
+
+def get_schedule_tool():
+    """Shared ScheduleLookupTool over the interview schedule (the index reloads itself when the CSV changes)"""
+    from .agent_tools import ScheduleLookupTool
+    return registry.get('schedule_lookup', ScheduleLookupTool)
+
+
+def get_interview_scheduler():
+    """Shared InterviewSchedulerTool over the open interview slots"""
+    from .agent_tools import InterviewSchedulerTool
+    return registry.get('interview_scheduler', InterviewSchedulerTool)
+
+
+def get_google_search():
+    """Shared SerperDevTool (stateless, so it is never rebuilt), cached on disk when live and
+    recorded or replayed per LLM_MODE otherwise"""
+    from crewai_tools import SerperDevTool
+
+    mode = llm_mode()
+    if mode == LIVE:
+        from .search_cache import search_cache_enabled
+        if search_cache_enabled():
+            from .agent_tools import CachedSearchTool
+            return registry.get('google_search:cached', lambda: CachedSearchTool.wrap(SerperDevTool()))
+        return registry.get('google_search', SerperDevTool)
+
+    from .agent_tools import CassetteTool, offline_web_search
+    return registry.get(f'google_search:{mode}',
+                        lambda: CassetteTool.wrap(SerperDevTool(), mode, fallback=offline_web_search))
@@ -26,6 +26,14 @@ urlpatterns = [
     path('email-onboarding/',views.onboarding),
     path('candidate-notes/',views.candidate_notes),
     path('summarize-notes/', views.summarize_notes, name='summarize_notes'),
+    path('summarize-notes/batch/', views.summarize_notes_batch, name='summarize_notes_batch'),
     path('process_form/', views.process_form, name='process_form'),
+    path('process_form/stream/', views.process_form_stream, name='process_form_stream'),
+    path('faq-cache/stats/', views.faq_cache_stats, name='faq_cache_stats'),
+    path('search-cache/stats/', views.search_cache_stats, name='search_cache_stats'),
     path('onboarding-submit/',views.onboarding_submit, name='onboarding_submit'),
+    path('onboarding-bulk/', views.onboarding_bulk_submit, name='onboarding_bulk_submit'),
+    path('jobs/<str:job_id>/', views.job_status, name='job_status'),
+    path('metrics', views.metrics_view, name='metrics'),
+    path('ready', views.ready, name='ready'),
 ]
@@ -8,24 +8,26 @@
 
 
 from django.shortcuts import render
-from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.core.files.storage import FileSystemStorage
-from django.shortcuts import render
-from django.views.decorators.csrf import csrf_exempt
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.core.files.storage import default_storage
 import os
-import smtplib
-import ssl
-from email.message import EmailMessage
 from textwrap import dedent
 from dotenv import load_dotenv
-from crewai import Crew, Agent, Task, Process
-from crewai.tools import tool
-from datetime import datetime, timedelta
-from crewai_tools import DOCXSearchTool, CSVSearchTool, TXTSearchTool, SerperDevTool
-from dotenv import load_dotenv
+from .tool_registry import get_doc_search, policy_version
+from .answer_cache import faq_cache
+from .faq_fallback import answer_with_fallback_async
+from .streaming import sse_event, stream_faq_answer
+from .jobs import job_queue
+from .mail_transport import build_message, get_mail_pool
+from .bulk_onboarding import personalize, read_roster, run_bulk_onboarding
+from .notes_summary import summarize_batch, summarize_notes_file
+from .context_packer import context_budget
+from .crew_specs import FAQ_AGENT, FAQ_TASK, ONBOARDING_AGENT, ONBOARDING_TASK
+from .aio import iterate, run_sync, submit
+from .role_packs import refresh_packs, role_pack
+from . import metrics
+from .readiness import readiness
 
 load_dotenv()
 
@@ -44,8 +46,18 @@ if serper_api_key:
 openai_model = os.getenv('OPENAI_MODEL_NAME', 'gemini/gemini-1.5-flash')
 os.environ['OPENAI_MODEL_NAME'] = openai_model
 
-doc_search = DOCXSearchTool("../docs/Employee-Code-of-Conduct.docx")
-google_search = SerperDevTool()
+# Upper bound on the parallel crews one request may ask for
+MAX_CONCURRENCY = int(os.getenv('MAX_REQUEST_CONCURRENCY', '16'))
+
+
+def _concurrency(request, default=4):
+    """The form's `concurrency`, capped at MAX_CONCURRENCY; None when it is not a positive integer."""
+    try:
+        value = int(request.POST.get('concurrency', default))
+    except (TypeError, ValueError):
+        return None
+    return min(value, MAX_CONCURRENCY) if value >= 1 else None
+
 
 def homepage(request):
   return render(request,'home.html')
@@ -64,56 +76,50 @@ def onboarding(request):
 
 
 @csrf_exempt
-def summarize_notes(request):
+async def summarize_notes(request):
     if request.method == 'POST':
         candidate_name = request.POST['candidateName']
         notes_file = request.FILES['notesFile']
-        file_path = default_storage.save('tmp/' + notes_file.name, notes_file)
-
-        txt_search = TXTSearchTool(file_path)
-
-        notes_agent = Agent(
-            role="Candidate Notes Summarizer",
-            goal='Summarizes the notes on a candidate',
-            backstory=dedent("""\
-                As a Notes Summarizer, your mission is to read through the entire file
-                and summarize the information in a concise yet informative manner into bullet points."""),
-            tools=[txt_search],
-            verbose=True
-        )
+        # File I/O and the crew run on the async pool so the worker keeps serving other requests
+        file_path = await run_sync(default_storage.save, 'tmp/' + notes_file.name, notes_file)
 
-        def candidate_notes_task(name):
-            return Task(
-                description=dedent(f"""\
-                    Summarize the document into a few detailed bullet points
-                    Candidate Name: {name}"""),
-                expected_output=dedent("""\
-                    Ensure each bullet point isn't longer than 80 characters
-                    Have a list of 5-6 bullet points on notes given about the candidate
-                    Use this format for your output:
-                    Candidate Name : [Candidate Name]
-                    - Candidate notes"""),
-                agent=notes_agent,
-            )
-
-        candidate_task = candidate_notes_task(candidate_name)
-
-        crew = Crew(agents=[notes_agent], tasks=[candidate_task])
-        result = crew.kickoff()
-        print(result)
-
-        # Clean up the temporary file
-        os.remove(file_path)
-
-        # Extract text content from CrewOutput object
-        summary_text = str(result) if hasattr(result, '__str__') else result.raw
+        try:
+            summary_text = await run_sync(summarize_notes_file, candidate_name, file_path, source=notes_file.name)
+        finally:
+            # Clean up the temporary file
+            await run_sync(os.remove, file_path)
 
         return JsonResponse({'summary': summary_text})
 
     return JsonResponse({'error': 'Invalid request'}, status=400)
 
 @csrf_exempt
-def process_form(request):
+async def summarize_notes_batch(request):
+    """Summarize many notes files (or zips of them) in parallel, streaming each result as it finishes"""
+    uploads = request.FILES.getlist('notesFiles') if request.method == 'POST' else []
+    if not uploads:
+        return JsonResponse({'error': 'POST one or more files as "notesFiles".'}, status=400)
+
+    concurrency = _concurrency(request)
+    if concurrency is None:
+        return JsonResponse({'error': 'concurrency must be a positive integer.'}, status=400)
+    files = await run_sync(lambda: [(upload.name, upload.read()) for upload in uploads])
+
+    async def events():
+        yield sse_event('start', {'files': len(files)})
+        count = 0
+        async for result in iterate(summarize_batch(files, concurrency=concurrency)):
+            count += 1
+            yield sse_event('result', result)
+        yield sse_event('done', {'summarized': count})
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@csrf_exempt
+async def process_form(request):
     if request.method == 'POST':
         question = request.POST.get('question')
 
@@ -121,47 +127,99 @@ def process_form(request):
             return JsonResponse({'summary': 'Please provide a question.'}, status=400)
 
         try:
-            # Create an instance of DOCXSearchTool with the document
-
-            faq_agent = Agent(
-                role='Human Resource Employee',
-                goal='Find the section of the document which contains relevant information and summarize them.',
-                tools=[doc_search],
-                backstory=dedent("""\
-                    As a HR Employee, your mission is to find which sections of the document contains the
-                    relevant information and summarize those in a few sentences. If you can't find any keywords then just say 
-                    I couldn't find anything in our company's policy regarding this topic. Kindly 
-                    contact HR for information on this topic."""),
-                verbose=True
+            # Answers are scoped to the policy document version they were generated from
+            cache_scope = f'process_form:{await run_sync(policy_version)}'
+            cached_answer, vector = await run_sync(faq_cache.lookup, question, cache_scope)
+            if cached_answer is not None:
+                return JsonResponse({'summary': cached_answer, 'cached': True})
+
+            def run_crew():
+                from crewai import Crew
+
+                # Agent, task text and policy search tool are built once per process;
+                # only the question changes per request
+                faq_agent = FAQ_AGENT.build(tools=[get_doc_search()])
+                summarize_task = FAQ_TASK.build(faq_agent, question=question)
+
+                # The policy searches the agent makes are packed into the endpoint's token budget
+                with context_budget('process_form') as budget:
+                    budget.charge_crew(faq_agent, summarize_task)
+                    crew = Crew(agents=[faq_agent], tasks=[summarize_task])
+                    result = crew.kickoff()
+
+                # Extract text content from CrewOutput object
+                return str(result) if hasattr(result, '__str__') else result.raw
+
+            # Falls back to an extractive BM25 answer if the model fails or is too slow
+            summary_text, answer_mode = await answer_with_fallback_async(
+                question, run_crew,
+                on_answer=lambda answer: faq_cache.store(question, cache_scope, answer, vector),
             )
 
-            def summary_task(question):
-                return Task(
-                    description=dedent(f"""\
-                        Find all the relevant areas of the document where the words from the question appear and
-                        summarize them in a few words.
-                        Question: {question}"""),
-                    expected_output=dedent("""\
-                        Give a single conclusive answer using the relevant information in the document which 
-                        contains the keyword asked in the question. Answer the question with a yes or no.
-                     Start each answer with yes or no and then say' our company policy states that'. Answer should not be longer than 2-3 sentences."""),
-                    agent=faq_agent
-                )
+            return JsonResponse({'summary': summary_text, 'mode': answer_mode})
 
-            summarize_task = summary_task(question)
+        except Exception as e:
+            return JsonResponse({'summary': f'An error occurred: {str(e)}'}, status=500)
 
-            crew = Crew(agents=[faq_agent], tasks=[summarize_task])
-            result = crew.kickoff()
+    return JsonResponse({'summary': 'Invalid request method.'}, status=405)
 
-            # Extract text content from CrewOutput object
-            summary_text = str(result) if hasattr(result, '__str__') else result.raw
+FAQ_STREAM_SYSTEM_PROMPT = dedent("""\
+    You are a HR Employee. Your mission is to use the sections of the company's Employee Code of Conduct
+    given to you to answer the employee's question. If they contain nothing relevant then just say
+    I couldn't find anything in our company's policy regarding this topic. Kindly
+    contact HR for information on this topic.""")
 
-            return JsonResponse({'summary': summary_text})
+FAQ_STREAM_INSTRUCTIONS = dedent("""\
+    Give a single conclusive answer using the relevant information in the document which
+    contains the keyword asked in the question. Answer the question with a yes or no.
+    Start each answer with yes or no and then say 'our company policy states that'. Answer should not be longer than 2-3 sentences.""")
 
+@csrf_exempt
+async def process_form_stream(request):
+    """Server-sent events variant of process_form that forwards tokens as the LLM produces them"""
+    if request.method != 'POST':
+        return JsonResponse({'summary': 'Invalid request method.'}, status=405)
+
+    question = request.POST.get('question')
+    if not question:
+        return JsonResponse({'summary': 'Please provide a question.'}, status=400)
+
+    async def events():
+        # Flush headers and a first event right away so the client sees progress immediately
+        yield sse_event('start', {})
+        try:
+            async for event, value in iterate(stream_faq_answer(question, 'process_form', FAQ_STREAM_SYSTEM_PROMPT, FAQ_STREAM_INSTRUCTIONS)):
+                if event == 'token':
+                    yield sse_event('token', {'text': value})
+                else:
+                    yield sse_event('done', {'mode': value})
         except Exception as e:
-            return JsonResponse({'summary': f'An error occurred: {str(e)}'}, status=500)
+            yield sse_event('error', {'summary': f'An error occurred: {str(e)}'})
 
-    return JsonResponse({'summary': 'Invalid request method.'}, status=405)
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+def faq_cache_stats(request):
+    return JsonResponse(faq_cache.stats())
+
+
+def search_cache_stats(request):
+    from .search_cache import get_search_cache
+    return JsonResponse(get_search_cache().stats())
+
+
+def metrics_view(request):
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def ready(request):
+    """Readiness for fly's health check: 200 once this process is warm, 503 while it warms up"""
+    # Under runserver nothing started the warm-up yet
+    readiness.start()
+    snapshot = readiness.snapshot()
+    return JsonResponse(snapshot, status=200 if snapshot['ready'] else 503)
 
 # @csrf_exempt
 # def onboarding_submit(request):
@@ -262,105 +320,87 @@ def process_form(request):
 #         return JsonResponse({'message': 'Invalid request method!'}, status=400)
 
 
-def onboarding_submit(request):
+def run_onboarding(name, role, email, code_of_conduct):
+    """Generate the personalized onboarding email and send it (runs on the job queue)"""
+    from crewai import Crew
+
+    research = role_pack(role)
+    if research is not None:
+        # The role's research is precomputed; only the greeting needs the model
+        result = personalize({'name': name, 'role': role, 'code_of_conduct': code_of_conduct}, research)
+    else:
+        greet_agent = ONBOARDING_AGENT.build()
+        set_onboard_task = ONBOARDING_TASK.build(greet_agent, link=code_of_conduct, role=role, name=name)
+
+        crew = Crew(agents=[greet_agent], tasks=[set_onboard_task])
+        # Get your crew to work!
+        result = crew.kickoff()
+        # Research the role in the background so the next hire in it gets a pack
+        submit(refresh_packs, [role], log=print)
+
+    # Define email sender and receiver
+    email_sender = os.getenv('EMAIL_SENDER')
+    email_password = os.getenv('EMAIL_PASSWORD')
+    email_receiver = email
+    
+    # Check if the environment variables are loaded correctly
+    if not email_sender or not email_password:
+        raise ValueError("Email credentials are not set in the environment variables")
+    
+    # Set the subject and body of the email
+    subject = 'Welcome to Company XYZ!!!'
+    # Extract text content from CrewOutput object
+    body = str(result) if hasattr(result, '__str__') else result.raw
+
+    em = build_message(email_sender, email_receiver, subject, body)
+
+    # Send over a pooled, already logged-in SMTP session
+    get_mail_pool().send(em)
+
+    return {'message': 'Email sent successfully!', 'result': body}
+
+
+async def onboarding_submit(request):
     if request.method == 'POST':
         name = request.POST.get('name')
         role = request.POST.get('role')
         email = request.POST.get('email')
         code_of_conduct = request.POST.get('codeOfConduct')
 
-        # # Define your agents, tasks, and crew as per your requirements
-        # researcher_agent = Agent(
-        #     role="Research Specialist",
-        #     goal='Research the role to find the best practices for the job role and provide links on how to be successful ',
-        #     tools=[google_search],
-        #     backstory=dedent("""\
-        #       As a Research Specialist, your job is to search the web and come up with the best practices and methods
-        #       to be successful at a specific job role and also provide useful links which talk about how to be successful
-        #       in the particular job role."""),
-        #     verbose=True
-        # )
-
-        # def research_task(role):
-        #     return Task(
-        #         description=dedent(f"""\
-        #             generate the best practices and ways a person can successful at the given job role
-        #             Job Role: {role}"""),
-        #         expected_output=dedent("""\
-        #             The best practices and things to do to be successful at the job role along with useful links for reference"""),
-        #         agent=researcher_agent,
-        #     )
-
-        # set_research_task = research_task(role)
-
-        greet_agent = Agent(
-            role="Personalized Message Sender and Research Specialist",
-            goal='Write a personalized message to person and welcome them into the company. Also, Research the role to find the best practices for the job role and provide links on how to be successful.',
-            backstory=dedent("""\
-              Your job is to write a personalized message to the new employee joining the company and talk about company culture and wish
-              the employee success in the company.Also, your job is to search the web and come up with the best practices and methods
-              to be successful at a specific job role and also provide useful links which talk about how to be successful
-              in the particular job role. """),
-            verbose=True
-        )
-
-        def onboard_task(name, link):
-            return Task(
-                description=dedent(f"""\
-                    onboard the people by wishing good luck and ask them to review the code of conduct.generate the best practices and ways a person can successful at the given job role
-                    Employee Code of Conduct Link: {link},
-                    Job Role: {role},
-                    Name: {name}"""),
-                expected_output=dedent("""\
-                    Output should be formatted like this:
-                    - Greeting and well wishes 
-                    - Ask to review Employee Code of Conduct with link 
-                    - Best Practices to be successful along with links
-                    - end it with
-                    Best Regards,
-                    John McEnroe,
-                    HR of Company XYZ"""),
-                agent=greet_agent,
-            )
-
-        set_onboard_task = onboard_task(name, link=code_of_conduct)
-
-        crew = Crew(agents=[greet_agent], tasks=[set_onboard_task])
-        # Get your crew to work!
-        result = crew.kickoff()
+        # Generation and delivery take tens of seconds; run them off the request thread
+        job_id = await run_sync(job_queue.submit, 'onboarding', run_onboarding, name, role, email, code_of_conduct)
 
-        # Define email sender and receiver
-        email_sender = os.getenv('EMAIL_SENDER')
-        email_password = os.getenv('EMAIL_PASSWORD')
-        email_receiver = email
-        
-        # Check if the environment variables are loaded correctly
-        if not email_sender or not email_password:
-            raise ValueError("Email credentials are not set in the environment variables")
-        
-        # Set the subject and body of the email
-        subject = 'Welcome to Company XYZ!!!'
-        # Extract text content from CrewOutput object
-        body = str(result) if hasattr(result, '__str__') else result.raw
-
-        em = EmailMessage()
-        em['From'] = email_sender
-        em['To'] = email_receiver
-        em['Subject'] = subject
-        em.set_content(body)
-
-        # Add SSL (layer of security)
-        context = ssl.create_default_context()
-
-        # Log in and send the email
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465, context=context) as smtp:
-            smtp.login(email_sender, email_password)
-            smtp.sendmail(email_sender, email_receiver, em.as_string())
-
-        # Extract text content from CrewOutput object for JSON response
-        result_text = str(result) if hasattr(result, '__str__') else result.raw
-
-        # Returning a JSON response indicating success
-        return JsonResponse({'message': 'Email sent successfully!', 'result': result_text})
+        return JsonResponse(
+            {'message': 'Onboarding email queued.', 'job_id': job_id, 'status_url': f'/jobs/{job_id}/'},
+            status=202,
+        )
     else:
         return JsonResponse({'message': 'Invalid request method!'}, status=400)
+
+
+@csrf_exempt
+def onboarding_bulk_submit(request):
+    """Upload a roster CSV (name, role, email, code_of_conduct) and onboard everyone on it"""
+    if request.method != 'POST' or 'roster' not in request.FILES:
+        return JsonResponse({'message': 'POST a roster CSV file as "roster".'}, status=400)
+
+    rows = read_roster(request.FILES['roster'])
+    if not rows:
+        return JsonResponse({'message': 'The roster has no rows.'}, status=400)
+    concurrency = _concurrency(request)
+    if concurrency is None:
+        return JsonResponse({'message': 'concurrency must be a positive integer.'}, status=400)
+    send = request.POST.get('dryRun', '').lower() not in ('1', 'true', 'yes')
+
+    job_id = job_queue.submit('bulk_onboarding', run_bulk_onboarding, rows, concurrency=concurrency, send=send)
+    return JsonResponse(
+        {'message': f'Onboarding {len(rows)} new hires.', 'job_id': job_id, 'status_url': f'/jobs/{job_id}/'},
+        status=202,
+    )
+
+
+def job_status(request, job_id):
+    job = job_queue.status(job_id)
+    if job is None:
+        return JsonResponse({'message': 'Unknown job id.'}, status=404)
+    return JsonResponse(job)
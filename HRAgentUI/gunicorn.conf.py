@@ -0,0 +1,16 @@
+# gunicorn settings for production: `gunicorn -c gunicorn.conf.py HRAgentUI.asgi:application`
+#
+# Each worker is an ASGI (uvicorn) event loop, so one process holds many
+# in-flight crews: the async views await crew runs, file and SMTP I/O on a
+# thread pool (sized by ASYNC_THREADS, see HRAgentUI/aio.py) instead of tying
+# up a worker per request.
+import os
+
+bind = f":{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'uvicorn_worker.UvicornWorker')
+
+# Crews can take minutes; don't let the arbiter kill a busy worker
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '300'))
+graceful_timeout = 30
+keepalive = 5
@@ -0,0 +1,48 @@
+"""
+Shared setup for the test suite.
+
+Tests run offline: LLM_MODE=replay answers model calls and web searches from
+the (empty) cassette, embeddings use the hash backend, and every run gets
+its own data directory so no test touches HRAgentUI/var/.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = PROJECT_DIR.parent
+
+sys.path.insert(0, str(PROJECT_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'HRAgentUI.settings')
+os.environ['LLM_MODE'] = 'replay'
+os.environ['LLM_REPLAY_LATENCY'] = '0'
+os.environ['ROLE_PACKS_REFRESH_SECONDS'] = '0'
+os.environ['HR_DATA_DIR'] = tempfile.mkdtemp(prefix='hr-tests-')
+
+
+@pytest.fixture(scope='session')
+def django_setup():
+    import django
+    django.setup()
+
+
+@pytest.fixture
+def client(django_setup):
+    from django.test import Client
+    return Client(HTTP_HOST='localhost')
+
+
+@pytest.fixture
+def policy_doc():
+    return str(REPO_ROOT / 'docs' / 'Employee-Code-of-Conduct.docx')
+
+
+@pytest.fixture
+def async_client(django_setup):
+    from django.test import AsyncClient, override_settings
+    # AsyncClient always sends Host: testserver
+    with override_settings(ALLOWED_HOSTS=['testserver']):
+        yield AsyncClient()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from HRAgentUI.answer_cache import SemanticAnswerCache
+
+VECTORS = {
+    'can i work remotely': [1.0, 0.0, 0.0],
+    'remote work policy': [0.96, 0.28, 0.0],
+    'what is the dress code': [0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture
+def embedded():
+    return []
+
+
+@pytest.fixture
+def cache(embedded):
+    def embed(question):
+        embedded.append(question)
+        return np.array(VECTORS[question.lower().rstrip('?')], dtype=np.float32)
+    return SemanticAnswerCache(threshold=0.9, max_entries=2, ttl=60, embed=embed)
+
+
+def test_similar_question_hits(cache):
+    cache.store('Can I work remotely?', 'faq', 'Two days a week.')
+    answer, _ = cache.lookup('Remote work policy', 'faq')
+    assert answer == 'Two days a week.'
+    assert cache.lookup('Remote work policy', 'other-scope') == (None, None)
+
+
+def test_miss_embeds_the_question_once(cache, embedded):
+    cache.store('Can I work remotely?', 'faq', 'Two days a week.')
+    embedded.clear()
+    answer, vector = cache.lookup('What is the dress code?', 'faq')
+    assert answer is None and vector is not None
+    cache.store('What is the dress code?', 'faq', 'Business casual.', vector)
+    assert embedded == ['What is the dress code?']
+    assert cache.lookup('what is the dress code', 'faq')[0] == 'Business casual.'
+
+
+def test_lru_eviction(cache):
+    for question in VECTORS:
+        cache.store(question, 'faq', question.upper())
+    stats = cache.stats()
+    assert stats['size'] == 2 and stats['evictions'] == 1
+    # The oldest question went; the similar one left answers for it
+    assert cache.lookup('can i work remotely', 'faq')[0] == 'REMOTE WORK POLICY'
+
+
+def test_expired_entries_are_dropped(cache, monkeypatch):
+    cache.store('Can I work remotely?', 'faq', 'Two days a week.')
+    import time
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 120)
+    assert cache.lookup('Can I work remotely?', 'faq') == (None, None)
+    assert cache.stats()['expirations'] == 1
@@ -0,0 +1,40 @@
+import os
+
+from HRAgentUI import benchmarks
+
+
+def _results(**medians):
+    return {'results': {name: {'flow': 'faq', 'median_ms': ms} for name, ms in medians.items()}}
+
+
+def test_compare_flags_regressions_against_the_baseline():
+    baseline = _results(a=10.0, b=10.0, c=10.0, gone=1.0)
+    current = _results(a=11.0, b=13.0, c=7.0, added=2.0)
+    current['results']['broken'] = {'flow': 'faq', 'error': 'RuntimeError: boom'}
+    baseline['results']['broken'] = {'flow': 'faq', 'median_ms': 5.0}
+    rows = {name: (ratio, status) for name, _, _, ratio, status in benchmarks.compare(current, baseline)}
+    assert rows == {
+        'a': (1.1, 'ok'), 'b': (1.3, 'slower'), 'c': (0.7, 'faster'),
+        'gone': (None, 'missing'), 'broken': (None, 'missing'), 'added': (None, 'new'),
+    }
+
+
+def test_run_selects_by_flow_or_name_and_summarizes(django_setup, monkeypatch):
+    monkeypatch.setenv('SMTP_HOST', 'smtp.example.com')
+    monkeypatch.delenv('SMTP_PORT', raising=False)
+    result = benchmarks.run(only=['bm25_index_build', 'schedule'], repeat=3, warmup=1, log=lambda line: None)
+    assert set(result['results']) == {'faq.bm25_index_build', 'schedule.schedule_free_slots_on_date',
+                                      'schedule.assign_300_candidates_400_slots'}
+    for stats in result['results'].values():
+        assert 'error' not in stats, stats
+        assert stats['min_ms'] <= stats['median_ms'] <= stats['p95_ms']
+    # Benchmarks with their own repeat count keep it
+    assert result['results']['faq.bm25_index_build']['n'] == 3
+    assert result['meta']['llm_mode'] == 'replay'
+    # The mail settings pointed at the benchmark's SMTP sink are put back
+    assert os.environ['SMTP_HOST'] == 'smtp.example.com' and 'SMTP_PORT' not in os.environ
+
+
+def test_p95_is_the_nearest_rank_percentile():
+    stats = benchmarks._summarize([float(ms) for ms in range(1, 21)])
+    assert stats['p95_ms'] == 19.0 and stats['median_ms'] == 10.5
@@ -0,0 +1,51 @@
+from HRAgentUI.bm25 import SYNONYM_WEIGHT, BM25Index, expand_query, stem, tokenize
+from HRAgentUI.faq_fallback import NOT_FOUND_ANSWER, extractive_answer
+
+PASSAGES = [
+    {'section': 'Dress code', 'text': 'Employees should wear business casual clothing in the office.'},
+    {'section': 'Remote work', 'text': 'Staff may telecommute two days a week with manager approval.'},
+    {'section': 'Leave', 'text': 'Full-time staff accrue vacation leave monthly. Leave requests go to HR.'},
+    {'section': 'Cell phones', 'text': 'Keep phones silent in meetings.'},
+]
+
+
+def test_tokenize_drops_stopwords_and_stems():
+    assert tokenize('The phones are ringing’s') == ['phone', 'ring']
+    assert stem('phones') == stem('phone')
+    assert stem('boxes') == 'box'
+    assert stem('policies') == 'policy'
+    assert stem('dated') == 'dat' and stem('dating') == 'dat'
+    assert stem('bus') == 'bus'
+
+
+def test_synonyms_are_weighted_below_query_terms():
+    weights = expand_query('WFH policy')
+    assert weights['wfh'] == 1.0
+    assert weights['remote'] == weights['telecommute'] == SYNONYM_WEIGHT
+    assert 'policy' not in weights
+    # A synonym that is also typed by the user keeps the full weight
+    assert expand_query('pto leave')['leave'] == 1.0
+
+
+def test_search_ranks_by_bm25_and_indexes_section_titles():
+    index = BM25Index(PASSAGES)
+    assert index.search('dress code')[0][1]['section'] == 'Dress code'
+    assert index.search('wfh')[0][1]['section'] == 'Remote work'
+    leave = index.search('leave', limit=5)
+    assert [p['section'] for _, p in leave] == ['Leave']
+    assert index.search('quantum chromodynamics') == []
+    scores = [score for score, _ in index.search('phone leave office', limit=5)]
+    assert scores == sorted(scores, reverse=True) and len(scores) == 3
+
+
+def test_policy_document_search(policy_doc):
+    index = BM25Index.from_docx(policy_doc)
+    assert index.search('dress code')[0][1]['section'] == 'Dress code'
+    assert index.search('dating a coworker')[0][1]['section'] == 'Fraternization'
+
+
+def test_extractive_answer_quotes_sections_or_defers_to_hr():
+    answer = extractive_answer('What is the dress code?')
+    assert answer.startswith('Our company policy states that:')
+    assert '(Dress code)' in answer
+    assert extractive_answer('quantum chromodynamics') == NOT_FOUND_ANSWER
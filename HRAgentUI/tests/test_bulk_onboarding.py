@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from HRAgentUI import bulk_onboarding, role_packs
+from HRAgentUI.bulk_onboarding import read_roster, run_bulk_onboarding
+from HRAgentUI.mail_transport import MailPool, SMTPConfig
+from HRAgentUI.role_packs import RolePackStore
+from HRAgentUI.smtp_sink import SMTPSink
+
+ROSTER = 'Name,Job Role,Email,Code of Conduct\nAda,Engineer,ada@example.com,https://example.com/coc\n'
+
+
+def test_roster_path_with_a_comma_is_read_as_a_file(tmp_path):
+    path = tmp_path / 'q1,2026.csv'
+    path.write_text(ROSTER)
+    assert read_roster(str(path)) == [
+        {'name': 'Ada', 'role': 'Engineer', 'email': 'ada@example.com', 'code_of_conduct': 'https://example.com/coc'},
+    ]
+
+
+def test_roster_text_and_file_objects():
+    assert read_roster(ROSTER)[0]['name'] == 'Ada'
+    assert read_roster(SimpleUploadedFile('r.csv', ROSTER.encode('utf-8-sig')))[0]['role'] == 'Engineer'
+
+
+def test_missing_roster_path_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_roster(str(tmp_path / 'missing,roster.csv'))
+
+
+@pytest.mark.parametrize('value', ['four', '0', '-2', ''])
+def test_bulk_onboarding_rejects_bad_concurrency(client, value):
+    roster = SimpleUploadedFile('roster.csv', ROSTER.encode())
+    response = client.post('/onboarding-bulk/', {'roster': roster, 'concurrency': value, 'dryRun': '1'})
+    assert response.status_code == 400
+    assert 'concurrency' in response.json()['message']
+
+
+HIRES = [
+    {'name': 'Ada', 'role': 'Engineer', 'email': 'ada@example.com', 'code_of_conduct': ''},
+    {'name': 'Bob', 'role': 'engineer ', 'email': 'bob@example.com', 'code_of_conduct': ''},
+    {'name': 'Cy', 'role': 'Designer', 'email': 'cy@example.com', 'code_of_conduct': ''},
+    {'name': 'Dee', 'role': 'Analyst', 'email': 'dee@example.com', 'code_of_conduct': ''},
+    {'name': 'Eve', 'role': 'Designer', 'email': '', 'code_of_conduct': ''},
+    {'name': 'Fay', 'role': 'Engineer', 'email': 'fay@example.com', 'code_of_conduct': ''},
+]
+
+
+@pytest.fixture
+def onboarding(tmp_path, monkeypatch):
+    """Stubbed research and greetings, a fresh role pack store and a pool on an SMTP sink."""
+    monkeypatch.setenv('ROLE_PACKS_FILE', str(tmp_path / 'no-roles.txt'))
+    monkeypatch.setattr(role_packs, '_store', RolePackStore(tmp_path / 'packs.sqlite3'))
+    calls = {'research': [], 'personalize': [], 'send_many': 0}
+    lock = threading.Lock()
+
+    def research_role(role):
+        with lock:
+            calls['research'].append(role)
+        if role == 'Analyst':
+            raise RuntimeError('search quota exceeded')
+        return f'research for {role}'
+
+    def personalize(hire, research):
+        with lock:
+            calls['personalize'].append(hire['name'])
+        if hire['name'] == 'Fay':
+            raise RuntimeError('model timed out')
+        return f"Hello {hire['name']}: {research}"
+
+    monkeypatch.setattr(bulk_onboarding, 'research_role', research_role)
+    monkeypatch.setattr(bulk_onboarding, 'personalize', personalize)
+    with SMTPSink() as sink:
+        pool = MailPool(SMTPConfig(host=sink.host, port=sink.port, use_ssl=False), size=2)
+        send_many = pool.send_many
+
+        def counted(messages):
+            calls['send_many'] += 1
+            return send_many(messages)
+
+        monkeypatch.setattr(pool, 'send_many', counted)
+        monkeypatch.setattr(bulk_onboarding, 'get_mail_pool', lambda: pool)
+        yield calls, pool, sink
+        pool.close()
+
+
+def test_each_role_is_researched_once_and_mail_shares_one_session(onboarding):
+    calls, pool, sink = onboarding
+    report = run_bulk_onboarding(HIRES, concurrency=3, sender='hr@example.com')
+
+    assert sorted(calls['research']) == ['Analyst', 'Designer', 'Engineer']
+    assert report['roles_researched'] == 3
+    assert calls['send_many'] == 1 and pool.stats['connects'] == 1
+    assert sink.messages == pool.stats['sent'] == 3
+    assert (report['total'], report['succeeded'], report['failed']) == (6, 3, 3)
+
+
+def test_every_row_gets_its_own_status(onboarding):
+    calls, _, _ = onboarding
+    seen = []
+    report = run_bulk_onboarding(HIRES, concurrency=2, sender='hr@example.com', progress=seen.append)
+    statuses = {row['name']: (row['status'], row['error']) for row in report['rows']}
+    assert statuses == {
+        'Ada': ('sent', None),
+        'Bob': ('sent', None),
+        'Cy': ('sent', None),
+        'Dee': ('failed', 'Role research failed: search quota exceeded'),
+        'Eve': ('failed', 'Missing email'),
+        'Fay': ('failed', 'Generation failed: model timed out'),
+    }
+    assert [row['row'] for row in report['rows']] == [1, 2, 3, 4, 5, 6]
+    assert sorted(entry['name'] for entry in seen) == sorted(statuses)
+    # Failed research never reaches the greeting step
+    assert 'Dee' not in calls['personalize']
+
+
+def test_dry_run_generates_without_sending(onboarding):
+    calls, pool, sink = onboarding
+    report = run_bulk_onboarding(HIRES[:3], send=False)
+    assert [row['status'] for row in report['rows']] == ['generated'] * 3
+    assert calls['send_many'] == 0 and sink.messages == 0
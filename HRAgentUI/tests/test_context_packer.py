@@ -0,0 +1,48 @@
+from HRAgentUI.context_builder import count_tokens
+from HRAgentUI.context_packer import ContextBudget, context_budget, current_budget, format_passage, pack
+
+GIFTS = ('Employees may not accept gifts worth more than fifty dollars from vendors. '
+         'Gifts above that value must be reported to the compliance team within five days. '
+         'Hospitality such as meals or event tickets counts towards the same limit over a calendar year. '
+         'Cash, vouchers and personal loans are never acceptable, whatever their value or occasion.')
+TRAVEL = 'Travel must be booked through the company portal. Economy class is required for flights under six hours.'
+DRESS = 'Business casual dress is expected in the office. Jeans are allowed on Fridays.'
+
+
+def test_duplicates_are_dropped_and_ranked_by_score():
+    passages = [{'text': TRAVEL, 'score': 0.2}, {'text': GIFTS, 'score': 0.9}, {'text': GIFTS, 'score': 0.5}]
+    kept, stats = pack(passages, 1000)
+    assert [p['text'] for p in kept] == [GIFTS, TRAVEL]
+    assert stats['duplicates'] == 1 and stats['kept'] == 2
+    assert stats['tokens'] == sum(count_tokens(format_passage(p)) for p in kept)
+
+
+def test_query_overlap_ranks_unscored_passages():
+    kept, _ = pack([{'text': DRESS}, {'text': TRAVEL}, {'text': GIFTS}], 1000, query='can I accept a gift from a vendor')
+    assert kept[0]['text'] == GIFTS
+
+
+def test_first_passage_that_does_not_fit_is_compressed():
+    budget = count_tokens(TRAVEL) + count_tokens(GIFTS) * 3 // 4
+    kept, stats = pack([{'text': TRAVEL, 'score': 1}, {'text': GIFTS, 'score': 0.5}],
+                       budget, query='gifts reported compliance')
+    assert stats['tokens'] <= budget
+    assert kept[1]['trimmed'] and 'reported to the compliance team' in kept[1]['text']
+    assert kept[1]['text'] != GIFTS
+
+
+def test_limit_counts_the_rest_as_dropped():
+    kept, stats = pack([{'text': GIFTS}, {'text': TRAVEL}, {'text': DRESS}], 1000, limit=1)
+    assert len(kept) == 1 and stats['dropped'] == 2
+
+
+def test_budget_is_shared_within_a_request_and_reported():
+    with context_budget('process_form', budget=80) as budget:
+        assert current_budget() is budget
+        budget.charge('Answer from the policy.')
+        first = budget.pack([{'text': GIFTS}])
+        second = budget.pack([{'text': TRAVEL}, {'text': DRESS}])
+        assert budget.tokens <= 80 and first
+        assert budget.stats['kept'] == len(first) + len(second)
+    assert current_budget() is None
+    assert ContextBudget('process_form', budget=10).remaining == 10
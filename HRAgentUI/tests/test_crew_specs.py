@@ -0,0 +1,22 @@
+from HRAgentUI.crew_specs import FAQ_AGENT, FAQ_TASK, NOTES_TASK
+
+
+def test_each_run_gets_its_own_agent_sharing_the_prototype_llm():
+    first, second = FAQ_AGENT.build(tools=[]), FAQ_AGENT.build()
+    prototype = FAQ_AGENT.prototype()
+    assert FAQ_AGENT.prototype() is prototype
+    assert first is not second and first.id != second.id != prototype.id
+    assert first.llm is second.llm is prototype.llm
+    assert first.role == prototype.role and first.tools == []
+    first.tools_results.append({'tool': 'search'})
+    assert second.tools_results == [] and prototype.tools_results == []
+
+
+def test_task_template_fills_in_the_request_values():
+    agent = FAQ_AGENT.build()
+    task = FAQ_TASK.build(agent, question='Can I work from home?')
+    assert task.description.endswith('Question: Can I work from home?')
+    assert task.agent is agent
+    assert task.expected_output == FAQ_TASK.expected_output
+    notes = NOTES_TASK.build(agent, tools=[], candidate_name='John', source='Notes: strong in SQL')
+    assert 'Candidate Name: John' in notes.description and notes.tools == []
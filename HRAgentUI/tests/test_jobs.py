@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from HRAgentUI.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue, JobStore, own_identity, process_identity
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(tmp_path / 'jobs.sqlite3')
+
+
+def _owned_by(store, job_id, pid, owner):
+    with store._conn() as conn:
+        conn.execute('UPDATE jobs SET pid = ?, owner = ?, state = ? WHERE id = ?', (pid, owner, RUNNING, job_id))
+
+
+def test_job_runs_and_reports_its_result(store):
+    queue = JobQueue(workers=1, store=store)
+    job_id = queue.submit('test', lambda: {'sent': 3})
+    for _ in range(100):
+        job = queue.status(job_id)
+        if job['state'] not in (QUEUED, RUNNING):
+            break
+        time.sleep(0.02)
+    assert job['state'] == SUCCEEDED and job['result'] == {'sent': 3}
+    assert 'pid' not in job and 'owner' not in job
+
+
+def test_result_that_is_not_json_fails_the_job(store):
+    queue = JobQueue(workers=1, store=store)
+    job_id = queue.submit('test', lambda: {'sent': object()})
+    for _ in range(100):
+        job = queue.status(job_id)
+        if job['state'] not in (QUEUED, RUNNING):
+            break
+        time.sleep(0.02)
+    assert job['state'] == FAILED
+    assert 'not JSON serializable' in job['error']
+
+
+def test_identity_includes_the_start_time():
+    identity = own_identity()
+    assert identity == process_identity(os.getpid())
+    if os.path.isdir('/proc/self'):
+        assert identity.split(':')[1] == str(os.getpid()) and identity.count(':') == 2
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self'), reason='needs /proc')
+def test_recover_orphans_sees_through_reused_pids(store):
+    child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    try:
+        live, dead, reused, mine = (store.create('test', {}) for _ in range(4))
+        _owned_by(store, live, child.pid, process_identity(child.pid))
+        _owned_by(store, dead, 2 ** 22 + 1, f'boot:{2 ** 22 + 1}:1')
+        # Same pid as a running process, but a different process started with it
+        _owned_by(store, reused, child.pid, f'boot:{child.pid}:1')
+        _owned_by(store, mine, os.getpid(), own_identity())
+
+        store.recover_orphans()
+        assert store.get(live)['state'] == RUNNING
+        assert store.get(mine)['state'] == RUNNING
+        assert store.get(dead)['state'] == FAILED
+        assert store.get(reused)['state'] == FAILED
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_old_rows_without_an_owner_fall_back_to_the_pid(store):
+    job_id = store.create('test', {})
+    _owned_by(store, job_id, 2 ** 22 + 1, None)
+    store.recover_orphans()
+    assert store.get(job_id)['state'] == FAILED
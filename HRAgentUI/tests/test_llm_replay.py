@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from HRAgentUI import llm_replay
+from HRAgentUI.llm import complete
+
+PROMPT = [{'role': 'system', 'content': 'You are an HR assistant.'},
+          {'role': 'user', 'content': 'How many vacation days do new hires get?'}]
+
+
+@pytest.fixture
+def cassette(tmp_path, monkeypatch):
+    path = tmp_path / 'llm.jsonl'
+    monkeypatch.setenv('LLM_CASSETTE', str(path))
+    monkeypatch.delenv('LLM_REPLAY_STRICT', raising=False)
+    return path
+
+
+def test_recorded_completion_is_replayed_from_a_fresh_cassette(cassette):
+    llm_replay.record_completion(PROMPT, 'Fifteen days.', 0.42, model='test-model')
+    entry = json.loads(cassette.read_text().splitlines()[0])
+    assert entry['kind'] == 'llm' and entry['latency'] == 0.42 and entry['model'] == 'test-model'
+
+    # A new process reads the file back in
+    reloaded = llm_replay.Cassette(str(cassette))
+    key, loose_key = llm_replay.message_keys(PROMPT)
+    assert reloaded.lookup(key, loose_key)['response'] == 'Fifteen days.'
+    assert complete(PROMPT) == 'Fifteen days.'
+
+
+def test_loose_key_matches_when_only_the_system_prompt_changed(cassette):
+    llm_replay.record_completion(PROMPT, 'Fifteen days.', 0.1)
+    changed = [dict(PROMPT[0], content='You are a different persona.'), PROMPT[1]]
+    text, entry = llm_replay.replay_completion(changed)
+    assert text == 'Fifteen days.'
+    assert llm_replay.get_cassette().stats['loose_hits'] == 1
+
+
+def test_miss_is_synthesized_deterministically_or_raises_when_strict(cassette, monkeypatch):
+    first, entry = llm_replay.replay_completion(PROMPT)
+    assert entry is None
+    assert first == llm_replay.replay_completion(PROMPT)[0]
+    assert first.startswith('Offline response')
+    agent = [{'role': 'user', 'content': 'Use the format ... Final Answer: the answer'}]
+    assert 'Final Answer:' in llm_replay.synthetic_response(agent)
+
+    monkeypatch.setenv('LLM_REPLAY_STRICT', '1')
+    with pytest.raises(llm_replay.CassetteMiss):
+        llm_replay.replay_completion(PROMPT)
+    with pytest.raises(llm_replay.CassetteMiss):
+        llm_replay.replay_tool_result('search_policy', {'query': 'pto'})
+
+
+def test_tool_results_are_keyed_by_name_and_arguments(cassette):
+    llm_replay.record_tool_result('web_search', {'query': 'pto'}, 'result text', 0.2)
+    assert llm_replay.replay_tool_result('web_search', {'query': 'pto'})['response'] == 'result text'
+    assert llm_replay.replay_tool_result('web_search', {'query': 'sick leave'}) is None
+    assert llm_replay.replay_tool_result('other_tool', {'query': 'pto'}) is None
+
+
+def test_replay_delay_and_mode_settings(monkeypatch):
+    monkeypatch.setenv('LLM_REPLAY_LATENCY', 'recorded')
+    assert llm_replay.replay_delay({'latency': 0.3}) == 0.3
+    assert llm_replay.replay_delay(None) == 0.0
+    monkeypatch.setenv('LLM_REPLAY_LATENCY', '0.05')
+    assert llm_replay.replay_delay({'latency': 0.3}) == 0.05
+    monkeypatch.setenv('LLM_MODE', 'Replay ')
+    assert llm_replay.llm_mode() == llm_replay.REPLAY
+    monkeypatch.setenv('LLM_MODE', 'offline')
+    with pytest.raises(ValueError):
+        llm_replay.llm_mode()
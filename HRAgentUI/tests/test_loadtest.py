@@ -0,0 +1,40 @@
+from collections import Counter
+
+from HRAgentUI.loadtest import _multipart, _report, percentile
+
+
+def test_nearest_rank_percentiles():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([7], 99) == 7
+    assert percentile([3, 1, 2], 0) == 1
+    assert percentile([], 50) is None
+
+
+def test_multipart_body_carries_fields_and_files():
+    body, content_type = _multipart({'candidateName': 'John'}, {'notesFile': ('john.txt', b'notes')})
+    boundary = content_type.split('boundary=')[1]
+    assert content_type.startswith('multipart/form-data; ')
+    assert body.startswith(f'--{boundary}\r\n'.encode()) and body.endswith(f'--{boundary}--\r\n'.encode())
+    assert b'name="candidateName"\r\n\r\nJohn\r\n' in body
+    assert b'name="notesFile"; filename="john.txt"\r\nContent-Type: text/plain\r\n\r\nnotes\r\n' in body
+
+
+def test_report_splits_errors_latency_and_worker_saturation_by_endpoint():
+    latencies = {'faq': [10.0, 20.0, 30.0, 40.0], 'notes': [100.0]}
+    outcomes = {'faq': Counter(ok=3, status_500=1), 'notes': Counter(ok=1)}
+    samples = {('hr_job_workers', '42'): [4, 4], ('hr_job_workers_busy', '42'): [1, 3]}
+    usage = [(0.0, 50 * 2 ** 20, 0.0), (2.0, 80 * 2 ** 20, 1.0)]
+    report = _report('http://127.0.0.1:8000', ['faq', 'notes'], 4, 2.0, latencies, outcomes, samples, usage, None)
+
+    assert (report['requests'], report['errors'], report['error_rate']) == (5, 1, 0.2)
+    assert report['throughput_rps'] == 2.5
+    assert report['endpoints']['faq']['latency_ms'] == {'p50': 20.0, 'p95': 40.0, 'p99': 40.0,
+                                                         'max': 40.0, 'mean': 25.0}
+    assert report['endpoints']['faq']['outcomes'] == {'ok': 3, 'status_500': 1}
+    assert report['endpoints']['notes']['error_rate'] == 0.0
+    assert report['saturation_by_pid']['42']['job_worker_utilization'] == 0.5
+    assert report['server'] == {'peak_rss_mb': 80.0, 'cpu_utilization': 0.5}
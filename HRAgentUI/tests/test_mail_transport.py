@@ -0,0 +1,107 @@
+import smtplib
+import threading
+
+import pytest
+
+from HRAgentUI.mail_transport import MailPool, SMTPConfig, _Session, build_message
+from HRAgentUI.smtp_sink import SMTPSink
+
+
+@pytest.fixture
+def sink():
+    with SMTPSink() as sink:
+        yield sink
+
+
+@pytest.fixture
+def pool(sink):
+    pool = MailPool(SMTPConfig(host=sink.host, port=sink.port, use_ssl=False), size=2)
+    yield pool
+    pool.close()
+
+
+def _message(to='hire@example.com'):
+    return build_message('hr@example.com', to, 'Welcome', 'Hello')
+
+
+def test_sends_reuse_one_session(pool, sink):
+    for _ in range(3):
+        pool.send(_message())
+    assert pool.stats['connects'] == 1 and pool.stats['sent'] == 3
+    assert sink.messages == 3
+
+
+def test_keepalive_check_counts_against_the_pool_size(pool, monkeypatch):
+    with pool.session(), pool.session():
+        pass
+    assert pool._idle.qsize() == 2 and pool.stats['connects'] == 2
+
+    checking, release = threading.Event(), threading.Event()
+
+    def slow_healthy(session):
+        # Only the keepalive check is slow; borrowers check sessions too
+        if threading.current_thread() is checker:
+            checking.set()
+            release.wait(5)
+        return True
+    monkeypatch.setattr(pool, '_healthy', slow_healthy)
+    checker = threading.Thread(target=pool.check_idle)
+    checker.start()
+    assert checking.wait(5)
+
+    # One session is under check: a borrower takes the other, a second one waits
+    borrowed = threading.Event()
+
+    def borrow():
+        with pool.session():
+            borrowed.set()
+    with pool.session():
+        waiting = threading.Thread(target=borrow)
+        waiting.start()
+        assert not borrowed.wait(0.2)
+        release.set()
+        checker.join(5)
+    waiting.join(5)
+    assert borrowed.is_set()
+    assert pool.stats['connects'] == 2 and pool._idle.qsize() == 2
+
+
+class _RejectingSMTP:
+    def __init__(self):
+        self.quit_called = False
+
+    def send_message(self, msg, from_addr=None, to_addrs=None):
+        if 'bad' in msg['To']:
+            raise smtplib.SMTPRecipientsRefused({msg['To']: (550, b'No such user')})
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_recipient_rejection_keeps_the_session(monkeypatch):
+    smtp = _RejectingSMTP()
+    pool = MailPool(SMTPConfig(host='localhost', port=1, use_ssl=False), size=1)
+    monkeypatch.setattr(pool, '_connect', lambda: _Session(smtp))
+    try:
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            pool.send(_message('bad@example.com'))
+        assert not smtp.quit_called and pool._idle.qsize() == 1
+        pool.send(_message())
+        assert pool.stats['sent'] == 1
+    finally:
+        pool.close()
+
+
+def test_dropped_connection_closes_the_session(pool, monkeypatch):
+    pool.send(_message())
+    session = pool._idle.get_nowait()
+    pool._idle.put(session)
+    monkeypatch.setattr(session.smtp, 'send_message',
+                        lambda *a, **k: (_ for _ in ()).throw(smtplib.SMTPServerDisconnected('gone')))
+    pool.send(_message())
+    assert pool.stats['reconnects'] == 1 and pool.stats['connects'] == 2
+
+
+def test_send_many_reports_each_message(pool, sink):
+    outcomes = pool.send_many([_message() for _ in range(4)])
+    assert outcomes == [None] * 4 and sink.messages == 4
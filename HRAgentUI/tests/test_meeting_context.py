@@ -0,0 +1,58 @@
+import time
+
+from HRAgentUI import meeting_context
+from HRAgentUI.context_packer import context_budget
+from HRAgentUI.meeting_context import _passages, format_context, prefetch
+
+
+def test_prefetch_inside_a_budget_leaves_packing_to_format_context(django_setup):
+    request = 'Prepare the meeting notes: what does the policy say about conflicts of interest?'
+    with context_budget('create_meeting_notes', budget=800) as budget:
+        prefetched = prefetch(request, sources=['policy', 'schedule'])
+        assert 'policy' in prefetched['sections'], prefetched['missing']
+        # The lookups neither packed nor charged anything
+        assert budget.tokens == 0 and budget.stats['kept'] == 0
+
+        context = format_context(prefetched, request)
+        assert 'Company policy:' in context
+        assert 0 < budget.tokens <= 800
+
+    # Every prefetched passage went through the packer exactly once
+    passages = sum(len([p for p in _passages(name, text) if p.strip()])
+                   for name, (_, text) in prefetched['sections'].items())
+    assert budget.stats['kept'] + budget.stats['dropped'] + budget.stats['duplicates'] == passages
+
+
+def test_lookups_run_concurrently_and_failures_are_listed(monkeypatch):
+    def slow(request):
+        time.sleep(0.2)
+        return 'slow result'
+
+    def broken(request):
+        raise RuntimeError('search quota exceeded')
+
+    monkeypatch.setattr(meeting_context, 'SOURCES', [
+        ('a', 'A', slow), ('b', 'B', slow), ('web', 'Web search', broken), ('empty', 'Empty', lambda r: None),
+    ])
+    prefetched = prefetch('anything', timeout=5)
+    assert prefetched['sections'] == {'a': ('A', 'slow result'), 'b': ('B', 'slow result')}
+    assert prefetched['missing'] == {'web': 'search quota exceeded'}
+    assert prefetched['seconds'] < 0.35
+
+    monkeypatch.setattr(meeting_context, 'SOURCES', [('a', 'A', slow), ('b', 'B', lambda r: 'fast')])
+    prefetched = prefetch('anything', timeout=0.05)
+    assert prefetched['sections'] == {'b': ('B', 'fast')}
+    assert prefetched['missing'] == {'a': 'timed out'}
+
+
+def test_schedule_lookup_answers_the_days_and_times_in_the_request(tmp_path, monkeypatch):
+    path = tmp_path / 'interview_data.csv'
+    path.write_text('05-21,3:00 PM\n05-21,4:00 PM\n05-22,9:00 AM\n')
+    monkeypatch.setenv('INTERVIEW_CSV_PATH', str(path))
+    monkeypatch.setenv('SCHEDULE_YEAR', '2026')
+    text = prefetch('Can we meet 05-21 at 3:30 PM, or on 5/23?', sources=['schedule'])['sections']['schedule'][1]
+    assert text.splitlines() == [
+        'A meeting at 05-21 3:30 PM overlaps: Thu 05-21 3:00 PM - 4:00 PM, Thu 05-21 4:00 PM - 5:00 PM',
+        'Open slots on 05-21: Thu 05-21 3:00 PM - 4:00 PM, Thu 05-21 4:00 PM - 5:00 PM',
+        'Open slots on 05-23: none',
+    ]
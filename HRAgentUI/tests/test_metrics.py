@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from HRAgentUI.metrics import REQUESTS, REQUESTS_IN_FLIGHT, STAGE_ERRORS, STAGE_SECONDS, Registry, stage
+
+
+def test_render_counters_and_histograms_in_prometheus_text_format():
+    registry = Registry()
+    counter = registry.counter('t_total', 'Things.', ('kind',))
+    histogram = registry.histogram('t_seconds', 'Time.', ('kind',), buckets=(0.1, 1))
+    counter.inc(kind='a "quoted"\nname')
+    counter.inc(2.5, kind='b')
+    histogram.observe(0.05, kind='a')
+    histogram.observe(0.5, kind='a')
+    histogram.observe(5, kind='a')
+    assert registry.render().splitlines() == [
+        '# HELP t_total Things.',
+        '# TYPE t_total counter',
+        't_total{kind="a \\"quoted\\"\\nname"} 1',
+        't_total{kind="b"} 2.5',
+        '# HELP t_seconds Time.',
+        '# TYPE t_seconds histogram',
+        't_seconds_bucket{kind="a",le="0.1"} 1',
+        't_seconds_bucket{kind="a",le="1"} 2',
+        't_seconds_bucket{kind="a",le="+Inf"} 3',
+        't_seconds_sum{kind="a"} 5.55',
+        't_seconds_count{kind="a"} 3',
+    ]
+
+
+def test_labels_must_match_the_declared_names():
+    counter = Registry().counter('t_total', 'Things.', ('kind',))
+    with pytest.raises(ValueError):
+        counter.inc(other='x')
+    with pytest.raises(ValueError):
+        counter.inc()
+
+
+def test_stage_times_the_block_and_counts_errors():
+    before = STAGE_SECONDS.count(stage='test', name='boom')
+    with pytest.raises(RuntimeError):
+        with stage('test', 'boom'):
+            raise RuntimeError
+    with stage('test', 'boom'):
+        pass
+    assert STAGE_SECONDS.count(stage='test', name='boom') == before + 2
+    assert STAGE_ERRORS.value(stage='test', name='boom') == 1
+
+
+def test_requests_are_counted_by_view_and_served_on_metrics(client):
+    labels = dict(view='metrics', method='GET', status='200')
+    before = REQUESTS.value(**labels)
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    body = response.content.decode()
+    assert '# TYPE hr_request_duration_seconds histogram' in body
+    assert REQUESTS.value(**labels) == before + 1
+    assert REQUESTS_IN_FLIGHT.value(pid=os.getpid()) == 0
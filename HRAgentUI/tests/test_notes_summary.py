@@ -0,0 +1,72 @@
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from HRAgentUI.context_packer import ContextBudget
+from HRAgentUI.notes_summary import notes_chunks, notes_context
+
+from conftest import PROJECT_DIR
+
+FILLER = 'The candidate arrived at the office and the meeting room was booked for the afternoon session.'
+COUNT_BEFORE_LITELLM = """
+from HRAgentUI.context_builder import count_tokens
+text = 'Candidate notes: strong SQL, weak on stakeholder management.'
+before = count_tokens(text)
+from litellm.litellm_core_utils.default_encoding import encoding
+print(before == len(encoding.encode(text)))
+"""
+WORDS = 'parking lobby coffee weather badge elevator visitor desk chair window lunch schedule train'.split()
+
+
+@pytest.mark.parametrize('value', ['lots', '0'])
+def test_notes_batch_rejects_bad_concurrency(client, value):
+    notes = SimpleUploadedFile('ada_notes.txt', b'Strong Python answers.')
+    response = client.post('/summarize-notes/batch/', {'notesFiles': notes, 'concurrency': value})
+    assert response.status_code == 400
+    assert 'concurrency' in response.json()['error']
+
+
+def _filler(rng):
+    return ' '.join(rng.choice(WORDS) for _ in range(25)) + '.'
+
+
+def test_notes_that_fit_go_in_whole(tmp_path):
+    notes = tmp_path / 'ada_notes.txt'
+    notes.write_text('Strong Python skills.\n\nClear communication.\n\nStrong Python skills.\n')
+    context = notes_context(str(notes), ContextBudget('summarize_notes', budget=500))
+    assert context == 'Candidate notes (full text):\n<<<\nStrong Python skills.\n\nClear communication.\n>>>'
+
+
+def test_over_budget_notes_keep_the_chunks_that_matter_in_file_order(tmp_path, capsys):
+    rng = random.Random(1)
+    paragraphs = [_filler(rng) for _ in range(30)]
+    paragraphs.insert(3, 'Strengths: deep technical experience with SQL projects.')
+    paragraphs.append('Concerns: communication with the team was weak; recommendation is a second interview.')
+    notes = tmp_path / 'bo_notes.txt'
+    notes.write_text('\n\n'.join(paragraphs))
+
+    budget = ContextBudget('summarize_notes', budget=120)
+    context = notes_context(str(notes), budget)
+    assert context.startswith('Candidate notes (excerpts):')
+    assert budget.context <= 120
+    # Both relevant paragraphs survive, including the last one, and keep their order
+    assert context.index('Strengths:') < context.index('Concerns:')
+    assert sum(paragraph in context for paragraph in paragraphs) < 10
+    assert 'ranked for the summary' in capsys.readouterr().out
+
+
+def test_long_paragraphs_are_split_into_runs_of_lines():
+    paragraph = '\n'.join(f'{FILLER} Line {i}.' for i in range(40))
+    chunks = notes_chunks(paragraph, max_tokens=100)
+    assert len(chunks) > 1 and '\n'.join(chunks) == paragraph
+
+
+def test_tokens_are_counted_with_cl100k_before_litellm_is_imported():
+    env = {k: v for k, v in os.environ.items() if k != 'TIKTOKEN_CACHE_DIR'}
+    out = subprocess.run([sys.executable, '-c', COUNT_BEFORE_LITELLM], cwd=PROJECT_DIR, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip().splitlines()[-1] == 'True'
@@ -0,0 +1,28 @@
+from conftest import PROJECT_DIR, REPO_ROOT
+from HRAgentUI import policy_index
+
+
+def test_index_is_saved_and_reloaded(policy_doc, tmp_path, monkeypatch):
+    monkeypatch.setenv('HR_DATA_DIR', str(tmp_path))
+    built = policy_index.load_or_build(policy_doc)
+    path = policy_index.index_dir(policy_doc)
+    assert path.parent == tmp_path / 'policy_index'
+    assert built.doc_sha256[:16] in path.name
+
+    loaded = policy_index.load_or_build(policy_doc)
+    assert loaded.manifest == built.manifest
+    assert loaded.chunks == built.chunks
+    assert loaded.search('dress code', limit=2)
+
+
+def test_docker_build_copies_files_the_root_context_sends():
+    # The image is built from the repository root; every COPY source must exist
+    # and be let through by .dockerignore, which excludes everything else
+    allowed = [line[1:].rstrip('/') for line in (REPO_ROOT / '.dockerignore').read_text().splitlines()
+               if line.startswith('!')]
+    copies = [line.split()[1] for line in (PROJECT_DIR / 'Dockerfile').read_text().splitlines()
+              if line.startswith('COPY ')]
+    assert 'docs/Employee-Code-of-Conduct.docx' in copies
+    for source in copies:
+        assert (REPO_ROOT / source).exists(), source
+        assert any(source.rstrip('/') == a or source.startswith(a + '/') for a in allowed), source
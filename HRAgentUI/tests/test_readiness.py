@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from HRAgentUI import views
+from HRAgentUI.readiness import FAILED, PENDING, READY, SKIPPED, Readiness, _llm_connection
+
+
+def _wait(readiness):
+    readiness.start()._thread.join(timeout=5)
+    return readiness.snapshot()
+
+
+def _fail():
+    raise RuntimeError('no route to host')
+
+
+def test_failed_optional_components_do_not_hold_readiness_back():
+    snapshot = _wait(Readiness([
+        ('index', lambda: {'passages': 3}, True),
+        ('smtp', _fail, False),
+        ('llm_connection', lambda: SKIPPED, False),
+    ]))
+    components = snapshot['components']
+    assert snapshot['ready'] is True
+    assert components['index']['state'] == READY and components['index']['passages'] == 3
+    assert components['smtp']['state'] == FAILED
+    assert components['smtp']['error'] == 'RuntimeError: no route to host'
+    assert components['llm_connection']['state'] == SKIPPED
+
+
+def test_failed_required_component_keeps_the_process_unready():
+    snapshot = _wait(Readiness([('index', _fail, True), ('probe', lambda: None, True)]))
+    assert snapshot['ready'] is False
+    assert snapshot['components']['probe']['state'] == READY
+
+
+def test_ready_endpoint_answers_503_until_warm(client, monkeypatch):
+    release = threading.Event()
+    readiness = Readiness([('index', release.wait, True)])
+    monkeypatch.setattr(views, 'readiness', readiness)
+
+    response = client.get('/ready')
+    assert response.status_code == 503
+    assert response.json()['components']['index']['state'] in (PENDING, 'running')
+
+    release.set()
+    readiness._thread.join(timeout=5)
+    response = client.get('/ready')
+    assert response.status_code == 200
+    assert response.json()['ready'] is True
+
+
+def test_llm_warm_up_is_off_unless_asked_for(monkeypatch):
+    monkeypatch.delenv('WARM_UP_LLM', raising=False)
+    monkeypatch.setattr('HRAgentUI.llm.complete', lambda *a, **k: pytest.fail('billed completion sent'))
+    assert _llm_connection() == SKIPPED
+    monkeypatch.setenv('WARM_UP_LLM', '0')
+    assert _llm_connection() == SKIPPED
+    sent = []
+    monkeypatch.setattr('HRAgentUI.llm.complete', lambda *a, **k: sent.append(k))
+    monkeypatch.setenv('WARM_UP_LLM', '1')
+    assert _llm_connection() is None and sent == [{'max_tokens': 1}]
@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from conftest import PROJECT_DIR
+from HRAgentUI import role_packs
+from HRAgentUI.role_packs import RolePackStore, refresh_packs, role_pack
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    roles = tmp_path / 'roles.txt'
+    roles.write_text('Data Analyst\n')
+    monkeypatch.setenv('ROLE_PACKS_FILE', str(roles))
+    store = RolePackStore(tmp_path / 'packs.sqlite3')
+    monkeypatch.setattr(role_packs, '_store', store)
+    researched = []
+
+    def research_role(role):
+        researched.append(role)
+        return f'research for {role}'
+
+    monkeypatch.setattr('HRAgentUI.bulk_onboarding.research_role', research_role)
+    store.researched = researched
+    return store
+
+
+def _age(store, role, days):
+    with store._conn() as conn:
+        conn.execute('UPDATE packs SET created = ? WHERE role_key = ?', (time.time() - days * 86400, role.casefold()))
+
+
+def test_refresh_researches_listed_roles_and_expires_stale_one_off_packs(store):
+    store.put('Chef', 'old chef research')
+    store.put('Pilot', 'pilot research')
+    _age(store, 'Chef', 60)
+
+    report = refresh_packs(log=lambda *a: None)
+    assert report == {'Chef': 'expired', 'Data Analyst': 'refreshed'}
+    assert store.get('Chef') is None and store.get('Pilot')['research'] == 'pilot research'
+    assert store.researched == ['Data Analyst']
+
+
+def test_stale_one_off_pack_is_not_served(store):
+    store.put('Chef', 'old chef research')
+    store.put('Data Analyst', 'old analyst research')
+    _age(store, 'Chef', 60)
+    _age(store, 'Data Analyst', 60)
+    assert role_pack('Chef') is None
+    # Listed roles keep serving their stale pack until the refresh replaces it
+    assert role_pack('Data Analyst') == 'old analyst research'
+
+
+def test_pack_being_researched_is_not_expired(store):
+    assert store.claim('Chef')
+    assert not store.expire('Chef')
+
+
+def test_empty_role_list_is_reported(store, monkeypatch, tmp_path):
+    monkeypatch.setenv('ROLE_PACKS_FILE', str(tmp_path / 'missing.txt'))
+    logged = []
+    assert refresh_packs(log=logged.append) == {}
+    assert logged == [f"Warning: no roles listed in {tmp_path / 'missing.txt'}; no role packs will be precomputed"]
+    assert store.researched == []
+
+
+def test_docker_image_ships_the_role_list():
+    dockerfile = (PROJECT_DIR / 'Dockerfile').read_text()
+    assert 'COPY research_roles.txt /code/research_roles.txt' in dockerfile
+    assert 'ENV ROLE_PACKS_FILE=/code/research_roles.txt' in dockerfile
+    assert role_packs.configured_roles()
+
+
+def test_store_path_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv('ROLE_PACKS_DB', str(tmp_path / 'volume.sqlite3'))
+    assert RolePackStore().path == str(tmp_path / 'volume.sqlite3')
+
+
+def test_refresher_is_off_unless_enabled(monkeypatch):
+    monkeypatch.setattr(role_packs, 'REFRESH_ENABLED', False)
+    monkeypatch.setattr(role_packs, '_refresher', None)
+    role_packs.start_refresher()
+    assert role_packs._refresher is None
+
+
+def test_one_process_holds_the_refresh_lock(store):
+    first = role_packs.take_refresh_lock()
+    assert first
+    # flock locks are per open file, so a second open stands in for another worker
+    assert role_packs.take_refresh_lock() is None
+    first.close()
+    second = role_packs.take_refresh_lock()
+    assert second
+    second.close()
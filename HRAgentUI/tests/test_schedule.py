@@ -0,0 +1,91 @@
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from HRAgentUI.schedule import ScheduleFile, ScheduleIndex, Slot, parse_day, parse_rows, parse_time
+
+YEAR = 2026
+
+
+def _at(day, hour, minute=0):
+    return datetime(YEAR, 5, day, hour, minute)
+
+
+def test_parse_day_and_time_formats():
+    assert parse_day('05-22', YEAR) == date(YEAR, 5, 22)
+    assert parse_day('2025-05-22', YEAR) == date(2025, 5, 22)
+    assert parse_time('05-21 3:00 PM', YEAR) == _at(21, 15)
+    assert parse_time('05-21,3:00 PM', YEAR) == _at(21, 15)
+    assert parse_time('05-21 3:00pm', YEAR) == _at(21, 15)
+    assert parse_time('05-21 3 PM', YEAR) == _at(21, 15)
+    assert parse_time('2025-05-21 15:00') == datetime(2025, 5, 21, 15)
+    with pytest.raises(ValueError):
+        parse_time('05-21 teatime', YEAR)
+
+
+def test_parse_rows_lengths_and_skipped_rows():
+    lines = ['05-21,3:00 PM', '', '05-21,4:00 PM,30', 'not a slot', '05-22']
+    slots, skipped = parse_rows(lines, year=YEAR, minutes=45)
+    assert slots == [Slot(_at(21, 15), _at(21, 15, 45)), Slot(_at(21, 16), _at(21, 16, 30))]
+    assert skipped == 2
+
+
+@pytest.fixture
+def index():
+    return ScheduleIndex([
+        Slot(_at(22, 9), _at(22, 10)),
+        Slot(_at(21, 15), _at(21, 16)),
+        Slot(_at(21, 11), _at(21, 14)),       # long slot, starts well before the 13:00 query
+        Slot(_at(21, 15, 30), _at(21, 16)),   # double entry overlapping 15:00
+    ])
+
+
+def test_index_is_sorted_and_answers_day_queries(index):
+    assert [s.start for s in index.all()] == sorted(s.start for s in index.all())
+    assert len(index) == 4
+    assert [s.start for s in index.on_date(date(YEAR, 5, 21))] == [_at(21, 11), _at(21, 15), _at(21, 15, 30)]
+    assert index.on_date(date(YEAR, 5, 23)) == []
+
+
+def test_between_and_conflicts_include_long_slots(index):
+    assert index.between(_at(21, 13), _at(21, 13, 30)) == [Slot(_at(21, 11), _at(21, 14))]
+    # A slot ending exactly at the query start does not clash
+    assert index.between(_at(21, 14), _at(21, 15)) == []
+    assert [s.start for s in index.conflicts(_at(21, 15, 45), minutes=30)] == [_at(21, 15), _at(21, 15, 30)]
+
+
+def test_next_available_and_overlaps(index):
+    assert index.next_available(_at(21, 12)) == [Slot(_at(21, 15), _at(21, 16))]
+    assert index.next_available(_at(21, 12), minutes=60, count=5) == [
+        Slot(_at(21, 15), _at(21, 16)), Slot(_at(22, 9), _at(22, 10))]
+    assert index.overlaps() == [(Slot(_at(21, 15), _at(21, 16)), Slot(_at(21, 15, 30), _at(21, 16)))]
+
+
+def _touch(path, step):
+    # Same-size rewrites within one mtime tick would look unchanged; bump the mtime explicitly
+    stamp = os.stat(path).st_mtime_ns + step * 1_000_000_000
+    os.utime(path, ns=(stamp, stamp))
+
+
+def test_schedule_file_merges_appends_and_rereads_edits(tmp_path, monkeypatch):
+    monkeypatch.setenv('SCHEDULE_YEAR', str(YEAR))
+    path = tmp_path / 'interview_data.csv'
+    path.write_text('05-21,3:00 PM\nbogus\n')
+    schedule = ScheduleFile(path)
+    assert [s.start for s in schedule.all()] == [_at(21, 15)]
+    assert schedule.skipped == 1
+    assert schedule.refresh() is False
+
+    with open(path, 'a') as fh:
+        fh.write('05-21,10:00 AM\n')
+    _touch(path, 1)
+    assert schedule.refresh() is True
+    assert [s.start for s in schedule.all()] == [_at(21, 10), _at(21, 15)]
+    assert schedule.skipped == 1
+
+    path.write_text('05-22,9:00 AM\n')
+    _touch(path, 2)
+    assert schedule.refresh() is True
+    assert schedule.all() == [Slot(_at(22, 9), _at(22, 9) + timedelta(minutes=60))]
+    assert schedule.skipped == 0
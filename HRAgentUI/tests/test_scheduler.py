@@ -0,0 +1,139 @@
+import itertools
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from HRAgentUI.schedule import Slot
+from HRAgentUI.scheduler import Person, assign_interviews, parse_person, parse_windows
+
+DAY = datetime(2026, 5, 21, 9)
+
+
+def _slot(minutes, length=60):
+    return Slot(DAY + timedelta(minutes=minutes), DAY + timedelta(minutes=minutes + length))
+
+
+def _check(result, gap_minutes, interviewers=True):
+    """Every slot is used once and no interviewer (or the panel) has two interviews closer than the gap."""
+    taken = [(a['start'], a['end'], a['interviewer']) for a in result['assignments']]
+    assert len({(start, end) for start, end, _ in taken}) == len(taken)
+    if not (interviewers or gap_minutes):
+        return
+    gap = timedelta(minutes=gap_minutes)
+    for (s1, e1, p1), (s2, e2, p2) in itertools.combinations(taken, 2):
+        if p1 == p2:
+            assert e1 + gap <= s2 or e2 + gap <= s1
+
+
+def test_gap_applies_between_interviews_not_open_slots():
+    # The 3:30 PM slot must not block the 4:00 PM one when nobody is booked at 3:30
+    slots = [Slot(datetime(2026, 5, 21, 15, 30), datetime(2026, 5, 21, 16, 30)),
+             Slot(datetime(2026, 5, 21, 16), datetime(2026, 5, 21, 17))]
+    result = assign_interviews([parse_person('Jane: 05-21 4:00 PM-5:00 PM')], slots, gap_minutes=15)
+    assert [a['candidate'] for a in result['assignments']] == ['Jane']
+    assert result['assignments'][0]['start'] == datetime(2026, 5, 21, 16)
+    assert result['method'] == 'exact'
+
+
+def test_jane_against_the_bundled_schedule(monkeypatch):
+    monkeypatch.setenv('SCHEDULE_YEAR', '2026')
+    result = assign_interviews([parse_person('Jane: 05-21 4:00 PM-5:00 PM')], gap_minutes=15)
+    assert result['unassigned'] == []
+
+
+def test_one_interviewer_keeps_the_gap():
+    slots = [_slot(0), _slot(60), _slot(90)]
+    result = assign_interviews(['Ada', 'Bo'], slots, interviewers=[Person('Kim')], gap_minutes=15)
+    _check(result, 15)
+    assert {a['start'] for a in result['assignments']} == {DAY, DAY + timedelta(minutes=90)}
+
+
+def test_unstaffed_slots_are_reported():
+    slots = [_slot(0), _slot(24 * 60)]
+    kim = Person('Kim', parse_windows('05-21'))
+    result = assign_interviews(['Ada', 'Bo'], slots, interviewers=[kim])
+    assert len(result['assignments']) == 1 and len(result['unstaffed_slots']) == 1
+    assert result['unassigned'] == [{'candidate': 'Bo', 'reason': 'all their slots are taken'}]
+
+
+def _brute_force(candidates, slots, interviewers, gap_minutes):
+    gap = timedelta(minutes=gap_minutes)
+    seats = [(i, slot, p.name) for i, slot in enumerate(slots) for p in interviewers
+             if not p.windows or any(o <= slot.start and slot.end <= c for o, c in p.windows)]
+    choices = [[None] + [seat for seat in seats
+                         if not person.windows or any(o <= seat[1].start and seat[1].end <= c
+                                                      for o, c in person.windows)]
+               for person in candidates]
+    best = 0
+    for pick in itertools.product(*choices):
+        chosen = [seat for seat in pick if seat is not None]
+        if len(chosen) <= best or len({seat[0] for seat in chosen}) < len(chosen):
+            continue
+        if all(a[2] != b[2] or a[1].end + gap <= b[1].start or b[1].end + gap <= a[1].start
+               for a, b in itertools.combinations(chosen, 2)):
+            best = len(chosen)
+    return best
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_assignment_is_optimal_on_small_instances(seed):
+    rng = random.Random(seed)
+    slots = sorted({_slot(30 * rng.randrange(10), rng.choice([30, 45, 60])) for _ in range(5)})
+
+    def window():
+        start = DAY + timedelta(minutes=30 * rng.randrange(8))
+        return ((start, start + timedelta(minutes=30 * rng.randrange(2, 6))),)
+
+    candidates = [Person(f'C{i}', window() if rng.random() < 0.8 else ()) for i in range(4)]
+    interviewers = [Person(f'I{i}', window() if rng.random() < 0.5 else ()) for i in range(rng.randrange(1, 3))]
+    gap = rng.choice([0, 15, 30])
+
+    result = assign_interviews(candidates, slots, interviewers=interviewers, gap_minutes=gap)
+    _check(result, gap)
+    assert result['method'] == 'exact'
+    assert len(result['assignments']) == _brute_force(candidates, slots, interviewers, gap)
+
+    greedy = assign_interviews(candidates, slots, interviewers=interviewers, gap_minutes=gap, exact=False)
+    _check(greedy, gap)
+    assert greedy['method'] == 'greedy'
+
+
+def test_search_budget_keeps_the_best_schedule_found(monkeypatch):
+    from HRAgentUI import scheduler
+
+    # One panel with a 15-minute gap: the first passes place two, only the search finds three
+    slots = [_slot(60, 45), _slot(90), _slot(120, 45), _slot(150, 30), _slot(240, 30)]
+    candidates = [Person('Ada'), parse_person('Bo: 05-21 10:00 AM-12:00 PM'),
+                  parse_person('Cy: 05-21 10:30 AM-11:30 AM'), parse_person('Di: 05-21 11:30 AM-1:00 PM')]
+    monkeypatch.setattr(scheduler, 'SEARCH_MS', 0)
+    result = assign_interviews(candidates, slots, gap_minutes=15)
+    assert result['method'] == 'best found' and len(result['assignments']) == 2
+    _check(result, 15, interviewers=False)
+
+    monkeypatch.setattr(scheduler, 'SEARCH_MS', 50)
+    result = assign_interviews(candidates, slots, gap_minutes=15)
+    assert result['method'] == 'exact' and len(result['assignments']) == 3
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_single_panel_with_a_gap_is_optimal(seed):
+    rng = random.Random(seed)
+    slots = sorted({_slot(15 * rng.randrange(20), rng.choice([30, 45, 60])) for _ in range(6)})
+    candidates = [Person(f'C{i}') for i in range(rng.randrange(1, 6))]
+    gap = rng.choice([15, 30])
+    result = assign_interviews(candidates, slots, gap_minutes=gap)
+    _check(result, gap, interviewers=False)
+    assert result['method'] == 'exact'
+    assert len(result['assignments']) == _brute_force(candidates, slots, [Person('panel')], gap)
+
+
+def test_hundreds_of_candidates_on_one_panel_take_milliseconds():
+    slots = [_slot(30 * k + 24 * 60 * day, 45) for day in range(5) for k in range(20)]
+    candidates = [Person(f'C{i}', ((DAY + timedelta(days=i % 5, hours=i % 7),
+                                    DAY + timedelta(days=i % 5, hours=i % 7 + 3)),)) for i in range(400)]
+    result = assign_interviews(candidates, slots, gap_minutes=15)
+    _check(result, 15, interviewers=False)
+    # Nobody is free after 6 PM, so each day holds every other slot from 9:00 to 5:00 PM
+    assert result['method'] == 'exact' and len(result['assignments']) == 45
+    assert result['seconds'] < 0.5
@@ -0,0 +1,82 @@
+import pytest
+
+from HRAgentUI import search_cache
+from HRAgentUI.search_cache import FRESH, STALE, SearchCache, cache_key
+
+PARAMS = {'search_type': 'search', 'n_results': 10}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(search_cache.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return SearchCache(tmp_path / 'search_cache.sqlite3', ttl=100, stale=1000, max_entries=3)
+
+
+def test_key_ignores_case_spacing_and_trailing_punctuation():
+    assert cache_key('Best practices  Data Analyst?', PARAMS) == cache_key('best practices data analyst', PARAMS)
+    assert cache_key('best practices data analyst', PARAMS) != cache_key('best practices data analyst',
+                                                                          dict(PARAMS, country='de'))
+
+
+def test_entry_goes_fresh_then_stale_then_missing(cache, clock):
+    key = cache_key('pto policy', PARAMS)
+    assert cache.get(key) == (None, None)
+    cache.put(key, 'pto policy', PARAMS, {'organic': [1, 2]})
+    assert cache.get(key) == ({'organic': [1, 2]}, FRESH)
+    clock[0] += 500
+    assert cache.get(key) == ({'organic': [1, 2]}, STALE)
+    clock[0] += 1000
+    assert cache.get(key) == (None, None)
+    stats = cache.stats()
+    assert (stats['hits'], stats['fresh_hits'], stats['stale_hits'], stats['misses']) == (2, 1, 1, 2)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_one_refresh_claim_per_stale_entry(cache, clock):
+    key = cache_key('pto policy', PARAMS)
+    cache.put(key, 'pto policy', PARAMS, 'old')
+    assert cache.claim_refresh(key, seconds=60)
+    assert not cache.claim_refresh(key, seconds=60)
+    clock[0] += 61
+    assert cache.claim_refresh(key, seconds=60)
+    # Storing the new copy releases the claim
+    cache.put(key, 'pto policy', PARAMS, 'new')
+    assert cache.claim_refresh(key, seconds=60)
+
+
+def test_least_recently_used_entries_are_evicted(cache, clock):
+    keys = [cache_key(f'query {i}', PARAMS) for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        clock[0] += 1
+        cache.put(key, f'query {i}', PARAMS, i)
+    clock[0] += 1
+    cache.get(keys[0])
+    clock[0] += 1
+    cache.put(keys[3], 'query 3', PARAMS, 3)
+    assert cache.get(keys[1]) == (None, None)
+    assert [cache.get(key)[0] for key in (keys[0], keys[2], keys[3])] == [0, 2, 3]
+    assert cache.stats()['evictions'] == 1
+
+
+def test_stats_are_shared_across_instances_on_one_file(tmp_path, clock):
+    path = tmp_path / 'shared.sqlite3'
+    writer, reader = SearchCache(path, ttl=100, stale=0), SearchCache(path, ttl=100, stale=0)
+    key = cache_key('benefits', PARAMS)
+    writer.put(key, 'benefits', PARAMS, 'result')
+    assert reader.get(key) == ('result', FRESH)
+    assert writer.stats()['hits'] == 1 and writer.stats()['size'] == 1
+    reader.clear()
+    assert writer.stats()['size'] == 0
+
+
+def test_disabled_by_env(monkeypatch):
+    monkeypatch.setenv('SEARCH_CACHE', '0')
+    assert not search_cache.search_cache_enabled()
+    monkeypatch.setenv('SEARCH_CACHE', '1')
+    assert search_cache.search_cache_enabled()
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+from conftest import PROJECT_DIR
+
+BUILD_HANDLER = """
+import sys
+from django.core.asgi import get_asgi_application
+get_asgi_application()
+print('crewai' in sys.modules)
+"""
+
+
+def test_building_the_asgi_handler_does_not_import_crewai():
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='HRAgentUI.settings')
+    out = subprocess.run([sys.executable, '-c', BUILD_HANDLER], cwd=PROJECT_DIR, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip().splitlines()[-1] == 'False'
+
+
+def test_import_report_times_the_handlers_and_flags_eager_imports(monkeypatch):
+    from HRAgentUI import startup
+
+    report = startup.import_report(top=3)
+    assert report['ok'] and report['eager_imports'] == []
+    assert {'django_setup', 'urlconf', 'asgi_handler', 'wsgi_handler'} <= set(report['phases'])
+
+    monkeypatch.setattr(startup, 'STARTUP_FORBIDDEN', ('crewai', 'django'))
+    report = startup.import_report(top=3)
+    assert not report['ok'] and report['eager_imports'] == ['django']
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from HRAgentUI.aio import iterate
+
+
+def _blocking(release, log):
+    yield 'first'
+    release.wait(5)
+    log.append('released')
+    yield 'second'
+
+
+def test_iterate_yields_items_while_the_producer_is_still_running():
+    release, log = threading.Event(), []
+
+    async def consume():
+        items = iterate(_blocking(release, log))
+        first = await items.__anext__()
+        assert log == []
+        release.set()
+        return [first] + [item async for item in items]
+
+    assert asyncio.run(consume()) == ['first', 'second']
+
+
+def test_iterate_reraises_the_producer_error():
+    def failing():
+        yield 1
+        raise ValueError('boom')
+
+    async def consume():
+        return [item async for item in iterate(failing())]
+
+    with pytest.raises(ValueError, match='boom'):
+        asyncio.run(consume())
+
+
+def test_notes_batch_streams_each_result_before_the_batch_ends(async_client, monkeypatch):
+    from HRAgentUI import views
+
+    release = threading.Event()
+
+    def summarize_batch(files, concurrency):
+        yield {'file': files[0][0], 'summary': 'Strong'}
+        release.wait(5)
+        yield {'file': files[1][0], 'summary': 'Solid'}
+
+    monkeypatch.setattr(views, 'summarize_batch', summarize_batch)
+
+    async def request():
+        files = [SimpleUploadedFile('ada.txt', b'a'), SimpleUploadedFile('bo.txt', b'b')]
+        response = await async_client.post('/summarize-notes/batch/', {'notesFiles': files})
+        chunks = response.streaming_content
+        assert (await chunks.__anext__()).startswith(b'event: start')
+        first = await chunks.__anext__()
+        assert b'ada.txt' in first and not release.is_set()
+        release.set()
+        return [chunk async for chunk in chunks]
+
+    rest = asyncio.run(request())
+    assert b'bo.txt' in rest[0] and rest[-1].startswith(b'event: done')
+
+
+def test_process_form_stream_is_served_from_an_async_generator(async_client):
+    async def request():
+        response = await async_client.post('/process_form/stream/', {'question': 'Can I work from home?'})
+        assert response.is_async
+        return b''.join([chunk async for chunk in response.streaming_content])
+
+    body = asyncio.run(request())
+    assert body.startswith(b'event: start') and b'event: done' in body
+
+
+class _Search:
+    def __init__(self):
+        self.queries = []
+
+    def run(self, search_query):
+        self.queries.append(search_query)
+        return {'organic': [{'title': 'Parental leave in Ohio', 'link': 'https://example.com/leave',
+                             'snippet': 'State rules'}]}
+
+
+def test_faq_searches_the_web_only_when_the_policy_does_not_cover_the_question(django_setup, monkeypatch):
+    from HRAgentUI import streaming
+
+    search = _Search()
+    monkeypatch.setattr(streaming, 'get_google_search', lambda: search)
+    covered = streaming.faq_messages('How should I report harassment?', 'system', 'answer', web=True)
+    assert search.queries == [] and 'Web search results' not in covered[1]['content']
+
+    question = 'What is the statutory parental leave in Ohio?'
+    uncovered = streaming.faq_messages(question, 'system', 'answer', web=True)
+    assert search.queries == [question]
+    assert 'Web search results (not company policy):\n\n- Parental leave in Ohio: https://example.com/leave' \
+        in uncovered[1]['content']
+    assert 'Web search results' not in streaming.faq_messages(question, 'system', 'answer')[1]['content']
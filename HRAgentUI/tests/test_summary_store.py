@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from HRAgentUI.summary_store import SummaryStore, fts_query, sha256_text
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SummaryStore(tmp_path / 'candidates.sqlite3')
+
+
+def test_same_notes_replace_the_summary_instead_of_duplicating(store):
+    notes = sha256_text('John interview notes')
+    store.add('John  Smith', 'Strong in Excel.', notes_sha256=notes)
+    store.add('john smith', 'Strong in Excel and SQL.', notes_sha256=notes)
+    assert store.count() == 1
+    assert store.latest('JOHN SMITH')['summary'] == 'Strong in Excel and SQL.'
+
+    store.add('John Smith', 'Second interview: leadership.', notes_sha256=sha256_text('round two'))
+    assert store.count() == 2
+    assert [row['summary'] for row in store.history('John Smith')][0] == 'Second interview: leadership.'
+    assert store.candidates()[0]['summaries'] == 2
+
+
+def test_search_matches_only_the_latest_summary_by_default(store):
+    store.add_many([
+        dict(candidate='John', summary='Knows SQL and Python.', created=1.0),
+        dict(candidate='John', summary='Moved to a management track.', created=2.0),
+        dict(candidate='Mary', summary='Led SQL migrations.', created=1.5),
+        dict(candidate='Ravi', summary='C++ and embedded work.', created=1.5),
+    ])
+    assert [row['candidate'] for row in store.search('SQL')] == ['Mary']
+    assert {row['candidate'] for row in store.search('SQL', latest_only=False)} == {'John', 'Mary'}
+    # FTS syntax characters are matched as words, not parsed
+    assert [row['candidate'] for row in store.search('C++')] == ['Ravi']
+    assert store.search('"unbalanced') == []
+
+
+def test_like_fallback_without_fts(store):
+    store.add('Mary', 'Led SQL migrations.')
+    store.fts = False
+    assert [row['candidate'] for row in store.search('sql migrations')] == ['Mary']
+
+
+def test_fts_query_quotes_each_word():
+    assert fts_query('C++ "team" lead') == '"C++" """team""" "lead"'
+
+
+def test_import_text_keeps_file_order_and_is_repeatable(store, tmp_path):
+    path = tmp_path / 'candidate_bullet.txt'
+    path.write_text('Candidate Name: John\n- Excel\n\nCandidate Name: Mary\n- SQL\n'
+                    'Candidate Name: John\n- Excel, now with SQL\n')
+    os.utime(path, (1_000_000, 1_000_000))
+    assert store.import_text(path) == 3
+    assert store.import_text(path) == 3
+    assert store.count() == 3
+    assert store.latest('John')['summary'] == 'Candidate Name: John\n- Excel, now with SQL'
+    assert store.latest('Mary')['source'] == 'candidate_bullet.txt'
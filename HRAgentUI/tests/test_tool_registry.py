@@ -0,0 +1,57 @@
+import os
+import threading
+import time
+
+from HRAgentUI.tool_registry import ToolRegistry, file_digest
+
+
+def test_tool_is_built_once_and_rebuilt_when_its_file_changes(tmp_path):
+    path = tmp_path / 'policy.txt'
+    path.write_text('v1')
+    registry, builds = ToolRegistry(), []
+
+    def factory():
+        builds.append(path.read_text())
+        return object()
+
+    first = registry.get('doc', factory, path=path)
+    assert registry.get('doc', factory, path=path) is first
+    # A touch that keeps the content does not rebuild
+    os.utime(path, ns=(1, 1))
+    assert registry.get('doc', factory, path=path) is first
+
+    path.write_text('v2')
+    second = registry.get('doc', factory, path=path)
+    assert second is not first
+    assert builds == ['v1', 'v2']
+    assert registry.snapshot() == {'doc': file_digest(path)}
+
+    registry.invalidate('doc')
+    assert registry.get('doc', factory, path=path) is not second
+    assert len(builds) == 3
+
+
+def test_concurrent_cold_start_builds_once():
+    registry, builds = ToolRegistry(), []
+
+    def factory():
+        builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get('tool', factory))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
+    assert len({id(tool) for tool in results}) == 1
+
+
+def test_file_digest_follows_content(tmp_path):
+    path = tmp_path / 'a.csv'
+    path.write_text('05-21,3:00 PM\n')
+    before = file_digest(path)
+    path.write_text('05-21,3:00 PM\n05-21,4:00 PM\n')
+    assert file_digest(path) != before
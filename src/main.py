@@ -9,6 +9,15 @@ from tasks import MeetingPrepTasks
 from agents import MeetingPrepAgents
 from datetime import datetime, timedelta
 from crewai_tools import DOCXSearchTool, CSVSearchTool, TXTSearchTool, tool, SerperDevTool
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'HRAgentUI'))
+from HRAgentUI.mail_transport import build_message, get_mail_pool
+from HRAgentUI.crew_llm import agent_llm
+from HRAgentUI.bulk_onboarding import personalize
+from HRAgentUI.role_packs import get_role_pack_store, role_pack
+from HRAgentUI.notes_summary import summarize_notes_file
+from HRAgentUI.tool_registry import get_google_search
 
 # Load environment variables
 load_dotenv()
@@ -20,7 +29,7 @@ load_dotenv()
 
 doc_search = DOCXSearchTool("docs/Employee-Code-of-Conduct.docx")
 csv_search = CSVSearchTool('interview_data.csv')
-google_search = SerperDevTool()
+google_search = get_google_search()
 # ##########################This is for the FAQ Section ######################################################
 print("Welcome to FAQ Chatbot of Company XYZ! I'm here to clarify any questions regarding our company's policies. ")
 print("----------------------------------------------------------------------------------------------------")
@@ -35,6 +44,7 @@ faq_agent = Agent(
                     relevant information and summarize those in a few sentences. If you can't find any keywords then just say 
                     I couldn't find anything in our company's policy regarding this topic . Kindly 
                     contact HR for information on this topic."""),
+			llm=agent_llm(),
 			verbose=True
 		)
 def summary_task(question):
@@ -76,6 +86,7 @@ researcher_agent = Agent(
           As a Research Specialist, your job is to search the web and come up with the best practices and methods
           to be successful at a specific job role and also provide useful links which talk about how to be successful
           in the partciular job role."""),
+        llm=agent_llm(),
         verbose=True
       )
 
@@ -96,6 +107,7 @@ greet_agent = Agent(
         backstory=dedent("""\
           Your job is to write a personalized message to the new employee joining the company and talk about company culture and wish
           the employee success in the company"""),
+        llm=agent_llm(),
         verbose=True
       )
 def onboard_task(name,link):
@@ -118,9 +130,15 @@ def onboard_task(name,link):
         )
 set_onboard_task = onboard_task(name,"https://resources.workable.com/employee-code-of-conduct-company-policy")
 
-crew = Crew(agents=[researcher_agent,greet_agent], tasks=[set_research_task,set_onboard_task])
-# Get your crew to work!
-result = crew.kickoff()
+role_research = role_pack(role)
+if role_research is not None:
+    # The role's research is precomputed; only the greeting is generated
+    result = personalize({'name': name, 'role': role, 'code_of_conduct': "https://resources.workable.com/employee-code-of-conduct-company-policy"}, role_research)
+else:
+    crew = Crew(agents=[researcher_agent,greet_agent], tasks=[set_research_task,set_onboard_task])
+    # Get your crew to work!
+    result = crew.kickoff()
+    get_role_pack_store().put(role, str(set_research_task.output))
 print("######################")
 print(result)
 
@@ -135,19 +153,10 @@ email_receiver = receiver_email
 subject = 'Welcome to Company XYZ!!!'
 body = result
 
-em = EmailMessage()
-em['From'] = email_sender
-em['To'] = email_receiver
-em['Subject'] = subject
-em.set_content(body)
-
-# Add SSL (layer of security)
-context = ssl.create_default_context()
+em = build_message(email_sender, email_receiver, subject, str(body))
 
-# Log in and send the email
-with smtplib.SMTP_SSL('smtp.gmail.com', 465, context=context) as smtp:
-    smtp.login(email_sender, email_password)
-    smtp.sendmail(email_sender, email_receiver, em.as_string())
+# Log in (once per pooled session) and send the email
+get_mail_pool(username=email_sender, password=email_password).send(em)
 
 print("Email has been sent to",name,"Email:",receiver_email)
 
@@ -163,41 +172,10 @@ print("")
 print("This is the candidate notes use case")
 candidate_name = input("Name: ")
 candidate_notes_doc = input("Please enter the link to this candidate's notes:  ")
-txt_search = TXTSearchTool(candidate_notes_doc)
-
-notes_agent = Agent(
-        role="Candidate Notes Summarizer",
-        goal='Summarizes the notes on a candidate ',
-        backstory=dedent("""\
-          As a Notes Summarizer, your mission is to read through the enitre file
-         and summarize them the information in a concise yet informative manner into bullet points. """),
-        tools=[txt_search],
-        verbose=True
-      )
-
-def candidate_notes_task(name):
-        return Task(
-            description=dedent(f"""\
-				Summarize the document into a few detailed bullet points
-				Candidate Name: {name}"""),
-            expected_output=dedent("""\
-                Ensure each bullet point isn't longer than 80 charcters
-                Have a list of 5-6 bullet points on notes given about the candidate 
-                Use this format for your output:
-                Candidate Name : [Candidate Name] 
-                - Candidate notes
-				"""),
-            agent=notes_agent,
-        )
-candidate_task = candidate_notes_task(candidate_name)
-
-crew = Crew(agents=[notes_agent], tasks=[candidate_task])
-# Get your crew to work!
-result = crew.kickoff()
+# Same path as the web app: the notes are packed into the summarize_notes prompt
+# budget (ranked excerpts of a file too large for it) and the summary is stored
+result = summarize_notes_file(candidate_name, candidate_notes_doc)
 print(result)
-with open("candidate_bullet.txt", mode='a', newline='') as file:
-    file.write(result)
-    file.write("\n")
 print(candidate_name+"'s notes have been summarized and stored!")
 print("####################################")
 ###############################################################################################################################################################
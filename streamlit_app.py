@@ -35,7 +35,20 @@ from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import tempfile
 import json
-
+import sys
+import threading
+
+# Shared modules live in the Django package so both front ends use the same code
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'HRAgentUI'))
+from HRAgentUI.tool_registry import get_doc_search, get_google_search, get_interview_scheduler, get_schedule_tool
+from HRAgentUI.answer_cache import faq_cache
+from HRAgentUI.context_packer import context_budget
+from HRAgentUI.streaming import stream_faq_answer
+from HRAgentUI.mail_transport import build_message, get_mail_pool
+from HRAgentUI.crew_specs import (EMAIL_AGENT, EMAIL_DRAFT_TASK, MEETING_NOTES_PREFETCHED_TASK, MEETING_NOTES_TASK,
+                                  MEETING_PREP_AGENT)
+from HRAgentUI.meeting_context import format_context as format_meeting_context, prefetch as prefetch_meeting_context
+from HRAgentUI.startup import warm_up
 
 
 # Load environment variables
@@ -50,6 +63,8 @@ def check_llm_config():
         'GOOGLE_API_KEY': os.getenv('GOOGLE_API_KEY')
     }
 
+    if os.getenv('LLM_MODE', 'live').lower() == 'replay':
+        return True, "Replaying recorded LLM responses (LLM_MODE=replay); no API key needed.", detected
     if detected['OPENAI_API_KEY']:
         return True, "OpenAI key detected.", detected
     # If using Gemini, one of GEMINI_API_KEY or GOOGLE_API_KEY might be set
@@ -65,19 +80,28 @@ def check_llm_config():
     )
     return False, user_msg, detected
 
-# Import CrewAI components
-try:
-    from crewai import Crew, Agent, Task, Process
-    from crewai_tools import DOCXSearchTool, CSVSearchTool, TXTSearchTool, SerperDevTool
-    CREWAI_AVAILABLE = True
-except ImportError:
-    import sys, traceback
-    CREWAI_AVAILABLE = False
-    tb = traceback.format_exc()
+# Check CrewAI is installed without importing it: the import takes seconds, so it
+# happens on first use (or in the background warm-up below) and the page renders at once
+import importlib.util
+_missing_packages = [name for name in ('crewai', 'crewai_tools') if importlib.util.find_spec(name) is None]
+CREWAI_AVAILABLE = not _missing_packages
+if not CREWAI_AVAILABLE:
     st.error("CrewAI not installed. Please install with: pip install crewai crewai-tools")
     # Diagnostic info to help the user identify which Python/paths Streamlit is using
     st.markdown("**Diagnostic information (helpful for fixing environment issues):**")
-    st.code(f"Python executable: {sys.executable}\n\nsys.path:\n{chr(10).join(sys.path)}\n\nImportError traceback:\n{tb}")
+    st.code(f"Python executable: {sys.executable}\n\nsys.path:\n{chr(10).join(sys.path)}\n\nMissing packages: {', '.join(_missing_packages)}")
+
+
+@st.cache_resource
+def start_warm_up():
+    """Load crewai, the embedding model, the indexes and the agents once per process, off the UI thread"""
+    thread = threading.Thread(target=warm_up, kwargs={'log': lambda message: None}, name='warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+if CREWAI_AVAILABLE:
+    start_warm_up()
 
 # Custom CSS
 st.markdown("""
@@ -122,63 +146,22 @@ if 'generated_body' not in st.session_state:
     st.session_state.generated_body = None
 
 def initialize_tools():
-    """Initialize search tools for documents and data"""
+    """Return the process-wide search tools (built once, shared by every session)"""
     try:
         # Document search tool
-        doc_search = DOCXSearchTool("docs/Employee-Code-of-Conduct.docx")
+        doc_search = get_doc_search()
         
-        # CSV search tool for interview data
-        csv_search = CSVSearchTool('interview_data.csv')
+        # Interview schedule lookups (exact date/time queries over interview_data.csv)
+        csv_search = get_schedule_tool()
         
         # Google search tool
-        google_search = SerperDevTool()
+        google_search = get_google_search()
         
         return doc_search, csv_search, google_search
     except Exception as e:
         st.error(f"Error initializing tools: {str(e)}")
         return None, None, None
 
-def create_hr_agents():
-    """Create HR specialized agents"""
-    try:
-        # Meeting Preparation Agent
-        meeting_prep_agent = Agent(
-            role="Meeting Preparation Specialist",
-            goal="Prepare comprehensive meeting notes and analysis for HR discussions",
-            backstory="""You are an experienced HR specialist who excels at preparing for meetings. 
-            You analyze candidate information, company policies, and create structured meeting notes 
-            that help HR professionals conduct effective interviews and discussions.""",
-            verbose=True,
-            allow_delegation=False
-        )
-        
-        # FAQ Specialist Agent
-        faq_agent = Agent(
-            role="HR Policy Expert",
-            goal="Provide accurate answers to HR policy questions based on company documentation",
-            backstory="""You are an expert in HR policies and procedures. You have deep knowledge 
-            of employee handbooks, code of conduct, and company policies. You provide clear, 
-            accurate answers to employee questions.""",
-            verbose=True,
-            allow_delegation=False
-        )
-        
-        # Email Specialist Agent
-        email_agent = Agent(
-            role="Professional Communication Specialist",
-            goal="Draft professional HR emails and communications",
-            backstory="""You are a skilled professional communicator who specializes in HR 
-            communications. You draft clear, professional, and appropriate emails for various 
-            HR scenarios including offers, rejections, policy updates, and general communications.""",
-            verbose=True,
-            allow_delegation=False
-        )
-        
-        return meeting_prep_agent, faq_agent, email_agent
-    except Exception as e:
-        st.error(f"Error creating agents: {str(e)}")
-        return None, None, None
-
 def create_meeting_notes(user_input):
     """Generate meeting preparation notes"""
     if not CREWAI_AVAILABLE:
@@ -191,41 +174,37 @@ def create_meeting_notes(user_input):
     
     try:
         doc_search, csv_search, google_search = initialize_tools()
-        meeting_agent, _, _ = create_hr_agents()
-        
-        if not all([doc_search, csv_search, google_search, meeting_agent]):
+        if not all([doc_search, csv_search, google_search]):
             return "Error initializing AI components."
-        
-        # Create task for meeting preparation
-        meeting_task = Task(
-            description=f"""
-            Prepare comprehensive meeting notes based on this request: {user_input}
-            
-            Use the available tools to:
-            1. Search relevant company policies and documents
-            2. Look up any relevant candidate or employee information
-            3. Research any additional context needed
-            
-            Provide structured meeting notes with:
-            - Key discussion points
-            - Relevant policies or procedures
-            - Questions to ask
-            - Action items
-            """,
-            agent=meeting_agent,
-            tools=[doc_search, csv_search, google_search],
-            expected_output="Structured meeting notes: Key discussion points; Relevant policies; Questions to ask; Action items"
-        )
-        
-        # Create and run crew
-        crew = Crew(
-            agents=[meeting_agent],
-            tasks=[meeting_task],
-            verbose=True,
-            process=Process.sequential
-        )
-        
-        result = crew.kickoff()
+
+        # Look up policy, schedule, candidates and the web concurrently, so the agent
+        # writes the notes in one pass instead of calling the tools one by one
+        prefetched = prefetch_meeting_context(user_input)
+        meeting_agent = MEETING_PREP_AGENT.build()
+        with context_budget('create_meeting_notes') as budget:
+            if prefetched['sections']:
+                # Charge the task without its context, then pack the context into what is left
+                budget.charge_crew(meeting_agent, MEETING_NOTES_PREFETCHED_TASK.build(
+                    meeting_agent, tools=[get_interview_scheduler()], request=user_input, context=''))
+                meeting_task = MEETING_NOTES_PREFETCHED_TASK.build(
+                    meeting_agent, tools=[get_interview_scheduler()],
+                    request=user_input, context=format_meeting_context(prefetched, user_input))
+            else:
+                meeting_task = MEETING_NOTES_TASK.build(
+                    meeting_agent, tools=[doc_search, csv_search, google_search, get_interview_scheduler()],
+                    request=user_input)
+                budget.charge_crew(meeting_agent, meeting_task)
+
+            # Create and run crew
+            from crewai import Crew, Process
+            crew = Crew(
+                agents=[meeting_agent],
+                tasks=[meeting_task],
+                verbose=True,
+                process=Process.sequential
+            )
+
+            result = crew.kickoff()
         return str(result)
         
     except Exception as e:
@@ -247,51 +226,29 @@ def create_meeting_notes(user_input):
 
         return f"Error generating meeting notes: {err_str}"
 
-def answer_faq(question):
-    """Answer FAQ questions using company policies"""
-    if not CREWAI_AVAILABLE:
-        return "CrewAI is not available. Please install required dependencies."
-    
+FAQ_STREAM_SYSTEM_PROMPT = """You are an expert in HR policies and procedures. You have deep knowledge 
+of employee handbooks, code of conduct, and company policies. You provide clear, 
+accurate answers to employee questions."""
+
+FAQ_STREAM_INSTRUCTIONS = """Answer the question using the sections of the Employee Code of Conduct above. 
+If the specific information isn't available in them, use the web search results (if any) and your 
+general HR knowledge but indicate when you're providing general guidance vs. company-specific policies.
+
+Provide a clear, professional response that includes:
+- Direct answer to the question
+- Relevant policy references if available
+- Any additional helpful context"""
+
+def answer_faq_stream(question):
+    """Stream an FAQ answer chunk by chunk (for st.write_stream); questions the policy
+    does not cover are answered with web search results as well"""
     try:
-        doc_search, _, google_search = initialize_tools()
-        _, faq_agent, _ = create_hr_agents()
-        
-        if not all([doc_search, google_search, faq_agent]):
-            return "Error initializing AI components."
-        
-        # Create task for FAQ answering
-        faq_task = Task(
-            description=f"""
-            Answer this HR policy question: {question}
-            
-            Search the company's Employee Code of Conduct and other available documents 
-            to provide an accurate, helpful answer. If the specific information isn't 
-            available in the documents, use your general HR knowledge but indicate 
-            when you're providing general guidance vs. company-specific policies.
-            
-            Provide a clear, professional response that includes:
-            - Direct answer to the question
-            - Relevant policy references if available
-            - Any additional helpful context
-            """,
-            agent=faq_agent,
-            tools=[doc_search, google_search],
-            expected_output="FAQ answer: Direct response with policy references when available"
-        )
-        
-        # Create and run crew
-        crew = Crew(
-            agents=[faq_agent],
-            tasks=[faq_task],
-            verbose=True,
-            process=Process.sequential
-        )
-        
-        result = crew.kickoff()
-        return str(result)
-        
+        for event, value in stream_faq_answer(question, 'answer_faq', FAQ_STREAM_SYSTEM_PROMPT,
+                                              FAQ_STREAM_INSTRUCTIONS, web=True):
+            if event == 'token':
+                yield value
     except Exception as e:
-        return f"Error answering question: {str(e)}"
+        yield f"Error answering question: {str(e)}"
 
 def generate_email(email_request):
     """Generate professional HR emails"""
@@ -300,31 +257,13 @@ def generate_email(email_request):
     
     try:
         doc_search, csv_search, google_search = initialize_tools()
-        _, _, email_agent = create_hr_agents()
-        
-        if not all([email_agent]):
-            return "Error initializing AI components."
-        
-        # Create task for email generation
-        email_task = Task(
-            description=f"""
-            Draft a professional HR email based on this request: {email_request}
-            
-            Create a well-structured email that includes:
-            - Appropriate subject line
-            - Professional greeting
-            - Clear, concise body content
-            - Professional closing
-            - Proper tone for the situation
-            
-            Make sure the email follows professional HR communication standards.
-            """,
-            agent=email_agent,
-            tools=[doc_search, csv_search, google_search] if doc_search else [],
-            expected_output="Email content: subject, greeting, body, and closing"
-        )
-        
+
+        email_agent = EMAIL_AGENT.build()
+        email_task = EMAIL_DRAFT_TASK.build(email_agent, tools=[doc_search, csv_search, google_search] if doc_search else [],
+                                            request=email_request)
+
         # Create and run crew
+        from crewai import Crew, Process
         crew = Crew(
             agents=[email_agent],
             tasks=[email_task],
@@ -367,28 +306,13 @@ def send_email(recipient, subject, body, smtp_host='smtp.gmail.com', smtp_port=4
             return "Email configuration missing. Please set EMAIL_SENDER and EMAIL_PASSWORD environment variables or add them to Streamlit secrets (.streamlit/secrets.toml)."
         
         # Create message
-        msg = EmailMessage()
-        msg['Subject'] = subject
-        msg['From'] = sender_email
-        msg['To'] = recipient
-        msg.set_content(body)
+        msg = build_message(sender_email, recipient, subject, body)
         
-        # Send email
-        if use_ssl:
-            context = ssl.create_default_context()
-            with smtplib.SMTP_SSL(smtp_host, smtp_port, context=context) as server:
-                server.login(sender_email, sender_password)
-                server.send_message(msg)
-        else:
-            with smtplib.SMTP(smtp_host, smtp_port) as server:
-                server.ehlo()
-                try:
-                    server.starttls(context=ssl.create_default_context())
-                except Exception:
-                    # starttls may fail on debug servers; ignore
-                    pass
-                server.login(sender_email, sender_password)
-                server.send_message(msg)
+        # Send email over a pooled SMTP session (STARTTLS/login are skipped
+        # automatically when a debug server does not offer them)
+        pool = get_mail_pool(host=smtp_host, port=smtp_port, use_ssl=use_ssl,
+                             username=sender_email, password=sender_password)
+        pool.send(msg)
 
         return "Email sent successfully!"
 
@@ -484,7 +408,9 @@ def main():
     elif selected_tool == "❓ FAQ Assistant":
         st.markdown('<div class="section-header">HR Policy FAQ Assistant</div>', unsafe_allow_html=True)
         
-        st.write("Ask questions about company policies, procedures, and HR guidelines.")
+        st.write("Ask questions about company policies, procedures, and HR guidelines. "
+                 "Answers come from the Code of Conduct; questions it does not cover are "
+                 "answered from a web search and marked as general guidance.")
         
         # Sample questions
         st.markdown("### 💡 Sample Questions")
@@ -505,14 +431,12 @@ def main():
         
         if st.button("Get Answer", type="primary"):
             if faq_question:
-                with st.spinner("Searching company policies..."):
-                    result = answer_faq(faq_question)
-                    st.success("Answer found!")
-                    st.markdown("### 💬 Answer")
-                    st.write(result)
-                    
-                    # Save to history
-                    st.session_state.chat_history.append(("FAQ", faq_question, result))
+                st.markdown("### 💬 Answer")
+                # Render tokens as they arrive instead of waiting for the whole answer
+                result = st.write_stream(answer_faq_stream(faq_question))
+                
+                # Save to history
+                st.session_state.chat_history.append(("FAQ", faq_question, result))
             else:
                 st.warning("Please ask a question.")
     
@@ -624,7 +548,7 @@ def main():
         
         **Features:**
         - 📝 **Meeting Preparation**: Generate comprehensive notes and discussion points
-        - ❓ **FAQ Assistant**: Instant answers based on company policies
+        - ❓ **FAQ Assistant**: Instant answers based on company policies, with a web search for topics they do not cover
         - 📧 **Email Generator**: Professional HR communications
         
         **Technology Stack:**
@@ -665,5 +589,13 @@ def main():
             else:
                 st.error("❌ Email: Not Configured")
 
+        # FAQ answer cache counters (for tuning FAQ_CACHE_THRESHOLD)
+        cache_stats = faq_cache.stats()
+        st.caption(
+            f"FAQ cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"(hit rate {cache_stats['hit_rate']:.0%}, {cache_stats['size']} entries, "
+            f"threshold {cache_stats['threshold']})"
+        )
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
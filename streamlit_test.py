@@ -14,6 +14,10 @@ import ssl
 from email.message import EmailMessage
 from dotenv import load_dotenv
 from datetime import datetime
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'HRAgentUI'))
+from HRAgentUI.mail_transport import build_message, get_mail_pool
 
 # Load environment variables
 load_dotenv()
@@ -183,17 +187,10 @@ def send_email(recipient, subject, body):
             return "❌ Email configuration missing. Please set EMAIL_SENDER and EMAIL_PASSWORD environment variables."
         
         # Create message
-        msg = EmailMessage()
-        msg['Subject'] = subject
-        msg['From'] = sender_email
-        msg['To'] = recipient
-        msg.set_content(body)
+        msg = build_message(sender_email, recipient, subject, body)
         
-        # Send email
-        context = ssl.create_default_context()
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=context) as server:
-            server.login(sender_email, sender_password)
-            server.send_message(msg)
+        # Send email over a pooled SMTP session
+        get_mail_pool(username=sender_email, password=sender_password).send(msg)
         
         return "✅ Email sent successfully!"
         